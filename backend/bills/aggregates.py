@@ -0,0 +1,64 @@
+"""
+Bill Summary Columns
+Set-based refresh of the child-table counts and lists denormalised onto LegislativeBill
+"""
+
+from django.db import connection
+from django.db.models import Count, IntegerField, JSONField, OuterRef, QuerySet, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from .models import BillAction, BillCosponsor, BillSubject, LegislativeBill
+
+
+AGGREGATE_FIELDS = ['action_count', 'cosponsor_count', 'subject_names', 'latest_action_type']
+
+
+def _count_of(model, **filters):
+    """Correlated per-bill count of the rows matching ``filters``"""
+    counts = model.objects.filter(bill=OuterRef('pk'), **filters).order_by().values('bill').annotate(n=Count('id')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def _subject_names():
+    """Sorted subject names of each bill as a JSON array"""
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.aggregates import JSONBAgg
+
+        names = BillSubject.objects.filter(bill=OuterRef('pk')).order_by().values('bill').annotate(
+            names=JSONBAgg('name', ordering='name')
+        ).values('names')
+        return Coalesce(Subquery(names, output_field=JSONField()), Value([], output_field=JSONField()))
+    # json_group_array keeps the order of the rows it is fed
+    return RawSQL(
+        f'(SELECT json_group_array(name) FROM (SELECT s.name AS name FROM {BillSubject._meta.db_table} s '
+        f'WHERE s.bill_id = {LegislativeBill._meta.db_table}.id ORDER BY s.name))',
+        [],
+        output_field=JSONField(),
+    )
+
+
+def aggregate_values():
+    """Update expressions recomputing every summary column from the child tables"""
+    latest_type = BillAction.objects.filter(bill=OuterRef('pk')).order_by('-action_date', '-id').values('action_type')
+    return {
+        'action_count': _count_of(BillAction),
+        # Withdrawn cosponsors stay stored but no longer cosponsor the bill
+        'cosponsor_count': _count_of(BillCosponsor, withdrawn_date__isnull=True),
+        'subject_names': _subject_names(),
+        'latest_action_type': Coalesce(Subquery(latest_type[:1]), Value('')),
+    }
+
+
+def refresh_bill_aggregates(bills: QuerySet, **extra) -> int:
+    """
+    Recompute the summary columns of the given bills with one UPDATE
+
+    Called by the sync writers for the bills whose child rows they just
+    wrote, and by ``recompute_bill_aggregates`` for repair. ``extra``
+    field values are set in the same statement. Returns the number of
+    bills updated.
+    """
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return 0
+    return bills.order_by().update(**aggregate_values(), **extra)
@@ -0,0 +1,204 @@
+"""
+Legislative Alert Matching
+Evaluates every active LegislativeAlert against changed bills in one pass
+"""
+
+import logging
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.db.models import Count, Max
+
+from .models import AlertMatch, BillSubject, LegislativeAlert, LegislativeBill
+
+
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over lowercase keywords
+
+    Finds every occurrence of every keyword in a single scan of the text,
+    independent of how many keywords there are. Matches must sit on word
+    boundaries, so ``tax`` matches "tax credit" but not "taxi".
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for keyword in keywords:
+            self._add(keyword)
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def _add(self, keyword: str):
+        node = 0
+        for char in keyword:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = nxt
+        if keyword not in self._output[node]:
+            self._output[node].append(keyword)
+
+    def _link(self):
+        """Compute failure links breadth-first and merge their outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> Iterator[str]:
+        """Yield each keyword found as a whole word in ``text`` (lowercased)"""
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword in self._output[node]:
+                start = end - len(keyword) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (end + 1 == len(text) or not text[end + 1].isalnum()):
+                    yield keyword
+
+
+class AlertIndex:
+    """
+    Every active alert compiled for matching
+
+    Keyword alerts share one automaton; bill, sponsor and subject alerts
+    are dict lookups. Building costs one pass over the active alerts.
+    """
+
+    def __init__(self, alerts: Iterable[LegislativeAlert], signature=None):
+        self.signature = signature
+        self.by_keyword: Dict[str, Set[int]] = defaultdict(set)
+        self.by_bill: Dict[int, Set[int]] = defaultdict(set)
+        self.by_sponsor: Dict[str, Set[int]] = defaultdict(set)
+        self.by_subject: Dict[str, Set[int]] = defaultdict(set)
+
+        for alert in alerts:
+            if alert.alert_type == 'keyword':
+                for keyword in alert.keywords.split(','):
+                    keyword = ' '.join(keyword.lower().split())
+                    if keyword:
+                        self.by_keyword[keyword].add(alert.id)
+            elif alert.alert_type == 'bill' and alert.bill_id:
+                self.by_bill[alert.bill_id].add(alert.id)
+            elif alert.alert_type == 'sponsor' and alert.sponsor_bioguide_id:
+                self.by_sponsor[alert.sponsor_bioguide_id.upper()].add(alert.id)
+            elif alert.alert_type == 'subject' and alert.subject_name:
+                self.by_subject[alert.subject_name.strip().lower()].add(alert.id)
+
+        self.automaton = AhoCorasick(self.by_keyword)
+
+    def __bool__(self) -> bool:
+        return bool(self.by_keyword or self.by_bill or self.by_sponsor or self.by_subject)
+
+    def match(self, bill_id: int, text: str, sponsor: str, subjects: Iterable[str]) -> Dict[int, Tuple[str, str]]:
+        """Map alert ids matched by one bill to their (match_type, matched_value)"""
+        matches: Dict[int, Tuple[str, str]] = {}
+        for alert_id in self.by_bill.get(bill_id, ()):
+            matches.setdefault(alert_id, ('bill', ''))
+        for alert_id in self.by_sponsor.get(sponsor.upper(), ()) if sponsor else ():
+            matches.setdefault(alert_id, ('sponsor', sponsor))
+        for subject in subjects:
+            for alert_id in self.by_subject.get(subject.lower(), ()):
+                matches.setdefault(alert_id, ('subject', subject))
+        if self.by_keyword:
+            for keyword in self.automaton.find(' '.join(text.lower().split())):
+                for alert_id in self.by_keyword[keyword]:
+                    matches.setdefault(alert_id, ('keyword', keyword))
+        return matches
+
+
+_index: Optional[AlertIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_alert_index() -> AlertIndex:
+    """
+    Return the compiled index of active alerts, rebuilding it only when alerts changed
+
+    Any create, update or delete changes the alert count or the newest
+    ``updated_at``, so one aggregate query decides whether to rebuild.
+    """
+    global _index
+    signature = tuple(LegislativeAlert.objects.aggregate(count=Count('id'), latest=Max('updated_at')).values())
+    with _index_lock:
+        if _index is None or _index.signature != signature:
+            alerts = LegislativeAlert.objects.filter(is_active=True).only(
+                'id', 'alert_type', 'bill_id', 'keywords', 'sponsor_bioguide_id', 'subject_name'
+            )
+            _index = AlertIndex(alerts, signature=signature)
+            logger.debug(f"Alert index rebuilt: {len(_index.by_keyword)} keywords, {len(_index.automaton)} states")
+        return _index
+
+
+class AlertMatcher:
+    """Matches bills against the alert index and stores AlertMatch rows in bulk"""
+
+    TEXT_FIELDS = ['title', 'short_title', 'summary', 'latest_action']
+
+    def __init__(self, index: AlertIndex = None, batch_size: int = 500):
+        self.index = index
+        self.batch_size = batch_size
+
+    def match_bills(self, bill_ids: Iterable[int]) -> int:
+        """Evaluate the given bills; returns the number of new matches stored"""
+        index = self.index if self.index is not None else get_alert_index()
+        bill_ids = list(bill_ids)
+        if not index or not bill_ids:
+            return 0
+
+        created = 0
+        for start in range(0, len(bill_ids), self.batch_size):
+            created += self._match_batch(index, bill_ids[start:start + self.batch_size])
+        return created
+
+    def _match_batch(self, index: AlertIndex, bill_ids: List[int]) -> int:
+        subjects = defaultdict(list)
+        if index.by_subject:
+            for bill_id, name in BillSubject.objects.filter(bill_id__in=bill_ids).values_list('bill_id', 'name'):
+                subjects[bill_id].append(name)
+
+        # A cleared hash marks a bill whose details failed to sync; it is
+        # matched once the next sync has stored it completely
+        bills = LegislativeBill.objects.filter(id__in=bill_ids).exclude(content_hash='').order_by().values_list(
+            'id', 'content_hash', 'sponsor_bioguide_id', *self.TEXT_FIELDS
+        )
+        # A bill matches each alert once per change of its content, so
+        # re-evaluating an unchanged bill never repeats a match
+        existing = set(AlertMatch.objects.filter(bill_id__in=bill_ids).values_list('alert_id', 'bill_id', 'content_hash'))
+        matches = []
+        for bill_id, content_hash, sponsor, *texts in bills:
+            text = ' '.join(value for value in texts if value)
+            for alert_id, (match_type, value) in index.match(bill_id, text, sponsor, subjects[bill_id]).items():
+                if (alert_id, bill_id, content_hash) not in existing:
+                    matches.append(AlertMatch(alert_id=alert_id, bill_id=bill_id, content_hash=content_hash,
+                                              match_type=match_type, matched_value=value[:200]))
+
+        if not matches:
+            return 0
+        # ignore_conflicts covers a concurrent sync matching the same bill;
+        # it hides which rows were skipped, so the keys are read back and
+        # only the ones missing before the insert are counted
+        AlertMatch.objects.bulk_create(matches, ignore_conflicts=True)
+        keys = {(match.alert_id, match.bill_id, match.content_hash) for match in matches}
+        stored = AlertMatch.objects.filter(bill_id__in=bill_ids).values_list('alert_id', 'bill_id', 'content_hash')
+        return len(keys.intersection(stored))
@@ -0,0 +1,115 @@
+"""
+Bills API Response Cache
+Caches serialized bill list and detail responses in the configured Django cache
+"""
+
+import hashlib
+import logging
+import random
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import LegislativeBill
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'bills-api'
+
+
+def get_cache():
+    """The Django cache backing the bills API (``BILLS_API_CACHE_ALIAS``)"""
+    return caches[getattr(settings, 'BILLS_API_CACHE_ALIAS', 'default')]
+
+
+def cache_ttl() -> int:
+    return getattr(settings, 'BILLS_API_CACHE_TTL', 300)
+
+
+def version_for(synced_at: datetime) -> int:
+    """Cache version for a bill last synced at ``synced_at``"""
+    return int(synced_at.timestamp() * 1_000_000)
+
+
+def request_digest(request) -> str:
+    """Digest of everything besides the path that shapes a response"""
+    params = sorted(request.query_params.lists())
+    return hashlib.sha256(repr((request.get_host(), params)).encode('utf-8')).hexdigest()[:32]
+
+
+def bill_version(bill_id) -> Optional[int]:
+    """
+    Current cache version of one bill, or None if the bill does not exist
+
+    Read from ``last_synced`` with one primary key lookup on every call, so
+    writes from any process (a sync command, a worker, the admin) are seen
+    at once even when the cache itself is process-local.
+    """
+    synced_at = LegislativeBill.objects.filter(pk=bill_id).values_list('last_synced', flat=True).first()
+    return None if synced_at is None else version_for(synced_at)
+
+
+def detail_key(request, bill_id, version: int) -> str:
+    return f'{KEY_PREFIX}:detail:{bill_id}:{version}:{request_digest(request)}'
+
+
+def list_key(request, state: str, name: str = 'list') -> str:
+    """
+    Key for a list page; ``state`` is the freshness tag of the underlying rows
+
+    Both key kinds are derived from database state, so nothing is ever
+    invalidated: a write moves later requests to new keys, whichever
+    process made it, and old entries age out on their TTL.
+    """
+    return f'{KEY_PREFIX}:{name}:{state}:{request_digest(request)}'
+
+
+def get_or_compute(key: str, compute: Callable, ttl: int = None):
+    """
+    Return the cached value for ``key``, computing it at most once per expiry
+
+    Entries carry a soft expiry and are kept for ``BILLS_API_CACHE_GRACE``
+    seconds past it. The first request to see a soft-expired entry takes a
+    short lock and recomputes it while concurrent requests keep serving the
+    stale copy. On a cold miss, requests that lose the lock wait for the
+    winner instead of all hitting the database. TTLs are jittered so pages
+    cached together do not all expire together.
+    """
+    cache = get_cache()
+    ttl = ttl or cache_ttl()
+    lock_key = f'{key}:lock'
+    lock_timeout = getattr(settings, 'BILLS_API_CACHE_LOCK_TIMEOUT', 10)
+
+    entry = cache.get(key)
+    if entry is not None:
+        soft_expiry, value = entry
+        if time.time() < soft_expiry or not cache.add(lock_key, 1, lock_timeout):
+            return value
+        return _refresh(cache, key, lock_key, compute, ttl)
+
+    if cache.add(lock_key, 1, lock_timeout):
+        return _refresh(cache, key, lock_key, compute, ttl)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    logger.warning(f"Bills API cache lock wait timed out for {key}")
+    return compute()
+
+
+def _refresh(cache, key: str, lock_key: str, compute: Callable, ttl: int):
+    try:
+        value = compute()
+        soft_ttl = ttl * random.uniform(0.9, 1.0)
+        grace = getattr(settings, 'BILLS_API_CACHE_GRACE', 60)
+        cache.set(key, (time.time() + soft_ttl, value), int(soft_ttl) + grace)
+        return value
+    finally:
+        cache.delete(lock_key)
@@ -5,3 +5,6 @@ class BillsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bills'
     verbose_name = 'Federal Legislative Bills'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,144 @@
+"""
+Async Congress.gov API Client
+asyncio counterpart of CongressAPI on a pooled keep-alive HTTP client
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .services import _MISS, CongressAPI
+from .throttling import backoff_delay
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCongressAPI(CongressAPI):
+    """
+    Congress.gov API client for asyncio
+
+    Exposes the same methods as CongressAPI (``get_recent_bills``,
+    ``get_bill_details``, ...) as awaitables. Requests share one
+    ``httpx.AsyncClient`` whose keep-alive pool bounds the number of
+    in-flight requests, so a single process can keep hundreds of requests
+    open without a thread each. Rate limiting, retries and the response
+    cache behave exactly as in the blocking client.
+    """
+
+    def __init__(self, api_key: str = None, max_connections: int = None,
+                 timeout: float = None, **kwargs):
+        if httpx is None:
+            raise ImproperlyConfigured('AsyncCongressAPI requires httpx (pip install httpx)')
+        self.max_connections = max_connections or getattr(settings, 'CONGRESS_API_ASYNC_MAX_CONNECTIONS', 100)
+        self.timeout = timeout or getattr(settings, 'CONGRESS_API_TIMEOUT', 30)
+        self.client = None
+        super().__init__(api_key=api_key, **kwargs)
+
+    def _create_session(self):
+        # The httpx client binds to the running event loop, so it is created
+        # lazily on first use instead of here
+        return None
+
+    def _get_client(self) -> 'httpx.AsyncClient':
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                headers={'User-Agent': self.USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                # Waiting for a free pooled connection is not a failure
+                timeout=httpx.Timeout(self.timeout, pool=None),
+            )
+        return self.client
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _make_request(self, endpoint: str, params: Dict = None,
+                            cache_ttl: Optional[float] = None, revalidate: bool = False) -> Dict:
+        """Make API request with error handling; see CongressAPI._make_request"""
+        plan = self._plan_request(endpoint, params, cache_ttl, revalidate)
+        if plan['cached'] is not _MISS:
+            return plan['cached']
+        response = await self._send(plan['url'], plan['params'], plan['headers'])
+        return self._complete_request(plan, response.status_code, response.headers, response.json)
+
+    async def _send(self, url: str, params: Dict, headers: Dict):
+        """Send a GET request, throttled and retried; see CongressAPI._send"""
+        client = self._get_client()
+        attempt = 0
+        while True:
+            # The limiter may take a file lock or a shared-cache round trip,
+            # so it runs off the event loop like the retry pause below
+            waited = await asyncio.to_thread(self.limiter.reserve)
+            self._record(api_requests=1, rate_limit_wait_seconds=waited)
+            if waited > 0:
+                await asyncio.sleep(waited)
+            started = time.monotonic()
+            try:
+                response = await client.get(url, params=params, headers=headers)
+                self._log_call(url, params, started, response=response)
+                delay = await asyncio.to_thread(self._retry_delay, response.status_code, response.headers, attempt)
+                if delay is None:
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    return response
+                logger.warning(f"Congress API returned {response.status_code} for {urlparse(url).path}, retrying")
+            except httpx.TransportError as e:
+                self._log_call(url, params, started, error=e)
+                if attempt >= self.max_retries:
+                    logger.error(f"Congress API request failed: {e}")
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Congress API request failed ({e}), retrying")
+            except httpx.HTTPError as e:
+                logger.error(f"Congress API request failed: {e}")
+                raise
+
+            attempt += 1
+            self._record(api_retries=1, backoff_wait_seconds=delay)
+            await asyncio.sleep(delay)
+
+
+class EventLoopThread:
+    """
+    Runs an asyncio event loop on a daemon thread
+
+    ``submit`` schedules a coroutine function and returns a
+    ``concurrent.futures.Future``, so thread-pool based callers can drive
+    async clients without changing how they consume results.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name='bills-async', daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        return asyncio.run_coroutine_threadsafe(fn(*args, **kwargs), self.loop)
+
+    def run(self, coro):
+        """Run a coroutine on the loop and block for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
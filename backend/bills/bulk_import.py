@@ -0,0 +1,288 @@
+"""
+Bulk Bill Import
+Loads GovInfo/Congress.gov bulk bill status dumps without per-bill API calls
+"""
+
+import json
+import logging
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .parsers import parse_bill, parse_bill_details
+from .processes import run_partitions
+from .stats import refresh_congress_stats
+from .writers import BillDetailWriter, BillWriter
+
+
+logger = logging.getLogger(__name__)
+
+# BILLSTATUS-118hr1234.xml, as laid out in the GovInfo bulk data repository
+FILE_PATTERN = re.compile(r'BILLSTATUS-(\d+)([a-z]+)(\d+)\.(xml|json)$', re.IGNORECASE)
+SUPPORTED_SUFFIXES = ('.xml', '.json')
+
+BillFile = Tuple[str, Optional[str]]  # (directory or zip path, zip member or None)
+
+
+def _element_dict(elem) -> Dict:
+    """Child tags of an element as a dict of text values, nested for child elements"""
+    return {
+        child.tag: _element_dict(child) if len(child) else (child.text or '').strip()
+        for child in elem
+    }
+
+
+def parse_bill_status_xml(source) -> Dict:
+    """
+    Read one BILLSTATUS XML document into the Congress.gov API payload shape
+
+    The document is walked with ``iterparse`` and every action, cosponsor
+    and top-level section is cleared once consumed, so a bill with thousands
+    of actions never holds the whole tree. Both the current (``type``,
+    ``number``) and pre-2022 (``billType``, ``billNumber``, ``billSubjects``)
+    schemas are understood.
+    """
+    bill: Dict = {}
+    lists = {'actions': [], 'cosponsors': [], 'sponsors': []}
+    subjects: List[Dict] = []
+    policy_area = ''
+    path: List[str] = []
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            path.append(elem.tag)
+            continue
+
+        rel = tuple(path[2:]) if path[1:2] == ['bill'] else ()
+        if len(rel) == 2 and rel[0] in lists and rel[1] == 'item':
+            lists[rel[0]].append(_element_dict(elem))
+            elem.clear()
+        elif rel[:1] == ('subjects',) and rel[-2:] == ('legislativeSubjects', 'item'):
+            subjects.append({'name': (elem.findtext('name') or '').strip()})
+            elem.clear()
+        elif rel[:1] == ('subjects',) and rel[-1] == 'policyArea':
+            policy_area = (elem.findtext('name') or '').strip()
+        elif len(rel) == 1:
+            if rel[0] not in lists and rel[0] != 'subjects':
+                bill[rel[0]] = _element_dict(elem) if len(elem) else (elem.text or '').strip()
+            elem.clear()
+        path.pop()
+
+    bill['type'] = bill.get('type') or bill.get('billType', '')
+    bill['number'] = bill.get('number') or bill.get('billNumber', '')
+    bill['sponsors'] = lists['sponsors']
+    policy_area = policy_area or (bill.get('policyArea') or {}).get('name', '')
+    return {
+        'bill': bill,
+        'actions': lists['actions'],
+        'cosponsors': lists['cosponsors'],
+        'subjects': {'legislativeSubjects': subjects, 'policyArea': {'name': policy_area}},
+    }
+
+
+def _items(value) -> List:
+    """Child lists appear bare, wrapped in ``{"item": [...]}``, or as API references"""
+    if isinstance(value, dict):
+        value = value.get('item', [])
+    if isinstance(value, dict):
+        value = [value]
+    return value if isinstance(value, list) else []
+
+
+def parse_bill_status_json(source) -> Dict:
+    """Read one JSON bill status document into the Congress.gov API payload shape"""
+    document = json.load(source)
+    bill = document.get('bill', document)
+    subjects = document.get('subjects') or bill.get('subjects') or {}
+    if isinstance(subjects, dict) and 'billSubjects' in subjects:
+        subjects = subjects['billSubjects']
+    bill['type'] = bill.get('type') or bill.get('billType', '')
+    bill['number'] = bill.get('number') or bill.get('billNumber', '')
+    bill['sponsors'] = _items(bill.get('sponsors'))
+    return {
+        'bill': bill,
+        'actions': _items(document.get('actions', bill.get('actions'))),
+        'cosponsors': _items(document.get('cosponsors', bill.get('cosponsors'))),
+        'subjects': {
+            'legislativeSubjects': _items(subjects.get('legislativeSubjects')) if isinstance(subjects, dict) else [],
+            'policyArea': (subjects.get('policyArea') if isinstance(subjects, dict) else None)
+            or bill.get('policyArea') or {},
+        },
+    }
+
+
+def parse_bill_file(name: str, source) -> Tuple[Dict, Dict]:
+    """Parse one bulk file into LegislativeBill values and child row values"""
+    payload = parse_bill_status_json(source) if name.lower().endswith('.json') else parse_bill_status_xml(source)
+    bill = payload['bill']
+    if not bill.get('url') and bill.get('congress') and bill['type'] and bill['number']:
+        # The form the list API returns, so an imported bill hashes like a synced one
+        bill['url'] = (
+            f"https://api.congress.gov/v3/bill/{bill['congress']}/{bill['type'].lower()}/{bill['number']}?format=json"
+        )
+    payload['details'] = bill
+    return parse_bill(bill), parse_bill_details(payload)
+
+
+def discover_files(path: str) -> Dict[Optional[int], List[BillFile]]:
+    """
+    Bill status files under a directory or inside zips, grouped by congress
+
+    Zip archives found in a directory are read in place. The congress comes from the GovInfo file name; files named otherwise
+    are grouped under ``None`` and their congress is read from the content.
+    """
+    partitions: Dict[Optional[int], List[BillFile]] = defaultdict(list)
+
+    def add(container: str, name: str, member: Optional[str]):
+        if not name.lower().endswith(SUPPORTED_SUFFIXES):
+            return
+        match = FILE_PATTERN.search(name)
+        partitions[int(match.group(1)) if match else None].append((container, member))
+
+    def add_archive(archive_path: str):
+        with zipfile.ZipFile(archive_path) as archive:
+            for member in archive.namelist():
+                add(archive_path, member, member)
+
+    if os.path.isdir(path):
+        for root, _, names in os.walk(path):
+            for name in sorted(names):
+                if name.lower().endswith('.zip'):
+                    add_archive(os.path.join(root, name))
+                else:
+                    add(os.path.join(root, name), name, None)
+    elif zipfile.is_zipfile(path):
+        add_archive(path)
+    else:
+        add(path, os.path.basename(path), None)
+    return dict(partitions)
+
+
+def _open_files(files: List[BillFile]) -> Iterator[Tuple[str, object]]:
+    archives = {}
+    try:
+        for container, member in files:
+            if member is None:
+                with open(container, 'rb') as handle:
+                    yield container, handle
+            else:
+                archive = archives.get(container) or archives.setdefault(container, zipfile.ZipFile(container))
+                with archive.open(member) as handle:
+                    yield member, handle
+    finally:
+        for archive in archives.values():
+            archive.close()
+
+
+def import_files(files: List[BillFile], chunk_size: int = 500) -> Dict:
+    """
+    Parse and write a list of bill status files in chunks
+
+    Each chunk of bills is upserted by BillWriter, then its actions,
+    cosponsors and subjects are deduplicated and inserted by
+    BillDetailWriter, so re-importing a dump only writes what changed.
+    """
+    stats = {
+        'files': 0,
+        'bills_created': 0,
+        'bills_updated': 0,
+        'bills_unchanged': 0,
+        'actions_created': 0,
+        'cosponsors_created': 0,
+        'cosponsors_updated': 0,
+        'subjects_created': 0,
+        'statuses_updated': 0,
+        'errors': [],
+    }
+    writer = BillWriter(chunk_size=chunk_size)
+    detail_writer = BillDetailWriter(batch_size=chunk_size)
+    details = {}
+    congresses = set()
+
+    def flush():
+        writer.flush()
+        for key, bill_id in BillWriter.resolve_ids(details).items():
+            detail_writer.add(bill_id, details[key])
+        detail_writer.flush()
+        details.clear()
+
+    for name, handle in _open_files(files):
+        try:
+            values, parsed = parse_bill_file(name, handle)
+        except (ET.ParseError, ValueError, KeyError, TypeError) as e:
+            stats['errors'].append(f"Error parsing {name}: {e}")
+            logger.error(f"Error parsing bulk bill file {name}: {e}")
+            continue
+        stats['files'] += 1
+        if not values['bill_type'] or not values['bill_number']:
+            stats['errors'].append(f"Skipped {name}: no bill type or number")
+            continue
+        # Later files for the same bill win, as in BillWriter
+        details[BillWriter.bill_key(values)] = parsed
+        congresses.add(values['congress_number'])
+        writer.add(values)
+        if len(details) >= chunk_size:
+            flush()
+    flush()
+    refresh_congress_stats(congresses)
+
+    for source in (writer.stats, detail_writer.stats):
+        for name, count in source.items():
+            stats[name] += count
+    return stats
+
+
+def _import_partition(congress: Optional[int], files: List[BillFile], chunk_size: int) -> Tuple[Optional[int], Dict, float]:
+    """Import one congress, recording rather than raising a failure"""
+    started = time.monotonic()
+    try:
+        stats = import_files(files, chunk_size)
+    except Exception as e:
+        # Chunks already committed stay; re-running the import resumes cheaply
+        logger.error(f"Bulk import of congress {congress} failed: {e}")
+        stats = {'errors': [f"Error importing congress {congress}: {e}"]}
+    return congress, stats, time.monotonic() - started
+
+
+class BulkBillImporter:
+    """
+    Imports a bulk dump with one process-pool task per congress
+
+    Congresses never share bills, so partitions write disjoint rows and the
+    workers do not contend on the same keys. ``workers=1`` imports in the
+    calling process, as does SQLite, which allows only one writer at a time.
+    """
+
+    def __init__(self, workers: int = None, chunk_size: int = 500):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = chunk_size
+
+    def run(self, path: str, congresses: List[int] = None,
+            progress: Callable[[Optional[int], Dict, float], None] = None) -> Dict:
+        """Import every partition and return the combined stats"""
+        partitions = discover_files(path)
+        if congresses:
+            partitions = {congress: files for congress, files in partitions.items() if congress in congresses}
+
+        totals = defaultdict(int)
+        totals['errors'] = []
+        started = time.monotonic()
+
+        def collect(congress, stats, elapsed):
+            for name, value in stats.items():
+                totals[name] += value
+            if progress:
+                progress(congress, stats, elapsed)
+
+        # Largest congresses first so the pool is not left waiting on one
+        ordered = sorted(partitions.items(), key=lambda item: len(item[1]), reverse=True)
+        tasks = [(congress, files, self.chunk_size) for congress, files in ordered]
+        for result in run_partitions(_import_partition, tasks, self.workers):
+            collect(*result)
+
+        totals['elapsed'] = time.monotonic() - started
+        return dict(totals)
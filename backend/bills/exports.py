@@ -0,0 +1,109 @@
+"""
+Bill Exports
+Streams bills with sponsors, subjects and child counts as NDJSON or CSV
+"""
+
+import csv
+import json
+import zlib
+from typing import Dict, Iterable, Iterator
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import LegislativeBill
+
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+EXPORT_COLUMNS = [
+    'id', 'congress_number', 'bill_type', 'bill_number', 'title', 'status', 'chamber',
+    'introduced_date', 'latest_action_date', 'latest_action',
+    'sponsor_name', 'sponsor_party', 'sponsor_state', 'sponsor_bioguide_id',
+    'subjects', 'action_count', 'cosponsor_count',
+]
+
+# Bytes of encoded rows collected before a chunk is handed to the response
+BUFFER_SIZE = 64 * 1024
+
+
+def export_chunk_size() -> int:
+    return getattr(settings, 'BILL_EXPORT_CHUNK_SIZE', 2000)
+
+
+def export_queryset(queryset=None):
+    """Bills in id order with the columns an export row needs"""
+    queryset = LegislativeBill.objects.all() if queryset is None else queryset
+    columns = [name for name in EXPORT_COLUMNS if name != 'subjects'] + ['subject_names']
+    return queryset.only(*columns).order_by('id')
+
+
+def iter_rows(queryset=None, chunk_size: int = None) -> Iterator[Dict]:
+    """
+    Yield one dict per bill from a server-side cursor
+
+    ``iterator(chunk_size)`` fetches ``chunk_size`` bills at a time, so
+    memory stays flat however many bills are exported. Subjects and child
+    counts come from the summary columns maintained on LegislativeBill,
+    so the export scans that table alone.
+    """
+    for bill in export_queryset(queryset).iterator(chunk_size=chunk_size or export_chunk_size()):
+        row = {name: getattr(bill, name) for name in EXPORT_COLUMNS if name != 'subjects'}
+        row['subjects'] = bill.subject_names
+        yield row
+
+
+def _ndjson_line(row: Dict) -> str:
+    return json.dumps(row, cls=DjangoJSONEncoder, separators=(',', ':')) + '\n'
+
+
+class _Line:
+    """Write target that hands back whatever csv.writer wrote"""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows: Iterable[Dict]) -> Iterator[str]:
+    for row in rows:
+        yield _ndjson_line(row)
+
+
+def iter_csv(rows: Iterable[Dict]) -> Iterator[str]:
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        values = dict(row, subjects='; '.join(row['subjects']))
+        yield writer.writerow(['' if values[name] is None else values[name] for name in EXPORT_COLUMNS])
+
+
+def iter_export(rows: Iterable[Dict], export_format: str = 'ndjson', compress: bool = False) -> Iterator[bytes]:
+    """
+    Encode rows and yield them as byte chunks of roughly ``BUFFER_SIZE``
+
+    With ``compress`` the chunks are one gzip stream, compressed as they are
+    produced.
+    """
+    lines = iter_csv(rows) if export_format == 'csv' else iter_ndjson(rows)
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    buffer, size = [], 0
+    for line in lines:
+        data = line.encode('utf-8')
+        buffer.append(data)
+        size += len(data)
+        if size >= BUFFER_SIZE:
+            chunk = b''.join(buffer)
+            buffer, size = [], 0
+            chunk = compressor.compress(chunk) if compressor else chunk
+            if chunk:
+                yield chunk
+
+    chunk = b''.join(buffer)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,188 @@
+"""
+API Response Cache
+Pluggable TTL/LRU caches for outbound API responses with validator support
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+
+class ResponseCache(ABC):
+    """
+    Base class for response caches
+
+    Entries are dicts holding the decoded ``body``, the ``etag`` and
+    ``last_modified`` validators and an ``expires_at`` timestamp. Expired
+    entries are still returned by ``get`` so callers can revalidate them
+    with a conditional request instead of refetching the full body.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0}
+        self._stats_lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Cache key for a request, never including the API key"""
+        params = {k: v for k, v in (params or {}).items() if k != 'api_key'}
+        return f"{endpoint}?{urlencode(sorted(params.items()))}"
+
+    @staticmethod
+    def is_fresh(entry: Dict) -> bool:
+        return entry['expires_at'] > time.time()
+
+    def record(self, name: str, count: int = 1):
+        with self._stats_lock:
+            self.stats[name] += count
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict]:
+        """The stored entry for a key, fresh or expired, or None"""
+
+    @abstractmethod
+    def set(self, key: str, body, ttl: float, etag: str = '', last_modified: str = ''):
+        """Store a response body with its validators for ``ttl`` seconds"""
+
+    @abstractmethod
+    def refresh(self, key: str, ttl: float):
+        """Extend an entry's lifetime after a successful revalidation"""
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU response cache"""
+
+    def __init__(self, max_entries: int = 10000):
+        super().__init__(max_entries)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, body, ttl: float, etag: str = '', last_modified: str = ''):
+        with self._lock:
+            self._entries[key] = {
+                'body': body,
+                'etag': etag,
+                'last_modified': last_modified,
+                'expires_at': time.time() + ttl,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.record('evictions')
+        self.record('stores')
+
+    def refresh(self, key: str, ttl: float):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['expires_at'] = time.time() + ttl
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk response cache backed by a SQLite file
+
+    Survives between sync runs, which is what makes re-syncing mostly
+    unchanged data cheap. Least recently used rows are evicted once the
+    cache grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        super().__init__(max_entries)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                etag TEXT NOT NULL DEFAULT '',
+                last_modified TEXT NOT NULL DEFAULT '',
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS response_cache_accessed ON response_cache (accessed_at)'
+        )
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, expires_at FROM response_cache WHERE key = ?',
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                'UPDATE response_cache SET accessed_at = ? WHERE key = ?', (time.time(), key)
+            )
+        body, etag, last_modified, expires_at = row
+        return {
+            'body': json.loads(body),
+            'etag': etag,
+            'last_modified': last_modified,
+            'expires_at': expires_at,
+        }
+
+    def set(self, key: str, body, ttl: float, etag: str = '', last_modified: str = ''):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO response_cache '
+                '(key, body, etag, last_modified, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, json.dumps(body), etag or '', last_modified or '', now + ttl, now),
+            )
+            evicted = self._conn.execute(
+                'DELETE FROM response_cache WHERE key IN ('
+                ' SELECT key FROM response_cache ORDER BY accessed_at DESC, rowid DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            ).rowcount
+        self.record('stores')
+        if evicted > 0:
+            self.record('evictions', evicted)
+
+    def refresh(self, key: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE response_cache SET expires_at = ?, accessed_at = ? WHERE key = ?',
+                (now + ttl, now, key),
+            )
+
+
+_caches: Dict[tuple, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(backend: Optional[str], path: Optional[str] = None,
+                       max_entries: int = 10000) -> Optional[ResponseCache]:
+    """Return the process-wide response cache for a backend ('memory' or 'sqlite')"""
+    if not backend:
+        return None
+    key = (backend, path, max_entries)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            if backend == 'memory':
+                cache = MemoryResponseCache(max_entries)
+            elif backend == 'sqlite':
+                cache = SQLiteResponseCache(path, max_entries)
+            else:
+                raise ValueError(f"Unknown response cache backend: {backend}")
+            _caches[key] = cache
+        return cache
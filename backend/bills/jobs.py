@@ -0,0 +1,315 @@
+"""
+Sync Job Queue
+Leases time slices of a congress' bill list to sync workers through SyncJob rows
+"""
+
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import SyncCursor, SyncJob
+from .services import BillSyncService
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLost(Exception):
+    """The worker no longer holds the lease on its job"""
+
+
+def default_worker_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class SyncJobQueue:
+    """
+    Schedules, leases and settles SyncJob rows
+
+    The window of bills changed since a congress' SyncCursor is bisected
+    by update time into slices of at most ``range_size`` bills, and each
+    slice becomes one job with its own ``[from_datetime, to_datetime]``.
+    A bill updated again while workers run moves past the window end into
+    the next window instead of shifting the records of other jobs. A job
+    walks its slice from the start and is retried if the slice's count
+    changes between its pages; see ``sync_bill_range``. Workers claim
+    jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` and hold them under a
+    lease they renew while working; a job whose lease runs out is claimable
+    again. Every state change after the claim is fenced on the lease owner,
+    so a worker that lost its lease cannot overwrite its successor's result.
+    Once every job of a window has succeeded, the congress' SyncCursor moves
+    to the newest ``updateDate`` the jobs read, a server timestamp, never
+    to the locally clocked window end.
+    """
+
+    def __init__(self, lease_seconds: int = None, range_size: int = None,
+                 max_attempts: int = None, retry_delay: int = None):
+        self.lease_seconds = lease_seconds or getattr(settings, 'SYNC_JOB_LEASE_SECONDS', 300)
+        # One list page per job by default, so a slice is read in one request
+        self.range_size = range_size or getattr(settings, 'SYNC_JOB_RANGE_SIZE', BillSyncService.PAGE_SIZE)
+        self.max_attempts = max_attempts or getattr(settings, 'SYNC_JOB_MAX_ATTEMPTS', 5)
+        self.retry_delay = retry_delay or getattr(settings, 'SYNC_JOB_RETRY_DELAY', 60)
+
+    @staticmethod
+    def window_end(now: datetime = None) -> datetime:
+        """End of the current window, floored so concurrent schedulers agree on it"""
+        window = getattr(settings, 'SYNC_JOB_WINDOW_SECONDS', 300)
+        seconds = int((now or timezone.now()).timestamp())
+        return datetime.fromtimestamp(seconds - seconds % window, tz=dt_timezone.utc)
+
+    @staticmethod
+    def congress_start(congress: int) -> datetime:
+        """Start of a congress' first session; no bill of it was updated earlier"""
+        return datetime(1789 + 2 * (congress - 1), 1, 1, tzinfo=dt_timezone.utc)
+
+    @staticmethod
+    def _count(service: BillSyncService, congress: int, start: datetime, end: datetime) -> int:
+        """Bills of a congress updated within ``[start, end]``, from one ``limit=1`` list request"""
+        page = service.call_api('get_recent_bills', congress=congress, limit=1, offset=0,
+                                from_datetime=start, to_datetime=end)
+        return (page.get('pagination') or {}).get('count', len(page.get('bills', [])))
+
+    def split_window(self, service: BillSyncService, congress: int,
+                     start: datetime, end: datetime) -> List[Tuple[datetime, datetime, int]]:
+        """
+        Bisect ``[start, end]`` into slices of at most ``range_size`` bills
+
+        Returns ``(start, end, count)`` slices in time order, each costing
+        one count request. A one-second slice is never split further, even
+        if more bills share that update time.
+        """
+        slices = []
+        pending = [(start, end, self._count(service, congress, start, end))]
+        while pending:
+            low, high, count = pending.pop()
+            if not count:
+                continue
+            if count <= self.range_size or high - low <= timedelta(seconds=1):
+                slices.append((low, high, count))
+                continue
+            middle = (low + (high - low) / 2).replace(microsecond=0)
+            pending.append((middle, high, self._count(service, congress, middle, high)))
+            pending.append((low, middle, self._count(service, congress, low, middle)))
+        return sorted(slices)
+
+    def schedule(self, congress: int, api=None, full: bool = False) -> List[SyncJob]:
+        """
+        Enqueue time slices of the bills a congress changed since its SyncCursor
+
+        Nothing is enqueued while the congress still has open jobs, and
+        concurrent schedulers cannot enqueue the same slice twice.
+        """
+        if SyncJob.objects.filter(congress_number=congress, status__in=['pending', 'running']).exists():
+            logger.info(f"Congress {congress} still has open sync jobs; nothing scheduled")
+            return []
+
+        from_datetime = None
+        if not full:
+            from_datetime = SyncCursor.objects.filter(congress_number=congress).values_list(
+                'last_update_date', flat=True
+            ).first()
+        window_end = self.window_end()
+
+        service = BillSyncService(api=api)
+        try:
+            slices = self.split_window(service, congress, from_datetime or self.congress_start(congress), window_end)
+        finally:
+            service.close()
+
+        if not slices:
+            self._advance_cursor(congress, None)
+            return []
+
+        # Slices share their boundary second, and the list filter includes
+        # both ends, so a bill updated exactly then is read twice, never lost
+        jobs = [
+            SyncJob(congress_number=congress, from_datetime=start, to_datetime=end, window_end=window_end)
+            for start, end, _count in slices
+        ]
+        SyncJob.objects.bulk_create(jobs, ignore_conflicts=True)
+        logger.info(f"Scheduled {len(jobs)} sync jobs for {sum(count for *_, count in slices)} bills of congress {congress}")
+        return jobs
+
+    def claim(self, worker_id: str) -> Optional[SyncJob]:
+        """Lease the next available job to ``worker_id``, or return None"""
+        now = timezone.now()
+        with transaction.atomic():
+            while True:
+                job = SyncJob.objects.select_for_update(skip_locked=True).filter(
+                    Q(status='pending', available_at__lte=now)
+                    | Q(status='running', lease_expires_at__lt=now)
+                ).order_by('available_at', 'id').first()
+                if job is None:
+                    return None
+                if job.status == 'running' and job.attempts >= self.max_attempts:
+                    # Its last worker died mid-run one time too many
+                    job.status = 'failed'
+                    job.last_error = job.last_error or f"Lease of {job.lease_owner} expired"
+                    job.lease_owner = ''
+                    job.lease_expires_at = None
+                    job.finished_at = now
+                    job.save(update_fields=['status', 'last_error', 'lease_owner', 'lease_expires_at',
+                                            'finished_at', 'updated_at'])
+                    continue
+                job.status = 'running'
+                job.lease_owner = worker_id
+                job.lease_expires_at = now + timedelta(seconds=self.lease_seconds)
+                job.attempts += 1
+                job.save(update_fields=['status', 'lease_owner', 'lease_expires_at', 'attempts', 'updated_at'])
+                return job
+
+    def _held(self, job: SyncJob, worker_id: str):
+        return SyncJob.objects.filter(pk=job.pk, status='running', lease_owner=worker_id)
+
+    def heartbeat(self, job: SyncJob, worker_id: str):
+        """Extend the lease; raises LeaseLost if the job was taken over"""
+        expires = timezone.now() + timedelta(seconds=self.lease_seconds)
+        if not self._held(job, worker_id).update(lease_expires_at=expires, updated_at=timezone.now()):
+            raise LeaseLost(f"Lost the lease on sync job {job.pk}")
+        job.lease_expires_at = expires
+
+    def complete(self, job: SyncJob, worker_id: str, stats: Dict = None) -> bool:
+        """Mark the job succeeded; returns False if the lease was lost"""
+        now = timezone.now()
+        if not self._held(job, worker_id).update(
+            status='succeeded', stats=stats or {}, last_error='', lease_owner='',
+            lease_expires_at=None, finished_at=now, updated_at=now,
+        ):
+            return False
+        window = SyncJob.objects.filter(congress_number=job.congress_number,
+                                        window_end=job.window_end or job.to_datetime)
+        if not window.exclude(status='succeeded').exists():
+            marks = [parse_datetime(job_stats['high_water'])
+                     for job_stats in window.values_list('stats', flat=True) if job_stats.get('high_water')]
+            self._advance_cursor(job.congress_number, max(marks, default=None))
+        return True
+
+    def fail(self, job: SyncJob, worker_id: str, error: str, stats: Dict = None) -> bool:
+        """Requeue the job with exponential backoff, or fail it after ``max_attempts``"""
+        now = timezone.now()
+        changes = {'last_error': error, 'stats': stats or {}, 'lease_owner': '',
+                   'lease_expires_at': None, 'updated_at': now}
+        if job.attempts >= self.max_attempts:
+            changes.update(status='failed', finished_at=now)
+        else:
+            delay = self.retry_delay * 2 ** (job.attempts - 1)
+            changes.update(status='pending', available_at=now + timedelta(seconds=delay))
+        return bool(self._held(job, worker_id).update(**changes))
+
+    def release(self, job: SyncJob, worker_id: str) -> bool:
+        """Hand the job back untried, e.g. on shutdown; the attempt is not counted"""
+        return bool(self._held(job, worker_id).update(
+            status='pending', attempts=F('attempts') - 1, lease_owner='',
+            lease_expires_at=None, available_at=timezone.now(), updated_at=timezone.now(),
+        ))
+
+    @staticmethod
+    def _advance_cursor(congress: int, high_water: Optional[datetime]):
+        """Record a settled window; the cursor only moves forward, to a read updateDate"""
+        with transaction.atomic():
+            cursor, _ = SyncCursor.objects.select_for_update().get_or_create(congress_number=congress)
+            if high_water and (cursor.last_update_date is None or high_water > cursor.last_update_date):
+                cursor.last_update_date = high_water
+            cursor.last_success_at = timezone.now()
+            cursor.save()
+
+
+class _Heartbeat(threading.Thread):
+    """Renews a lease in the background while a job runs"""
+
+    def __init__(self, queue: SyncJobQueue, job: SyncJob, worker_id: str):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.lost = False
+        self._stop_event = threading.Event()
+
+    def run(self):
+        interval = max(1, self.queue.lease_seconds // 3)
+        try:
+            while not self._stop_event.wait(interval):
+                try:
+                    self.queue.heartbeat(self.job, self.worker_id)
+                except LeaseLost:
+                    self.lost = True
+                    return
+                except Exception as e:
+                    logger.warning(f"Heartbeat for sync job {self.job.pk} failed: {e}")
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class SyncWorker:
+    """Claims sync jobs and runs each through BillSyncService.sync_bill_range"""
+
+    def __init__(self, worker_id: str = None, queue: SyncJobQueue = None, api=None,
+                 with_details: bool = True, match_alerts: Optional[bool] = None):
+        self.worker_id = worker_id or default_worker_id()
+        self.queue = queue or SyncJobQueue()
+        self.api = api
+        self.with_details = with_details
+        self.match_alerts = match_alerts
+
+    def run(self, max_jobs: int = None, progress: Callable[[SyncJob, Dict], None] = None) -> int:
+        """Run jobs until none is available or ``max_jobs`` ran; returns the number run"""
+        done = 0
+        while max_jobs is None or done < max_jobs:
+            job = self.queue.claim(self.worker_id)
+            if job is None:
+                break
+            stats = self.run_job(job)
+            done += 1
+            if progress:
+                progress(job, stats)
+        return done
+
+    def run_job(self, job: SyncJob) -> Dict:
+        """Sync one leased job and settle it; a lost lease leaves it to the new owner"""
+        heartbeat = _Heartbeat(self.queue, job, self.worker_id)
+
+        def check_lease():
+            if heartbeat.lost:
+                raise LeaseLost(f"Lost the lease on sync job {job.pk}")
+
+        service = BillSyncService(api=self.api)
+        heartbeat.start()
+        try:
+            stats = service.sync_bill_range(
+                job.congress_number,
+                from_datetime=job.from_datetime,
+                to_datetime=job.to_datetime,
+                with_details=self.with_details,
+                match_alerts=self.match_alerts,
+                on_page=check_lease,
+            )
+        except LeaseLost as e:
+            logger.warning(f"{e}; abandoning it")
+            return {'errors': [str(e)]}
+        except Exception as e:
+            logger.error(f"Sync job {job.pk} failed: {e}")
+            stats = {'errors': [f"Sync failed: {e}"]}
+        finally:
+            heartbeat.stop()
+            service.close()
+
+        if stats['errors']:
+            settled = self.queue.fail(job, self.worker_id, '\n'.join(stats['errors']), stats)
+        else:
+            settled = self.queue.complete(job, self.worker_id, stats)
+        if not settled:
+            logger.warning(f"Sync job {job.pk} was taken over before it finished")
+        return stats
@@ -0,0 +1,139 @@
+"""
+Django management command to check the query plans of the canonical bill queries
+"""
+
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from bills.models import BillAction, BillCosponsor, BillSubject, LegislativeAlert, LegislativeBill
+from bills.pagination import BillCursorPagination
+from bills.views import BILL_COLUMNS, filter_bills
+from bills.writers import BillWriter
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+# Expected index of lookups by primary key, whose name depends on the backend
+PRIMARY_KEY = 'primary key'
+
+
+def canonical_queries(page_size: int = 20):
+    """
+    The sync and API access paths with the index each is meant to use
+
+    Returns ``(name, queryset, index)`` triples; the index names are the ones
+    created by migrations 0007 and 0008, and the backend's name of the unique
+    bill key index.
+    """
+    bill = LegislativeBill.objects.only('id', 'congress_number', 'bill_type', 'bill_number', 'status',
+                                        'chamber', 'sponsor_bioguide_id', 'latest_action_date').first()
+    if bill is None:
+        bill = LegislativeBill(pk=1, congress_number=118, bill_type='hr', bill_number='1', chamber='house')
+    sponsor = bill.sponsor_bioguide_id or 'S000001'
+    action_date = bill.latest_action_date or timezone.now()
+
+    bills = LegislativeBill.objects.only(*BILL_COLUMNS).order_by(*BillCursorPagination.ordering)
+    limit = page_size + 1
+    return [
+        ('bill list', bills[:limit], 'bill_action_date_id_idx'),
+        ('bill list, next page', bills.filter(BillCursorPagination.after(action_date, bill.pk))[:limit],
+         'bill_action_date_id_idx'),
+        ('bills by congress', filter_bills(bills, {'congress': bill.congress_number})[:limit],
+         'bill_congress_action_idx'),
+        ('bills by status', filter_bills(bills, {'status': bill.status})[:limit], 'bill_status_action_idx'),
+        ('bills by chamber', filter_bills(bills, {'chamber': bill.chamber or 'house'})[:limit], 'bill_chamber_action_idx'),
+        ('bills by sponsor', filter_bills(bills, {'sponsor': sponsor})[:limit], 'bill_sponsor_action_idx'),
+        ('bill detail', LegislativeBill.objects.only(*BILL_COLUMNS).filter(pk=bill.pk), PRIMARY_KEY),
+        ('sync key lookup', BillWriter.filter_keys([(bill.congress_number, bill.bill_type, bill.bill_number)]),
+         unique_key_index()),
+        ('actions of a page', BillAction.objects.filter(bill_id__in=[bill.pk]), 'billaction_bill_date_idx'),
+        ('bills by subject', BillSubject.objects.filter(name='Taxation').values('bill_id'), 'billsubject_name_idx'),
+        ('bills by cosponsor', BillCosponsor.objects.filter(bioguide_id=sponsor).values('bill_id'),
+         'billcosponsor_bioguide_idx'),
+        ('active alerts by type', LegislativeAlert.objects.filter(is_active=True, alert_type='keyword'),
+         'alert_active_type_idx'),
+    ]
+
+
+def unique_key_index() -> str:
+    """Name of the index behind the unique (congress_number, bill_type, bill_number) bill key"""
+    columns = list(LegislativeBill._meta.unique_together[0])
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, LegislativeBill._meta.db_table)
+    for name, constraint in constraints.items():
+        if constraint['unique'] and constraint['columns'] == columns:
+            return name
+    raise CommandError(f'No unique index on {", ".join(columns)}')
+
+
+def uses_index(plan: str, index: str) -> bool:
+    """Whether a query plan reads through the given index"""
+    if index == PRIMARY_KEY:
+        if connection.vendor == 'postgresql':
+            return re.search(r'using \w+_pkey', plan) is not None
+        return 'USING INTEGER PRIMARY KEY' in plan
+    return re.search(rf'\b{index}\b', plan) is not None
+
+
+def full_scans(plan: str):
+    """Bills tables read with a sequential/full table scan in a query plan"""
+    if connection.vendor == 'postgresql':
+        tables = re.findall(r'Seq Scan on (\w+)', plan)
+    else:
+        tables = [
+            match.group(1)
+            for line in plan.splitlines()
+            for match in [re.search(r'\bSCAN (?:TABLE )?(\w+)', line)]
+            if match and 'USING' not in line
+        ]
+    return sorted({table for table in tables if table.startswith('bills_')})
+
+
+class Command(BaseCommand):
+    help = (
+        'Run EXPLAIN (ANALYZE on PostgreSQL) on the canonical bill queries and fail unless each uses '
+        'its index. Plans use the normal planner settings, so run it against a realistically sized '
+        'database: the planner rightly scans small tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=20,
+            help='Page size used for the list queries (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Unsupported database backend: {connection.vendor}')
+        analyze = connection.vendor == 'postgresql'
+
+        regressions = []
+        with transaction.atomic():
+            for name, queryset, index in canonical_queries(options['page_size']):
+                started = time.monotonic()
+                plan = queryset.explain(analyze=True) if analyze else queryset.explain()
+                elapsed_ms = (time.monotonic() - started) * 1000
+                scanned = full_scans(plan)
+
+                timing = re.search(r'Execution Time: ([\d.]+) ms', plan)
+                elapsed = f'{float(timing.group(1)) if timing else elapsed_ms:.2f}ms'
+                if scanned:
+                    regressions.append(f'{name}: sequential scan on {", ".join(scanned)}')
+                    self.stdout.write(self.style.ERROR(f'  - {name}: SEQ SCAN ({elapsed})'))
+                elif not uses_index(plan, index):
+                    regressions.append(f'{name}: does not use {index}')
+                    self.stdout.write(self.style.ERROR(f'  - {name}: NOT USING {index} ({elapsed})'))
+                else:
+                    self.stdout.write(f'  - {name}: {index} ({elapsed})')
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if regressions:
+            raise CommandError('Query plan regressions:\n' + '\n'.join(f'  - {r}' for r in regressions))
+        self.stdout.write(self.style.SUCCESS('All canonical bill queries use their indexes'))
@@ -0,0 +1,73 @@
+"""
+Django management command to export bills as NDJSON or CSV
+"""
+
+import sys
+
+from django.core.management.base import BaseCommand
+from bills.exports import EXPORT_FORMATS, iter_export, iter_rows
+from bills.models import LegislativeBill
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class Command(BaseCommand):
+    help = 'Stream every bill with sponsor, subjects and action/cosponsor counts to a file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            type=int,
+            default=None,
+            help='Only export bills of this congress',
+        )
+        parser.add_argument(
+            '--format',
+            choices=list(EXPORT_FORMATS),
+            default='ndjson',
+            help='Output format (default: ndjson)',
+        )
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='File to write, or - for stdout (default: -)',
+        )
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip the output while writing it',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=None,
+            help='Bills fetched per cursor round trip (default: BILL_EXPORT_CHUNK_SIZE or 2000)',
+        )
+
+    def handle(self, *args, **options):
+        bills = LegislativeBill.objects.all()
+        if options['congress']:
+            bills = bills.filter(congress_number=options['congress'])
+
+        rows = 0
+
+        def counted(source):
+            nonlocal rows
+            for row in source:
+                rows += 1
+                yield row
+
+        chunks = iter_export(
+            counted(iter_rows(bills, options['chunk_size'])), options['format'], compress=options['gzip']
+        )
+        if options['output'] == '-':
+            out = getattr(self.stdout, 'buffer', None) or sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+            return
+
+        with open(options['output'], 'wb') as out:
+            for chunk in chunks:
+                out.write(chunk)
+        self.stdout.write(self.style.SUCCESS(f'Exported {rows} bills to {options["output"]}'))
@@ -0,0 +1,71 @@
+"""
+Django management command to import bulk bill status dumps
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from bills.bulk_import import BulkBillImporter
+
+
+def bills_written(stats):
+    """Bills parsed and handed to the writer; files that failed to parse or were skipped are not counted"""
+    return sum(stats.get(name, 0) for name in ('bills_created', 'bills_updated', 'bills_unchanged'))
+
+
+class Command(BaseCommand):
+    help = 'Import GovInfo BILLSTATUS XML/JSON files from a directory or zip, one worker process per congress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Directory or zip file containing BILLSTATUS-*.xml or *.json files',
+        )
+        parser.add_argument(
+            '--congress',
+            type=int,
+            action='append',
+            default=None,
+            help='Only import this congress (repeatable)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes (default: CPU count; 1 imports in this process)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Bills written per bulk insert (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f'No such file or directory: {options["path"]}')
+
+        def progress(congress, stats, elapsed):
+            label = f'Congress {congress}' if congress is not None else 'Unnamed files'
+            self.stdout.write(
+                f'  {label}: {stats.get("files", 0)} files in {elapsed:.1f}s '
+                f'({bills_written(stats) / elapsed if elapsed else 0:.0f} bills/sec), '
+                f'{stats.get("bills_created", 0)} created, {stats.get("bills_updated", 0)} updated'
+            )
+
+        importer = BulkBillImporter(workers=options['workers'], chunk_size=options['chunk_size'])
+        stats = importer.run(options['path'], congresses=options['congress'], progress=progress)
+
+        elapsed = stats.get('elapsed', 0)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {stats.get("files", 0)} bill files in {elapsed:.1f}s '
+                f'({bills_written(stats) / elapsed if elapsed else 0:.0f} bills/sec): '
+                f'{stats.get("bills_created", 0)} created, {stats.get("bills_updated", 0)} updated, '
+                f'{stats.get("bills_unchanged", 0)} unchanged, {stats.get("actions_created", 0)} actions, '
+                f'{stats.get("cosponsors_created", 0)} cosponsors, {stats.get("subjects_created", 0)} subjects, '
+                f'{stats.get("statuses_updated", 0)} statuses updated'
+            )
+        )
+        for error in stats.get('errors', []):
+            self.stdout.write(self.style.ERROR(f'  - {error}'))
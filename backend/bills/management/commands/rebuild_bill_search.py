@@ -0,0 +1,45 @@
+"""
+Django management command to rebuild the bill full-text search index
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from bills.models import LegislativeBill
+from bills.search import refresh_search_index
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class Command(BaseCommand):
+    help = 'Recompute the search document of every bill, e.g. after a search configuration change'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            type=int,
+            default=None,
+            help='Only rebuild bills of this congress',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Bills refreshed per transaction (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        bills = LegislativeBill.objects.order_by('id')
+        if options['congress']:
+            bills = bills.filter(congress_number=options['congress'])
+
+        refreshed = 0
+        last_id = 0
+        while True:
+            ids = list(bills.filter(id__gt=last_id).values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            with transaction.atomic():
+                refreshed += refresh_search_index(LegislativeBill.objects.filter(id__in=ids))
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {refreshed} bills'))
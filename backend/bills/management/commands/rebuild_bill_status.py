@@ -0,0 +1,48 @@
+"""
+Django management command to re-derive bill status from stored actions
+"""
+
+from django.core.management.base import BaseCommand
+from bills.models import LegislativeBill
+from bills.stats import refresh_congress_stats
+from bills.status import update_bill_statuses
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class Command(BaseCommand):
+    help = 'Recompute status and passage/enactment dates of every bill from its actions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            type=int,
+            default=None,
+            help='Only rebuild bills of this congress',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Bills derived per batch (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        bills = LegislativeBill.objects.order_by('id')
+        if options['congress']:
+            bills = bills.filter(congress_number=options['congress'])
+
+        checked = updated = 0
+        last_id = 0
+        while True:
+            ids = list(bills.filter(id__gt=last_id).values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            updated += update_bill_statuses(ids)
+            checked += len(ids)
+            last_id = ids[-1]
+        if updated:
+            # Status counts are part of the dashboard statistics
+            refresh_congress_stats(bills.order_by().values_list('congress_number', flat=True).distinct())
+
+        self.stdout.write(self.style.SUCCESS(f'Re-derived status of {checked} bills, {updated} changed'))
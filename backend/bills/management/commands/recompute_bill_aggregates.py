@@ -0,0 +1,44 @@
+"""
+Django management command to recompute the bill summary columns
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from bills.aggregates import refresh_bill_aggregates
+from bills.models import LegislativeBill
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class Command(BaseCommand):
+    help = 'Rebuild action/cosponsor counts, subject names and latest action type of every bill from the child tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            type=int,
+            default=None,
+            help='Only recompute bills of this congress',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Bills recomputed per UPDATE (default: 5000)',
+        )
+
+    def handle(self, *args, **options):
+        bills = LegislativeBill.objects.order_by('id')
+        if options['congress']:
+            bills = bills.filter(congress_number=options['congress'])
+
+        recomputed = 0
+        last_id = 0
+        while True:
+            ids = list(bills.filter(id__gt=last_id).values_list('id', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            recomputed += refresh_bill_aggregates(LegislativeBill.objects.filter(id__in=ids), last_synced=timezone.now())
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Recomputed summary columns of {recomputed} bills'))
@@ -0,0 +1,33 @@
+"""
+Django management command to rebuild the materialised bill statistics
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from bills.models import LegislativeBill
+from bills.multi_sync import parse_congresses
+from bills.stats import refresh_congress_stats
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-congress dashboard statistics served by /api/bills/stats/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            default=None,
+            help='Congress number, list or range, e.g. 118 or 110-119 (default: every stored congress)',
+        )
+
+    def handle(self, *args, **options):
+        if options['congress']:
+            try:
+                congresses = parse_congresses(options['congress'])
+            except ValueError as e:
+                raise CommandError(str(e)) from e
+        else:
+            congresses = LegislativeBill.objects.order_by().values_list('congress_number', flat=True).distinct()
+
+        written = refresh_congress_stats(congresses)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed statistics for {written} congresses'))
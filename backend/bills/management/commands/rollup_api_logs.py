@@ -0,0 +1,59 @@
+"""
+Django management command to roll up and prune API call logs
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from bills.rollups import APILogRollupService
+
+
+class Command(BaseCommand):
+    help = 'Aggregate APILog rows into minute/hour rollups and delete expired raw rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=None,
+            help='Keep raw API log rows for this many days (default: API_LOG_RETENTION_DAYS or 7)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows deleted per batch (default: API_LOG_PURGE_BATCH_SIZE or 5000)',
+        )
+        parser.add_argument(
+            '--skip-rollup',
+            action='store_true',
+            help='Only delete expired raw rows',
+        )
+        parser.add_argument(
+            '--skip-purge',
+            action='store_true',
+            help='Only aggregate new rows',
+        )
+
+    def handle(self, *args, **options):
+        service = APILogRollupService(
+            retention_days=options['retention_days'],
+            batch_size=options['batch_size'],
+        )
+
+        try:
+            if not options['skip_rollup']:
+                stats = service.rollup()
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Rollup completed: {stats["rows_aggregated"]} rows into '
+                        f'{stats["buckets_written"]} buckets'
+                    )
+                )
+            if not options['skip_purge']:
+                deleted = service.purge()
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Purged {deleted} API log rows older than {service.retention_days} days'
+                    )
+                )
+        except Exception as e:
+            raise CommandError(f'API log rollup failed: {e}') from e
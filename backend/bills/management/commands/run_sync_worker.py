@@ -0,0 +1,85 @@
+"""
+Django management command to run a leased bill sync worker
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from bills.jobs import SyncWorker, default_worker_id
+from bills.telemetry import get_api_log_buffer
+
+
+class Command(BaseCommand):
+    help = 'Claim and run bill sync jobs enqueued by schedule_sync_jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--worker-id',
+            default=None,
+            help='Lease owner name (default: hostname:pid)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Stop after this many jobs',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for jobs instead of exiting when the queue is empty',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=30.0,
+            help='Seconds between polls of an empty queue with --loop (default: 30)',
+        )
+        parser.add_argument(
+            '--skip-details',
+            action='store_true',
+            help='Do not fetch actions, cosponsors and subjects for changed bills',
+        )
+        parser.add_argument(
+            '--skip-alerts',
+            action='store_true',
+            help='Do not match legislative alerts against changed bills',
+        )
+
+    def handle(self, *args, **options):
+        worker = SyncWorker(
+            worker_id=options['worker_id'] or default_worker_id(),
+            with_details=not options['skip_details'],
+            match_alerts=False if options['skip_alerts'] else None,
+        )
+        max_jobs = options['max_jobs']
+
+        def progress(job, stats):
+            synced = sum(stats.get(name, 0) for name in ('bills_created', 'bills_updated', 'bills_unchanged'))
+            status = self.style.ERROR(f'{len(stats["errors"])} errors') if stats.get('errors') else 'ok'
+            self.stdout.write(
+                f'  Job {job.pk} (congress {job.congress_number}, '
+                f'{job.from_datetime:%Y-%m-%d %H:%M:%S} to {job.to_datetime:%Y-%m-%d %H:%M:%S}): '
+                f'{synced} bills ({status})'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Sync worker {worker.worker_id} started'))
+        done = 0
+        try:
+            while max_jobs is None or done < max_jobs:
+                ran = worker.run(max_jobs=None if max_jobs is None else max_jobs - done, progress=progress)
+                done += ran
+                if not options['loop']:
+                    break
+                if not ran:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Interrupted')
+        except Exception as e:
+            raise CommandError(f'Sync worker failed: {e}') from e
+        finally:
+            log_buffer = get_api_log_buffer()
+            if log_buffer:
+                log_buffer.flush()
+
+        self.stdout.write(self.style.SUCCESS(f'Sync worker {worker.worker_id} ran {done} jobs'))
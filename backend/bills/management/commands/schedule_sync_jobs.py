@@ -0,0 +1,47 @@
+"""
+Django management command to enqueue leased bill sync jobs
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from bills.jobs import SyncJobQueue
+from bills.multi_sync import parse_congresses
+
+
+class Command(BaseCommand):
+    help = 'Split the bills changed since the last sync into time-slice jobs for run_sync_worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--congress',
+            default='118',
+            help='Congress number, list or range, e.g. 118 or 110-119 (default: 118)',
+        )
+        parser.add_argument(
+            '--range-size',
+            type=int,
+            default=None,
+            help='Most bills per time-slice job (default: SYNC_JOB_RANGE_SIZE or 250)',
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Schedule the whole congress instead of the changes since its sync cursor',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            congresses = parse_congresses(options['congress'])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        queue = SyncJobQueue(range_size=options['range_size'])
+        for congress in congresses:
+            try:
+                jobs = queue.schedule(congress, full=options['full'])
+            except Exception as e:
+                raise CommandError(f'Scheduling congress {congress} failed: {e}') from e
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Congress {congress}: {len(jobs)} jobs scheduled'
+                )
+            )
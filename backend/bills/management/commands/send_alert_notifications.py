@@ -0,0 +1,66 @@
+"""
+Django management command to deliver legislative alert email digests
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from bills.notifications import AlertNotifier
+
+
+class Command(BaseCommand):
+    help = 'Send pending legislative alert matches as per-user email digests'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=None,
+            help='Seconds a match may wait to be coalesced into a digest (default: ALERT_DIGEST_WINDOW_SECONDS or 900)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Users per send_messages batch (default: ALERT_EMAIL_BATCH_SIZE or 100)',
+        )
+        parser.add_argument(
+            '--flush',
+            action='store_true',
+            help='Send everything pending now, ignoring the digest window',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running as a worker, polling the queue every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=60,
+            help='Seconds between polls in --loop mode (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            notifier = AlertNotifier(window_seconds=options['window'], batch_size=options['batch_size'])
+            try:
+                stats = notifier.deliver(flush=options['flush'])
+            except Exception as e:
+                raise CommandError(f'Alert delivery failed: {e}') from e
+
+            if stats['digests_sent'] or stats['errors'] or not options['loop']:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Sent {stats["digests_sent"]} digests covering {stats["matches_notified"]} matches '
+                        f'({stats["duplicates_skipped"]} duplicates skipped, {stats["digests_failed"]} digests requeued)'
+                    )
+                )
+            for error in stats['errors']:
+                self.stdout.write(self.style.ERROR(f'  - {error}'))
+
+            if not options['loop']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
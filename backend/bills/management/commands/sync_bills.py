@@ -3,7 +3,9 @@ Django management command to sync federal legislative bills
 """
 
 from django.core.management.base import BaseCommand, CommandError
+from bills.multi_sync import MultiCongressSync, parse_congresses
 from bills.services import BillSyncService
+from bills.telemetry import get_api_log_buffer
 
 
 class Command(BaseCommand):
@@ -12,15 +14,52 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument(
             '--congress',
+            default='118',
+            help='Congress number, list or range, e.g. 118 or 110-119,121 (default: 118 for current congress)',
+        )
+        parser.add_argument(
+            '--workers',
             type=int,
-            default=118,
-            help='Congress number (default: 118 for current congress)',
+            default=1,
+            help='Worker processes when syncing several congresses (default: 1)',
         )
         parser.add_argument(
             '--days-back',
             type=int,
             default=7,
-            help='Number of days back to sync (default: 7)',
+            help='Number of days back to sync, 0 for the whole congress (default: 7)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Number of API pages fetched in parallel (default: BILL_SYNC_CONCURRENCY or 4)',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only sync bills changed since the last successful run',
+        )
+        parser.add_argument(
+            '--skip-details',
+            action='store_true',
+            help='Do not fetch actions, cosponsors and subjects for changed bills',
+        )
+        parser.add_argument(
+            '--skip-alerts',
+            action='store_true',
+            help='Do not match legislative alerts against changed bills',
+        )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='use_async',
+            help='Use the asyncio Congress.gov client (requires httpx)',
+        )
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Parse bill list pages incrementally from the response stream',
         )
         parser.add_argument(
             '--dry-run',
@@ -29,24 +68,50 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
-        congress = options['congress']
+        try:
+            congresses = parse_congresses(options['congress'])
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+        congress = congresses[0]
         days_back = options['days_back']
         dry_run = options['dry_run']
+        concurrency = options['concurrency']
+        incremental = options['incremental']
+        with_details = not options['skip_details']
+        match_alerts = False if options['skip_alerts'] else None
+        use_async = options['use_async']
+        stream = options['stream'] or None
+        if stream and use_async:
+            raise CommandError('--stream cannot be combined with --async')
 
+        label = f'Congress {congress}' if len(congresses) == 1 else f'Congresses {options["congress"]}'
         self.stdout.write(
             self.style.SUCCESS(
-                f'Starting bill sync for Congress {congress} '
-                f'(last {days_back} days){"[DRY RUN]" if dry_run else ""}'
+                f'Starting bill sync for {label} '
+                f'({f"last {days_back} days" if days_back else "full congress"})'
+                f'{"[DRY RUN]" if dry_run else ""}'
             )
         )
 
+        if len(congresses) > 1 and not dry_run:
+            return self.sync_congresses(congresses, options['workers'], dict(
+                days_back=days_back or None,
+                incremental=incremental,
+                with_details=with_details,
+                stream=stream,
+                match_alerts=match_alerts,
+                concurrency=concurrency,
+                use_async=use_async,
+            ))
+
+        service = None
         try:
-            service = BillSyncService()
+            service = BillSyncService(concurrency=concurrency, use_async=use_async)
             
             if dry_run:
                 # Test API connection for dry run
                 try:
-                    recent_bills = service.api.get_recent_bills(congress=congress, limit=5)
+                    recent_bills = service.call_api('get_recent_bills', congress=congress, limit=5)
                     if recent_bills.get('bills'):
                         sample_title = recent_bills["bills"][0].get("title", "No title")
                         self.stdout.write(
@@ -62,26 +127,75 @@ class Command(BaseCommand):
                 return
             
             # Perform the sync
-            stats = service.sync_recent_bills(congress=congress, days_back=days_back)
-            
-            # Report results
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'Sync completed successfully:\n'
-                    f'  - Bills created: {stats["bills_created"]}\n'
-                    f'  - Bills updated: {stats["bills_updated"]}\n'
-                    f'  - Subjects created: {stats["subjects_created"]}\n'
-                    f'  - Actions created: {stats["actions_created"]}\n'
-                    f'  - Cosponsors created: {stats["cosponsors_created"]}'
-                )
+            stats = service.sync_recent_bills(
+                congress=congress,
+                days_back=days_back or None,
+                incremental=incremental,
+                with_details=with_details,
+                stream=stream,
+                match_alerts=match_alerts,
             )
             
-            if stats['errors']:
-                self.stdout.write(
-                    self.style.ERROR(f'Errors encountered ({len(stats["errors"])}):')
-                )
-                for error in stats['errors']:
-                    self.stdout.write(self.style.ERROR(f'  - {error}'))
+            if stats['from_datetime']:
+                self.stdout.write(f'Incremental sync from {stats["from_datetime"]}')
+            self.report(stats)
         
         except Exception as e:
             raise CommandError(f'Sync failed: {e}') from e
+        finally:
+            if service is not None:
+                service.close()
+    
+    def sync_congresses(self, congresses, workers, sync_options):
+        """Sync several congresses on a process pool and report each one as it finishes"""
+        def progress(congress, stats, elapsed):
+            synced = sum(stats.get(name, 0) for name in ('bills_created', 'bills_updated', 'bills_unchanged'))
+            status = self.style.ERROR(f'{len(stats["errors"])} errors') if stats.get('errors') else 'ok'
+            self.stdout.write(f'  Congress {congress}: {synced} bills in {elapsed:.1f}s ({status})')
+        
+        try:
+            stats = MultiCongressSync(workers=workers, **sync_options).run(congresses, progress=progress)
+        except Exception as e:
+            raise CommandError(f'Sync failed: {e}') from e
+        self.report(stats)
+    
+    def report(self, stats):
+        """Print the sync statistics, API log totals and errors"""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Sync completed successfully:\n'
+                f'  - Bills created: {stats.get("bills_created", 0)}\n'
+                f'  - Bills updated: {stats.get("bills_updated", 0)}\n'
+                f'  - Bills unchanged: {stats.get("bills_unchanged", 0)}\n'
+                f'  - Subjects created: {stats.get("subjects_created", 0)}\n'
+                f'  - Actions created: {stats.get("actions_created", 0)}\n'
+                f'  - Cosponsors created: {stats.get("cosponsors_created", 0)}, '
+                f'withdrawals updated: {stats.get("cosponsors_updated", 0)}\n'
+                f'  - Statuses updated: {stats.get("statuses_updated", 0)}\n'
+                f'  - Alert matches: {stats.get("alert_matches_created", 0)}\n'
+                f'  - Pages fetched: {stats.get("pages_fetched", 0)}\n'
+                f'  - API requests: {stats.get("api_requests", 0)} '
+                f'({stats.get("api_retries", 0)} retries, {stats.get("api_throttled", 0)} throttled)\n'
+                f'  - Waiting: {stats.get("rate_limit_wait_seconds", 0):.1f}s rate limit, '
+                f'{stats.get("backoff_wait_seconds", 0):.1f}s backoff\n'
+                f'  - Response cache: {stats.get("cache_hits", 0)} hits, '
+                f'{stats.get("cache_revalidated", 0)} revalidated, {stats.get("cache_misses", 0)} misses\n'
+                f'  - Elapsed: {stats["elapsed_seconds"]}s '
+                f'({stats["bills_per_second"]} bills/sec)'
+            )
+        )
+        
+        log_buffer = get_api_log_buffer()
+        if log_buffer:
+            log_buffer.flush()
+            self.stdout.write(
+                f'  - API log: {log_buffer.stats["flushed"]} calls written, '
+                f'{log_buffer.stats["dropped"]} dropped'
+            )
+        
+        if stats['errors']:
+            self.stdout.write(
+                self.style.ERROR(f'Errors encountered ({len(stats["errors"])}):')
+            )
+            for error in stats['errors']:
+                self.stdout.write(self.style.ERROR(f'  - {error}'))
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0002_alter_legislativebill_propublica_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legislativebill',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Hash of the synced API fields, used to skip unchanged rows', max_length=64),
+        ),
+    ]
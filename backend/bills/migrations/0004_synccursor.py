@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0003_legislativebill_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('congress_number', models.IntegerField(unique=True)),
+                ('last_update_date', models.DateTimeField(blank=True, help_text='Latest bill updateDate seen by the last successful sync', null=True)),
+                ('last_offset', models.IntegerField(default=0, help_text='Number of list records walked by the last successful sync')),
+                ('last_success_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-congress_number'],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0004_synccursor'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apilog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0005_alter_apilog_timestamp'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apilog',
+            index=models.Index(fields=['timestamp'], name='apilog_timestamp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apilog',
+            index=models.Index(fields=['service', 'timestamp'], name='apilog_service_ts_idx'),
+        ),
+        migrations.CreateModel(
+            name='APILogRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('service', models.CharField(choices=[('congress_gov', 'Congress.gov API'), ('propublica', 'ProPublica Congress API'), ('govtrack', 'GovTrack API')], max_length=20)),
+                ('endpoint', models.CharField(help_text='Endpoint template, e.g. bill/{congress}/{type}/{number}', max_length=500)),
+                ('status_code', models.IntegerField()),
+                ('count', models.IntegerField()),
+                ('error_count', models.IntegerField(default=0)),
+                ('p50_response_time', models.FloatField()),
+                ('p95_response_time', models.FloatField()),
+                ('p99_response_time', models.FloatField()),
+                ('max_response_time', models.FloatField()),
+                ('total_bytes', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-bucket_start'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='apilogrollup_bucket_idx')],
+                'unique_together': {('granularity', 'bucket_start', 'service', 'endpoint', 'status_code')},
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+INDEX_NAME = 'bill_action_date_id_idx'
+
+
+def create_index(apps, schema_editor):
+    # Matches the bills API keyset order. PostgreSQL sorts NULLs first in
+    # descending indexes unless told otherwise; SQLite already sorts them
+    # last and rejects the NULLS LAST modifier in index definitions.
+    nulls_last = ' NULLS LAST' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f'CREATE INDEX {INDEX_NAME} ON bills_legislativebill '
+        f'(latest_action_date DESC{nulls_last}, id DESC)'
+    )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute(f'DROP INDEX {INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0006_apilog_indexes_apilogrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations, models
+
+
+# Filtered variants of the bills API keyset order: (prefix, latest_action_date
+# DESC NULLS LAST, id DESC)
+KEYSET_INDEXES = [
+    ('bill_congress_action_idx', 'congress_number'),
+    ('bill_status_action_idx', 'status'),
+    ('bill_chamber_action_idx', 'chamber'),
+    ('bill_sponsor_action_idx', 'sponsor_bioguide_id'),
+]
+
+
+def create_keyset_indexes(apps, schema_editor):
+    # See 0007: only PostgreSQL needs (and SQLite rejects) NULLS LAST
+    nulls_last = ' NULLS LAST' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, column in KEYSET_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON bills_legislativebill '
+            f'({column}, latest_action_date DESC{nulls_last}, id DESC)'
+        )
+
+
+def drop_keyset_indexes(apps, schema_editor):
+    for name, _column in KEYSET_INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0007_legislativebill_action_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='billsubject',
+            index=models.Index(fields=['name'], name='billsubject_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billaction',
+            index=models.Index(fields=['bill', '-action_date'], name='billaction_bill_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billcosponsor',
+            index=models.Index(fields=['bioguide_id'], name='billcosponsor_bioguide_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='legislativealert',
+            index=models.Index(
+                condition=models.Q(is_active=True),
+                fields=['alert_type'],
+                name='alert_active_type_idx',
+            ),
+        ),
+        migrations.RunPython(create_keyset_indexes, drop_keyset_indexes),
+    ]
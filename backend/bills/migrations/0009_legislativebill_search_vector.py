@@ -0,0 +1,40 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX bill_search_vector_idx ON bills_legislativebill USING gin (search_vector)'
+        )
+    elif vendor == 'sqlite':
+        # tsvector does not exist on SQLite; local search uses FTS5 instead
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS bills_legislativebill_fts '
+            'USING fts5(title, short_title, summary, actions, tokenize="porter unicode61")'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX bill_search_vector_idx')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS bills_legislativebill_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0008_bill_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legislativebill',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0009_legislativebill_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('match_type', models.CharField(choices=[('bill', 'Specific Bill'), ('keyword', 'Keyword/Topic'), ('sponsor', 'Bill Sponsor'), ('subject', 'Policy Subject')], max_length=10)),
+                ('matched_value', models.CharField(blank=True, help_text='Keyword, sponsor or subject that matched', max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('alert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='bills.legislativealert')),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alert_matches', to='bills.legislativebill')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'unique_together': {('alert', 'bill')},
+            },
+        ),
+    ]
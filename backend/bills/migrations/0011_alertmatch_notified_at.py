@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0010_alertmatch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertmatch',
+            name='notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='alertmatch',
+            index=models.Index(
+                condition=models.Q(notified_at__isnull=True),
+                fields=['created_at'],
+                name='alertmatch_pending_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0011_alertmatch_notified_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('congress_number', models.IntegerField()),
+                ('offset', models.IntegerField(help_text='First list record of the range')),
+                ('limit', models.IntegerField(help_text='Number of list records in the range')),
+                ('from_datetime', models.DateTimeField(blank=True, help_text='Only bills updated since this time; empty for the whole congress', null=True)),
+                ('to_datetime', models.DateTimeField(help_text='Only bills updated before this time')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the job may be claimed')),
+                ('lease_owner', models.CharField(blank=True, max_length=100)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('stats', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['available_at', 'id'],
+                'indexes': [
+                    models.Index(condition=models.Q(status='pending'), fields=['available_at', 'id'], name='syncjob_claimable_idx'),
+                    models.Index(condition=models.Q(status='running'), fields=['lease_expires_at'], name='syncjob_lease_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(condition=models.Q(status__in=['pending', 'running']), fields=('congress_number', 'offset', 'limit', 'to_datetime'), name='syncjob_open_range_uniq'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0012_syncjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legislativebill',
+            name='action_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='legislativebill',
+            name='cosponsor_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='legislativebill',
+            name='subject_names',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text="Names of the bill's subjects, sorted"),
+        ),
+        migrations.AddField(
+            model_name='legislativebill',
+            name='latest_action_type',
+            field=models.CharField(blank=True, editable=False, help_text="Type of the bill's most recent stored action", max_length=20),
+        ),
+    ]
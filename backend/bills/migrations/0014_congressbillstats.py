@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0013_legislativebill_summaries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CongressBillStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('congress_number', models.IntegerField(unique=True)),
+                ('bill_count', models.IntegerField(default=0)),
+                ('by_status', models.JSONField(default=dict, help_text='Bill count per status')),
+                ('by_chamber', models.JSONField(default=dict, help_text='Bill count per originating chamber')),
+                ('by_party', models.JSONField(default=dict, help_text='Bill count per sponsor party')),
+                ('by_policy_area', models.JSONField(default=dict, help_text='Bill count per policy area')),
+                ('introduced_per_week', models.JSONField(default=list, help_text='Bills introduced per week, as [{week, count}] in week order')),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-congress_number'],
+                'verbose_name_plural': 'congress bill stats',
+            },
+        ),
+    ]
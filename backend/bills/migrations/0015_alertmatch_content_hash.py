@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0014_congressbillstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertmatch',
+            name='content_hash',
+            field=models.CharField(blank=True, help_text='Bill content hash the match was made for; each change of the bill can match again', max_length=64),
+        ),
+        migrations.AlterUniqueTogether(
+            name='alertmatch',
+            unique_together={('alert', 'bill', 'content_hash')},
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0015_alertmatch_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncjob',
+            name='window_end',
+            field=models.DateTimeField(blank=True, help_text="End of the scheduled window this job's slice belongs to", null=True),
+        ),
+        migrations.RemoveConstraint(
+            model_name='syncjob',
+            name='syncjob_open_range_uniq',
+        ),
+        migrations.AddConstraint(
+            model_name='syncjob',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(status__in=['pending', 'running']),
+                fields=('congress_number', 'from_datetime', 'to_datetime'),
+                name='syncjob_open_slice_uniq',
+            ),
+        ),
+    ]
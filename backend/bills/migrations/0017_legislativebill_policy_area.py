@@ -0,0 +1,28 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_policy_areas(apps, schema_editor):
+    LegislativeBill = apps.get_model('bills', 'LegislativeBill')
+    BillSubject = apps.get_model('bills', 'BillSubject')
+    # Until now the policy area was only stored on each subject row
+    policy_area = BillSubject.objects.filter(bill=OuterRef('pk')).exclude(policy_area='').values('policy_area')
+    LegislativeBill.objects.filter(
+        id__in=BillSubject.objects.exclude(policy_area='').values('bill_id'),
+    ).update(policy_area=Subquery(policy_area[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0016_syncjob_time_slices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='legislativebill',
+            name='policy_area',
+            field=models.CharField(blank=True, help_text="Congress.gov policy area of the bill", max_length=200),
+        ),
+        migrations.RunPython(copy_policy_areas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0017_legislativebill_policy_area'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='legislativebill',
+            index=models.Index(fields=['last_synced'], name='bill_last_synced_idx'),
+        ),
+        migrations.CreateModel(
+            name='BillDeletionGeneration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generation', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0018_bill_list_validator'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='syncjob',
+            name='offset',
+        ),
+        migrations.RemoveField(
+            model_name='syncjob',
+            name='limit',
+        ),
+    ]
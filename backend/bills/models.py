@@ -5,6 +5,8 @@ Django models for integrating federal legislative data
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 
 
 class LegislativeBill(models.Model):
@@ -46,6 +48,7 @@ class LegislativeBill(models.Model):
     title = models.TextField(help_text="Official bill title")
     short_title = models.CharField(max_length=500, blank=True)
     summary = models.TextField(blank=True)
+    policy_area = models.CharField(max_length=200, blank=True, help_text="Congress.gov policy area of the bill")
     
     # Status and progress
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='introduced')
@@ -73,6 +76,21 @@ class LegislativeBill(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_synced = models.DateTimeField(auto_now=True)
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the synced API fields, used to skip unchanged rows"
+    )
+    # Maintained in bulk by the sync writers, see bills.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Child-table summaries maintained in bulk by the sync writers, see
+    # bills.aggregates, so list queries read this table alone
+    action_count = models.PositiveIntegerField(default=0, editable=False)
+    cosponsor_count = models.PositiveIntegerField(default=0, editable=False)
+    subject_names = models.JSONField(default=list, blank=True, editable=False,
+                                     help_text="Names of the bill's subjects, sorted")
+    latest_action_type = models.CharField(max_length=20, blank=True, editable=False,
+                                          help_text="Type of the bill's most recent stored action")
     
     # Connection to policy logs
     related_policies = models.ManyToManyField(
@@ -84,6 +102,14 @@ class LegislativeBill(models.Model):
     class Meta:
         ordering = ['-latest_action_date', '-introduced_date']
         unique_together = ['congress_number', 'bill_type', 'bill_number']
+        indexes = [
+            # The list endpoint's validator reads MAX(last_synced)
+            models.Index(fields=['last_synced'], name='bill_last_synced_idx'),
+        ]
+        # The API's keyset-ordered indexes, e.g. (status, latest_action_date
+        # DESC NULLS LAST, id DESC), and the search_vector GIN index need
+        # vendor-specific SQL and are created in migrations 0007-0009
+        # instead of being declared here
         
     def __str__(self):
         return f"{self.bill_type.upper()} {self.bill_number} - {self.title[:50]}"
@@ -105,6 +131,9 @@ class BillSubject(models.Model):
     
     class Meta:
         unique_together = ['bill', 'name']
+        indexes = [
+            models.Index(fields=['name'], name='billsubject_name_idx'),
+        ]
         
     def __str__(self):
         return f"{self.name} ({self.bill.bill_type.upper()} {self.bill.bill_number})"
@@ -135,6 +164,9 @@ class BillAction(models.Model):
     
     class Meta:
         ordering = ['-action_date']
+        indexes = [
+            models.Index(fields=['bill', '-action_date'], name='billaction_bill_date_idx'),
+        ]
         
     def __str__(self):
         return f"{self.action_date.date()} - {self.description[:50]}"
@@ -155,6 +187,9 @@ class BillCosponsor(models.Model):
     
     class Meta:
         unique_together = ['bill', 'bioguide_id']
+        indexes = [
+            models.Index(fields=['bioguide_id'], name='billcosponsor_bioguide_idx'),
+        ]
         
     def __str__(self):
         return f"{self.name} ({self.party}-{self.state})"
@@ -213,11 +248,51 @@ class LegislativeAlert(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['alert_type'],
+                condition=models.Q(is_active=True),
+                name='alert_active_type_idx',
+            ),
+        ]
         
     def __str__(self):
         return f"{self.name} ({self.get_alert_type_display()})"
 
 
+class AlertMatch(models.Model):
+    """A bill that satisfied a LegislativeAlert's criteria"""
+    
+    alert = models.ForeignKey(LegislativeAlert, on_delete=models.CASCADE, related_name='matches')
+    bill = models.ForeignKey(LegislativeBill, on_delete=models.CASCADE, related_name='alert_matches')
+    match_type = models.CharField(max_length=10, choices=LegislativeAlert.ALERT_TYPE_CHOICES)
+    matched_value = models.CharField(max_length=200, blank=True, help_text="Keyword, sponsor or subject that matched")
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Bill content hash the match was made for; each change of the bill can match again"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set once the match went out in a digest (or was skipped as a duplicate)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['alert', 'bill', 'content_hash']
+        indexes = [
+            # The notification queue: matches still waiting for a digest
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(notified_at__isnull=True),
+                name='alertmatch_pending_idx',
+            ),
+        ]
+        
+    def __str__(self):
+        return f"{self.alert.name} -> {self.bill.bill_type.upper()} {self.bill.bill_number}"
+
+
 class APILog(models.Model):
     """Log API calls to Congress.gov and other services"""
     
@@ -241,10 +316,178 @@ class APILog(models.Model):
     response_size = models.IntegerField(null=True, blank=True)
     error_message = models.TextField(blank=True)
     
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the call is made, not when the buffered row is flushed
+    timestamp = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='apilog_timestamp_idx'),
+            models.Index(fields=['service', 'timestamp'], name='apilog_service_ts_idx'),
+        ]
         
     def __str__(self):
         return f"{self.service} - {self.status_code} - {self.timestamp}"
+
+
+class SyncCursor(models.Model):
+    """High-water mark of the last successful bill sync for a congress"""
+    
+    congress_number = models.IntegerField(unique=True)
+    last_update_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Latest bill updateDate seen by the last successful sync"
+    )
+    last_offset = models.IntegerField(
+        default=0,
+        help_text="Number of list records walked by the last successful sync"
+    )
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-congress_number']
+        
+    def __str__(self):
+        return f"Congress {self.congress_number} synced through {self.last_update_date}"
+
+
+class SyncJob(models.Model):
+    """A time slice of one congress' bill list, leased to one sync worker at a time"""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    congress_number = models.IntegerField()
+    from_datetime = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Only bills updated since this time; empty for the whole congress"
+    )
+    to_datetime = models.DateTimeField(help_text="Only bills updated before this time")
+    window_end = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="End of the scheduled window this job's slice belongs to"
+    )
+    
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Earliest time the job may be claimed")
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    stats = models.JSONField(default=dict, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['available_at', 'id']
+        constraints = [
+            # Schedulers on several hosts may enqueue the same window; only
+            # one open job per range survives
+            models.UniqueConstraint(
+                fields=['congress_number', 'from_datetime', 'to_datetime'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='syncjob_open_slice_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['available_at', 'id'],
+                condition=models.Q(status='pending'),
+                name='syncjob_claimable_idx',
+            ),
+            models.Index(
+                fields=['lease_expires_at'],
+                condition=models.Q(status='running'),
+                name='syncjob_lease_idx',
+            ),
+        ]
+        
+    def __str__(self):
+        return f"Congress {self.congress_number} [{self.from_datetime}, {self.to_datetime}] {self.status}"
+
+
+class CongressBillStats(models.Model):
+    """Dashboard statistics of one congress' bills, materialised after each sync"""
+    
+    congress_number = models.IntegerField(unique=True)
+    bill_count = models.IntegerField(default=0)
+    by_status = models.JSONField(default=dict, help_text="Bill count per status")
+    by_chamber = models.JSONField(default=dict, help_text="Bill count per originating chamber")
+    by_party = models.JSONField(default=dict, help_text="Bill count per sponsor party")
+    by_policy_area = models.JSONField(default=dict, help_text="Bill count per policy area")
+    introduced_per_week = models.JSONField(
+        default=list,
+        help_text="Bills introduced per week, as [{week, count}] in week order"
+    )
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-congress_number']
+        verbose_name_plural = 'congress bill stats'
+        
+    def __str__(self):
+        return f"Congress {self.congress_number}: {self.bill_count} bills as of {self.computed_at}"
+
+
+class BillDeletionGeneration(models.Model):
+    """
+    Counter bumped on every bill deletion, kept in a single row
+
+    A deleted bill never moves the newest ``last_synced``, so the bills
+    list validator combines the two.
+    """
+    
+    generation = models.PositiveBigIntegerField(default=0)
+    
+    @classmethod
+    def bump(cls):
+        cls.objects.get_or_create(pk=1)
+        cls.objects.filter(pk=1).update(generation=models.F('generation') + 1)
+        
+    def __str__(self):
+        return f"Bill deletion generation {self.generation}"
+
+
+class APILogRollup(models.Model):
+    """Per-minute and per-hour aggregates of APILog rows"""
+    
+    GRANULARITY_CHOICES = [
+        ('minute', 'Minute'),
+        ('hour', 'Hour'),
+    ]
+    
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    service = models.CharField(max_length=20, choices=APILog.SERVICE_CHOICES)
+    endpoint = models.CharField(max_length=500, help_text="Endpoint template, e.g. bill/{congress}/{type}/{number}")
+    status_code = models.IntegerField()
+    
+    count = models.IntegerField()
+    error_count = models.IntegerField(default=0)
+    p50_response_time = models.FloatField()
+    p95_response_time = models.FloatField()
+    p99_response_time = models.FloatField()
+    max_response_time = models.FloatField()
+    total_bytes = models.BigIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-bucket_start']
+        unique_together = ['granularity', 'bucket_start', 'service', 'endpoint', 'status_code']
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start'], name='apilogrollup_bucket_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.service} {self.endpoint} {self.status_code} @ {self.bucket_start} ({self.granularity})"
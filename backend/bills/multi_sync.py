@@ -0,0 +1,128 @@
+"""
+Multi-Congress Sync
+Runs the bill sync for several congresses, sharded across worker processes
+"""
+
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .processes import run_partitions
+from .services import BillSyncService
+from .telemetry import get_api_log_buffer
+from .throttling import get_limiter
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_congresses(value: str) -> List[int]:
+    """Expand a congress list such as ``"110-115,118"`` into sorted congress numbers"""
+    congresses = set()
+    for part in str(value).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition('-')
+        try:
+            start, end = int(first), int(last) if sep else int(first)
+        except ValueError:
+            raise ValueError(f"Invalid congress or range: {part!r}")
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid congress range: {part!r}")
+        congresses.update(range(start, end + 1))
+    if not congresses:
+        raise ValueError('No congress given')
+    return sorted(congresses)
+
+
+def _sync_congress(congress: int, options: Dict, limiter_path: Optional[str]) -> Tuple[int, Dict, float]:
+    """Sync one congress with its own API client; failures are recorded, not raised"""
+    started = time.monotonic()
+    service = None
+    try:
+        service = BillSyncService(concurrency=options.get('concurrency'), use_async=options.get('use_async', False))
+        if limiter_path:
+            # Every worker draws from one file-backed bucket, so together
+            # they stay within the key's hourly quota
+            service.api.limiter = get_limiter(
+                getattr(settings, 'CONGRESS_API_RATE_PER_HOUR', 5000),
+                getattr(settings, 'CONGRESS_API_BURST', 40),
+                limiter_path,
+            )
+        stats = service.sync_recent_bills(
+            congress=congress,
+            days_back=options.get('days_back'),
+            incremental=options.get('incremental', False),
+            with_details=options.get('with_details', True),
+            stream=options.get('stream'),
+            match_alerts=options.get('match_alerts'),
+        )
+    except Exception as e:
+        logger.error(f"Sync of congress {congress} failed: {e}")
+        stats = {'errors': [f"Sync failed: {e}"]}
+    finally:
+        if service is not None:
+            service.close()
+        log_buffer = get_api_log_buffer()
+        if log_buffer:
+            log_buffer.flush()
+    return congress, stats, time.monotonic() - started
+
+
+class MultiCongressSync:
+    """
+    Syncs a list of congresses, one process-pool task per congress
+
+    Each worker runs a full BillSyncService with its own database connection
+    and HTTP session. Unless CONGRESS_API_RATE_LIMIT_FILE already names a
+    shared bucket, a temporary one is created for the run so all workers
+    share the rate-limit budget. Per-congress stats are merged into one
+    summary; ``congresses`` in the result keeps each congress' own stats
+    and elapsed time.
+    """
+
+    def __init__(self, workers: int = 1, **options):
+        self.workers = max(1, workers or 1)
+        self.options = options
+
+    def run(self, congresses: List[int],
+            progress: Callable[[int, Dict, float], None] = None) -> Dict:
+        """Sync every congress and return the merged stats"""
+        limiter_path = getattr(settings, 'CONGRESS_API_RATE_LIMIT_FILE', None)
+        temporary = None
+        if not limiter_path and self.workers > 1 and len(congresses) > 1:
+            handle, temporary = tempfile.mkstemp(prefix='congress-api-', suffix='.bucket')
+            os.close(handle)
+            limiter_path = temporary
+
+        totals: Dict = {'errors': [], 'congresses': {}}
+        started = time.monotonic()
+        try:
+            tasks = [(congress, self.options, limiter_path) for congress in congresses]
+            for congress, stats, elapsed in run_partitions(_sync_congress, tasks, self.workers):
+                self._merge(totals, congress, stats, elapsed)
+                if progress:
+                    progress(congress, stats, elapsed)
+        finally:
+            if temporary:
+                os.unlink(temporary)
+
+        elapsed = time.monotonic() - started
+        synced = sum(totals.get(name, 0) for name in ('bills_created', 'bills_updated', 'bills_unchanged'))
+        totals['elapsed_seconds'] = round(elapsed, 2)
+        totals['bills_per_second'] = round(synced / elapsed, 2) if elapsed else 0.0
+        return totals
+
+    @staticmethod
+    def _merge(totals: Dict, congress: int, stats: Dict, elapsed: float):
+        totals['congresses'][congress] = dict(stats, elapsed_seconds=round(elapsed, 2))
+        for name, value in stats.items():
+            if name == 'errors':
+                totals['errors'].extend(f"Congress {congress}: {error}" for error in value)
+            elif name not in ('elapsed_seconds', 'bills_per_second') and isinstance(value, (int, float)):
+                totals[name] = totals.get(name, 0) + value
@@ -0,0 +1,168 @@
+"""
+Alert Notifications
+Delivers pending AlertMatch rows as batched, deduplicated email digests
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import AlertMatch
+
+
+logger = logging.getLogger(__name__)
+
+
+class AlertNotifier:
+    """
+    Sends one digest per user for their pending alert matches
+
+    AlertMatch rows with no ``notified_at`` are the queue: the sync only
+    inserts them, and this worker drains it. A user's digest goes out once
+    their oldest pending match is ``window`` old, so a busy legislative day
+    coalesces into a few emails. A bill already sent to the user (through
+    any of their alerts) is not sent again until it changes: duplicates are
+    keyed on the content hash the bill had when it matched. Digests for
+    ``batch_size`` users are claimed with ``SKIP LOCKED`` and marked
+    notified in the same transaction, then sent after it commits over a
+    single reused connection, so a slow mail server never holds row locks.
+    A digest the connection does not report as sent is handed back to the
+    queue.
+    """
+
+    def __init__(self, window_seconds: int = None, batch_size: int = None, connection=None):
+        if window_seconds is None:
+            window_seconds = getattr(settings, 'ALERT_DIGEST_WINDOW_SECONDS', 900)
+        self.window = timedelta(seconds=window_seconds)
+        self.batch_size = batch_size or getattr(settings, 'ALERT_EMAIL_BATCH_SIZE', 100)
+        self.connection = connection
+        self.stats = {
+            'digests_sent': 0,
+            'matches_notified': 0,
+            'duplicates_skipped': 0,
+            'digests_failed': 0,
+            'errors': [],
+        }
+
+    @staticmethod
+    def pending():
+        """Matches waiting for an email digest"""
+        return AlertMatch.objects.filter(
+            notified_at__isnull=True,
+            alert__is_active=True,
+            alert__email_notifications=True,
+        ).exclude(alert__user__email='')
+
+    def due_users(self, flush: bool = False) -> List[int]:
+        """Users whose oldest pending match has aged past the digest window"""
+        users = self.pending().order_by().values('alert__user_id').annotate(oldest=Min('created_at'))
+        if not flush:
+            users = users.filter(oldest__lte=timezone.now() - self.window)
+        return [row['alert__user_id'] for row in users]
+
+    def deliver(self, flush: bool = False) -> Dict:
+        """Send every due digest; ``flush`` ignores the window"""
+        users = self.due_users(flush)
+        if not users:
+            return self.stats
+
+        connection = self.connection or get_connection()
+        opened = connection.open()
+        try:
+            for start in range(0, len(users), self.batch_size):
+                try:
+                    self._deliver_batch(connection, users[start:start + self.batch_size])
+                except Exception as e:
+                    # Unsent matches stay pending for the next run
+                    self.stats['errors'].append(f"Error sending alert digests: {e}")
+                    logger.error(f"Error sending alert digests: {e}")
+                    break
+        finally:
+            if opened:
+                connection.close()
+        return self.stats
+
+    def _deliver_batch(self, connection, user_ids: List[int]):
+        now = timezone.now()
+        with transaction.atomic():
+            matches = list(
+                self.pending()
+                .filter(alert__user_id__in=user_ids)
+                .select_for_update(skip_locked=True, of=('self',))
+                .select_related('alert__user', 'bill')
+                .only(
+                    'id', 'alert_id', 'bill_id', 'content_hash', 'match_type', 'matched_value',
+                    'alert__name', 'alert__user__email', 'alert__user__first_name', 'alert__user__username',
+                    'bill__congress_number', 'bill__bill_type', 'bill__bill_number', 'bill__title',
+                    'bill__latest_action',
+                )
+                .order_by('alert__user_id', 'bill_id', 'id')
+            )
+            if not matches:
+                return
+
+            already_sent = set(
+                AlertMatch.objects.filter(
+                    alert__user_id__in=user_ids,
+                    bill_id__in={match.bill_id for match in matches},
+                    notified_at__isnull=False,
+                ).values_list('alert__user_id', 'bill_id', 'content_hash')
+            )
+            # user -> bill -> matches, in bill order
+            digests = defaultdict(dict)
+            for match in matches:
+                user = match.alert.user
+                if (user.id, match.bill_id, match.content_hash) in already_sent:
+                    self.stats['duplicates_skipped'] += 1
+                    continue
+                digests[user].setdefault(match.bill_id, []).append(match)
+
+            AlertMatch.objects.filter(id__in=[match.id for match in matches]).update(notified_at=now)
+
+        for user, bills in digests.items():
+            match_ids = [match.id for bill_matches in bills.values() for match in bill_matches]
+            try:
+                sent = connection.send_messages([self.build_message(user, bills)])
+            except Exception as e:
+                self.stats['errors'].append(f"Error sending alert digest to user {user.id}: {e}")
+                logger.error(f"Error sending alert digest to user {user.id}: {e}")
+                sent = 0
+            if sent:
+                self.stats['digests_sent'] += 1
+                self.stats['matches_notified'] += len(match_ids)
+            else:
+                # Back onto the queue for the next run
+                AlertMatch.objects.filter(id__in=match_ids, notified_at=now).update(notified_at=None)
+                self.stats['digests_failed'] += 1
+
+    @staticmethod
+    def build_message(user, bills: Dict[int, List[AlertMatch]]) -> EmailMessage:
+        """Plain-text digest listing each matched bill once with the alerts it matched"""
+        lines = [f"Hello {user.first_name or user.username},", ""]
+        lines.append(f"{len(bills)} bill{'s' if len(bills) != 1 else ''} matched your legislative alerts:")
+        for matches in bills.values():
+            bill = matches[0].bill
+            reasons = ', '.join(
+                f"{match.alert.name} ({match.match_type}: {match.matched_value})" if match.matched_value
+                else match.alert.name
+                for match in matches
+            )
+            lines.append("")
+            lines.append(f"- {bill.bill_type.upper()} {bill.bill_number} (Congress {bill.congress_number}): {bill.title}")
+            if bill.latest_action:
+                lines.append(f"  Latest action: {bill.latest_action}")
+            lines.append(f"  Matched: {reasons}")
+
+        return EmailMessage(
+            subject=f"PolicyLogs: {len(bills)} bill{'s' if len(bills) != 1 else ''} matched your alerts",
+            body='\n'.join(lines),
+            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', None),
+            to=[user.email],
+        )
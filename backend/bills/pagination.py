@@ -0,0 +1,109 @@
+"""
+Bill API Pagination
+Keyset (seek) pagination for the bills endpoints
+"""
+
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class BillCursorPagination(BasePagination):
+    """
+    Forward-only keyset pagination on ``(latest_action_date, id)``
+
+    Bills are ordered newest action first with undated bills last, and ties
+    broken by ``id``. The opaque cursor holds the key of the last bill on
+    the page, so every page is a bounded index range scan. No ``COUNT(*)``
+    or ``OFFSET`` is issued, however deep the page.
+    """
+
+    page_size = getattr(settings, 'REST_FRAMEWORK', {}).get('PAGE_SIZE') or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    ordering = (F('latest_action_date').desc(nulls_last=True), F('id').desc())
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(*position))
+
+        # One extra row tells us whether a next page exists
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = (rows[-1].latest_action_date, rows[-1].pk) if self.has_next else None
+        return rows
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    @staticmethod
+    def after(action_date, pk) -> Q:
+        """Rows sorting strictly after the given key"""
+        if action_date is None:
+            return Q(latest_action_date__isnull=True, id__lt=pk)
+        return (
+            Q(latest_action_date__lt=action_date)
+            | Q(latest_action_date=action_date, id__lt=pk)
+            | Q(latest_action_date__isnull=True)
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            date_part, pk_part = raw.split('|', 1)
+            action_date = parse_datetime(date_part) if date_part else None
+            if date_part and action_date is None:
+                raise ValueError(date_part)
+            return action_date, int(pk_part)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(action_date, pk) -> str:
+        raw = f"{action_date.isoformat() if action_date else ''}|{pk}"
+        return base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(*self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,121 @@
+"""
+Congress.gov Record Parsers
+Maps Congress.gov bill records onto LegislativeBill and child row values,
+shared by the API sync and the bulk import
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+
+# Congress.gov originChamber values
+CHAMBERS = {'House': 'house', 'Senate': 'senate'}
+
+
+def parse_api_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Congress.gov date or datetime string into an aware datetime"""
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def classify_action(text: str, action_type: str = '') -> str:
+    """Map a Congress.gov action onto BillAction.ACTION_TYPE_CHOICES"""
+    lowered = (text or '').lower()
+    if action_type == 'BecameLaw' or 'became public law' in lowered or 'signed by president' in lowered:
+        return 'signed'
+    if 'veto' in lowered and 'overrid' in lowered:
+        return 'override'
+    if action_type == 'Veto' or 'vetoed' in lowered:
+        return 'vetoed'
+    if action_type == 'IntroReferral' and 'introduced' in lowered:
+        return 'introduced'
+    if 'reported' in lowered and action_type != 'Floor':
+        return 'reported'
+    if 'failed' in lowered or 'not agreed to' in lowered:
+        return 'failed'
+    if 'passed' in lowered or lowered.startswith(('resolution agreed to', 'concurrent resolution agreed to')):
+        return 'passed'
+    if 'amendment' in lowered:
+        return 'amended'
+    return 'referred'
+
+
+def parse_bill(bill_data: Dict) -> Dict:
+    """Map a Congress.gov bill record onto LegislativeBill field values"""
+    latest_action = bill_data.get('latestAction') or {}
+    return {
+        'congress_number': int(bill_data.get('congress', 118)),
+        'bill_type': bill_data.get('type', '').lower(),
+        'bill_number': str(bill_data.get('number', '')),
+        'title': bill_data.get('title', ''),
+        'chamber': CHAMBERS.get(bill_data.get('originChamber', ''), ''),
+        'congress_url': bill_data.get('url', ''),
+        'latest_action': latest_action.get('text', ''),
+        'latest_action_date': parse_api_date(latest_action.get('actionDate')),
+    }
+
+
+def parse_bill_details(payload: Dict) -> Dict:
+    """Map detail payloads onto LegislativeBill fields and child row values"""
+    details = payload['details']
+    sponsor = (details.get('sponsors') or [{}])[0]
+    subjects = payload['subjects'] or {}
+    policy_area = (subjects.get('policyArea') or details.get('policyArea') or {}).get('name', '')
+
+    parsed = {
+        'bill': None,
+        'actions': [],
+        'cosponsors': [],
+        'subjects': [],
+    }
+    if details:
+        parsed['bill'] = {
+            'introduced_date': parse_api_date(details.get('introducedDate')),
+            'sponsor_name': sponsor.get('fullName', ''),
+            'sponsor_party': sponsor.get('party', ''),
+            'sponsor_state': sponsor.get('state', ''),
+            'sponsor_bioguide_id': sponsor.get('bioguideId', ''),
+            'policy_area': policy_area,
+        }
+
+    for action in payload['actions']:
+        action_date = parse_api_date(action.get('actionDate'))
+        if not action_date:
+            continue
+        source = (action.get('sourceSystem') or {}).get('name', '')
+        parsed['actions'].append({
+            'action_type': classify_action(action.get('text', ''), action.get('type', '')),
+            'action_date': action_date,
+            'description': action.get('text', ''),
+            'chamber': 'house' if 'House' in source else 'senate' if 'Senate' in source else '',
+        })
+
+    for cosponsor in payload['cosponsors']:
+        if not cosponsor.get('bioguideId'):
+            continue
+        parsed['cosponsors'].append({
+            'name': cosponsor.get('fullName', ''),
+            'party': cosponsor.get('party', ''),
+            'state': cosponsor.get('state', ''),
+            'bioguide_id': cosponsor['bioguideId'],
+            'sponsored_date': parse_api_date(cosponsor.get('sponsorshipDate')),
+            'withdrawn_date': parse_api_date(cosponsor.get('sponsorshipWithdrawnDate')),
+        })
+
+    for subject in subjects.get('legislativeSubjects', []):
+        if subject.get('name'):
+            parsed['subjects'].append({'name': subject['name'], 'policy_area': policy_area})
+
+    return parsed
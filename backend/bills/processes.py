@@ -0,0 +1,48 @@
+"""
+Worker Processes
+Process-pool helpers for commands that shard their work by congress
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Tuple
+
+from django.db import connections
+
+
+def init_worker():
+    """Set up Django in workers started with spawn/forkserver"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _run_in_worker(fn: Callable, task: Tuple):
+    try:
+        return fn(*task)
+    finally:
+        connections.close_all()
+
+
+def run_partitions(fn: Callable, tasks: Iterable[Tuple], workers: int) -> Iterator:
+    """
+    Yield ``fn(*task)`` for every task, in completion order
+
+    Tasks run on up to ``workers`` processes, each opening its own database
+    connection. They run in the calling process when there is only one
+    worker or task, or on SQLite, which allows only one writer at a time.
+    ``fn`` must be a picklable module-level function.
+    """
+    tasks = list(tasks)
+    if workers <= 1 or len(tasks) <= 1 or connections['default'].vendor == 'sqlite':
+        for task in tasks:
+            yield fn(*task)
+        return
+
+    # Forked workers must open their own connections, not share ours
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=init_worker) as pool:
+        futures = [pool.submit(_run_in_worker, fn, task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
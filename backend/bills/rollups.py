@@ -0,0 +1,178 @@
+"""
+API Log Rollups
+Aggregates raw APILog rows into per-minute/per-hour buckets and prunes old rows
+"""
+
+import logging
+import math
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import APILog, APILogRollup
+
+
+logger = logging.getLogger(__name__)
+
+GRANULARITIES = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+}
+
+_BILL_ENDPOINT = re.compile(r'^bill/\d+/[a-z]+/\d+')
+_CONGRESS_ENDPOINT = re.compile(r'^(bill|amendment|committee-report)/\d+')
+_NUMERIC_SEGMENT = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Collapse per-bill endpoints into templates so rollups stay low-cardinality"""
+    endpoint = _BILL_ENDPOINT.sub('bill/{congress}/{type}/{number}', endpoint)
+    endpoint = _CONGRESS_ENDPOINT.sub(r'\1/{congress}', endpoint)
+    return _NUMERIC_SEGMENT.sub('{id}', endpoint)
+
+
+def floor_time(value: datetime, granularity: str) -> datetime:
+    """Start of the bucket containing ``value``"""
+    value = value.replace(second=0, microsecond=0)
+    if granularity == 'hour':
+        value = value.replace(minute=0)
+    return value
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class APILogRollupService:
+    """
+    Incremental APILog rollup and retention
+
+    Each run continues after the newest stored bucket of each granularity
+    and only aggregates buckets that closed at least ``lag_seconds`` ago, so
+    rows still sitting in an APILogBuffer are not missed. Raw rows are read
+    one hour at a time; empty stretches are skipped with a single lookup.
+    """
+
+    WINDOW = timedelta(hours=1)
+
+    def __init__(self, lag_seconds: int = None, retention_days: int = None, batch_size: int = None):
+        if lag_seconds is None:
+            lag_seconds = getattr(settings, 'API_LOG_ROLLUP_LAG_SECONDS', 120)
+        self.lag = timedelta(seconds=lag_seconds)
+        if retention_days is None:
+            retention_days = getattr(settings, 'API_LOG_RETENTION_DAYS', 7)
+        self.retention_days = retention_days
+        self.batch_size = batch_size or getattr(settings, 'API_LOG_PURGE_BATCH_SIZE', 5000)
+
+    def rollup(self) -> Dict:
+        """Aggregate every closed bucket not rolled up yet"""
+        stats = {'buckets_written': 0, 'rows_aggregated': 0}
+        now = timezone.now()
+        for granularity in GRANULARITIES:
+            self._rollup_granularity(granularity, now, stats)
+        return stats
+
+    def _rollup_granularity(self, granularity: str, now: datetime, stats: Dict):
+        step = GRANULARITIES[granularity]
+        end = floor_time(now - self.lag, granularity)
+
+        last = APILogRollup.objects.filter(granularity=granularity).aggregate(
+            last=Max('bucket_start')
+        )['last']
+        start = last + step if last else self._next_timestamp(None, end, granularity)
+
+        while start is not None and start < end:
+            window_end = min(start + self.WINDOW, end)
+            rows = list(
+                APILog.objects.filter(timestamp__gte=start, timestamp__lt=window_end)
+                .order_by()
+                .values_list('timestamp', 'service', 'endpoint', 'status_code',
+                             'response_time', 'response_size', 'error_message')
+            )
+            if rows:
+                stats['buckets_written'] += self._write_buckets(granularity, rows)
+                stats['rows_aggregated'] += len(rows)
+                start = window_end
+            else:
+                start = self._next_timestamp(window_end, end, granularity)
+
+    @staticmethod
+    def _next_timestamp(after: Optional[datetime], before: datetime, granularity: str) -> Optional[datetime]:
+        """Bucket start of the first raw row in [after, before), if any"""
+        rows = APILog.objects.filter(timestamp__lt=before)
+        if after is not None:
+            rows = rows.filter(timestamp__gte=after)
+        first = rows.order_by('timestamp').values_list('timestamp', flat=True).first()
+        return floor_time(first, granularity) if first else None
+
+    def _write_buckets(self, granularity: str, rows) -> int:
+        groups = defaultdict(list)
+        for timestamp, service, endpoint, status_code, response_time, size, error in rows:
+            key = (floor_time(timestamp, granularity), service, normalize_endpoint(endpoint), status_code)
+            groups[key].append((response_time, size or 0, bool(error)))
+
+        rollups = []
+        for (bucket_start, service, endpoint, status_code), calls in groups.items():
+            times = sorted(call[0] for call in calls)
+            rollups.append(APILogRollup(
+                granularity=granularity,
+                bucket_start=bucket_start,
+                service=service,
+                endpoint=endpoint,
+                status_code=status_code,
+                count=len(calls),
+                error_count=sum(1 for call in calls if call[2]),
+                p50_response_time=percentile(times, 50),
+                p95_response_time=percentile(times, 95),
+                p99_response_time=percentile(times, 99),
+                max_response_time=times[-1],
+                total_bytes=sum(call[1] for call in calls),
+            ))
+
+        with transaction.atomic():
+            APILogRollup.objects.bulk_create(
+                rollups,
+                update_conflicts=True,
+                unique_fields=['granularity', 'bucket_start', 'service', 'endpoint', 'status_code'],
+                update_fields=['count', 'error_count', 'p50_response_time', 'p95_response_time',
+                               'p99_response_time', 'max_response_time', 'total_bytes'],
+            )
+        return len(rollups)
+
+    def purge(self) -> int:
+        """
+        Delete raw rows older than the retention window in bounded batches
+
+        Rows newer than the last hourly rollup are always kept, so a stalled
+        rollup never loses data.
+        """
+        cutoff = timezone.now() - timedelta(days=self.retention_days)
+        rolled_through = APILogRollup.objects.filter(granularity='hour').aggregate(
+            last=Max('bucket_start')
+        )['last']
+        if rolled_through is None:
+            return 0
+        cutoff = min(cutoff, rolled_through + GRANULARITIES['hour'])
+
+        deleted = 0
+        while True:
+            ids = list(
+                APILog.objects.filter(timestamp__lt=cutoff)
+                .order_by()
+                .values_list('id', flat=True)[:self.batch_size]
+            )
+            if not ids:
+                break
+            deleted += APILog.objects.filter(id__in=ids).delete()[0]
+            logger.debug(f"Purged {deleted} API log rows so far")
+            if len(ids) < self.batch_size:
+                break
+        return deleted
@@ -0,0 +1,169 @@
+"""
+Bill Full-Text Search
+PostgreSQL tsvector search with an SQLite FTS5 fallback for local development
+"""
+
+import re
+from typing import List
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Concat
+
+from .models import BillAction, LegislativeBill
+
+
+FTS_TABLE = 'bills_legislativebill_fts'
+
+# Highlight markers for result snippets
+START_SEL = '<mark>'
+STOP_SEL = '</mark>'
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def search_config() -> str:
+    return getattr(settings, 'BILL_SEARCH_CONFIG', 'english')
+
+
+def search_vector():
+    """Weighted document: title (A) > short title (B) > summary (C) > action descriptions (D)"""
+    from django.contrib.postgres.aggregates import StringAgg
+    from django.contrib.postgres.search import SearchVector
+
+    config = search_config()
+    actions = Subquery(
+        BillAction.objects.filter(bill=OuterRef('pk'))
+        .order_by()
+        .values('bill')
+        .annotate(text=StringAgg('description', delimiter=' '))
+        .values('text')[:1]
+    )
+    return (
+        SearchVector('title', weight='A', config=config)
+        + SearchVector('short_title', weight='B', config=config)
+        + SearchVector('summary', weight='C', config=config)
+        + SearchVector(actions, weight='D', config=config)
+    )
+
+
+def ensure_fts_table():
+    """Create the SQLite FTS5 index if it does not exist yet"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            f'USING fts5(title, short_title, summary, actions, tokenize="porter unicode61")'
+        )
+
+
+def refresh_search_index(bills: QuerySet) -> int:
+    """
+    Recompute the search document of the given bills
+
+    Called by the sync writers for the rows they just wrote, so the index
+    is maintained in bulk per chunk instead of by per-row triggers.
+    """
+    if connection.vendor == 'postgresql':
+        return bills.order_by().update(search_vector=search_vector())
+    if connection.vendor != 'sqlite':
+        return 0
+
+    ensure_fts_table()
+    ids_sql, params = bills.order_by().values('id').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({ids_sql})', params)
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, short_title, summary, actions) '
+            f'SELECT b.id, b.title, b.short_title, b.summary, '
+            f'(SELECT group_concat(a.description, \' \') FROM bills_billaction a WHERE a.bill_id = b.id) '
+            f'FROM bills_legislativebill b WHERE b.id IN ({ids_sql})',
+            params,
+        )
+        return cursor.rowcount
+
+
+def search_bills(query: str, limit: int = 20, queryset: QuerySet = None) -> List[LegislativeBill]:
+    """
+    Best matches for a free-text query, most relevant first
+
+    Each returned bill carries ``rank`` (higher is better) and a
+    ``headline`` snippet with matches wrapped in ``<mark>`` tags. Backends
+    without a full-text index fall back to a plain substring search.
+    """
+    if queryset is None:
+        queryset = LegislativeBill.objects.all()
+    if connection.vendor == 'postgresql':
+        return _search_postgres(query, limit, queryset)
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(query, limit, queryset)
+    return _search_fallback(query, limit, queryset)
+
+
+def _search_postgres(query: str, limit: int, queryset: QuerySet) -> List[LegislativeBill]:
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+    search_query = SearchQuery(query, search_type='websearch', config=search_config())
+    return list(
+        queryset.filter(search_vector=search_query)
+        .annotate(
+            rank=SearchRank('search_vector', search_query),
+            headline=SearchHeadline(
+                Concat('title', Value(' '), 'summary'),
+                search_query,
+                config=search_config(),
+                start_sel=START_SEL,
+                stop_sel=STOP_SEL,
+                max_fragments=2,
+            ),
+        )
+        .order_by('-rank', '-id')[:limit]
+    )
+
+
+def _search_sqlite(query: str, limit: int, queryset: QuerySet) -> List[LegislativeBill]:
+    # Quote every word so user input is never parsed as FTS5 syntax
+    terms = ' '.join(f'"{word}"' for word in _WORD.findall(query))
+    if not terms:
+        return []
+    ensure_fts_table()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, bm25({FTS_TABLE}, 10.0, 5.0, 2.0, 1.0) AS score, '
+            f'snippet({FTS_TABLE}, -1, %s, %s, %s, 16) '
+            f'FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s',
+            [START_SEL, STOP_SEL, '...', terms, limit],
+        )
+        matches = cursor.fetchall()
+
+    bills = queryset.in_bulk([bill_id for bill_id, _score, _snippet in matches])
+    results = []
+    for bill_id, score, snippet in matches:
+        bill = bills.get(bill_id)
+        if bill is None:
+            continue
+        # bm25 is lower-is-better; flip it so rank reads like ts_rank
+        bill.rank = -score
+        bill.headline = snippet
+        results.append(bill)
+    return results
+
+
+def _search_fallback(query: str, limit: int, queryset: QuerySet) -> List[LegislativeBill]:
+    # Every word has to appear in the title, short title or summary; bills
+    # whose title holds more of the words rank higher
+    words = _WORD.findall(query)
+    if not words:
+        return []
+    for word in words:
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(short_title__icontains=word) | Q(summary__icontains=word)
+        )
+    highlight = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    results = list(queryset.order_by('-id')[:limit])
+    for bill in results:
+        title = bill.title or ''
+        bill.rank = float(sum(word.lower() in title.lower() for word in words))
+        bill.headline = highlight.sub(lambda match: f'{START_SEL}{match.group(0)}{STOP_SEL}', title)
+    results.sort(key=lambda bill: bill.rank, reverse=True)
+    return results
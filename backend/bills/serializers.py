@@ -0,0 +1,69 @@
+from rest_framework import serializers
+from .models import BillAction, BillCosponsor, BillSubject, CongressBillStats, LegislativeBill
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+class BillSubjectSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BillSubject
+        fields = ['name', 'policy_area']
+
+
+class BillActionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BillAction
+        fields = ['action_type', 'action_date', 'description', 'chamber']
+
+
+class BillCosponsorSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BillCosponsor
+        fields = ['name', 'party', 'state', 'bioguide_id', 'sponsored_date', 'withdrawn_date']
+
+
+class SparseFieldsMixin:
+    """Keeps only the fields named in the ``fields`` keyword argument, when given"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class LegislativeBillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    # Related lists, only prefetched when requested
+    NESTED_FIELDS = ['subjects', 'actions', 'cosponsors']
+
+    subjects = BillSubjectSerializer(many=True, read_only=True)
+    actions = BillActionSerializer(many=True, read_only=True)
+    cosponsors = BillCosponsorSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = LegislativeBill
+        fields = [
+            'id', 'bill_slug', 'congress_number', 'bill_type', 'bill_number', 'chamber',
+            'title', 'short_title', 'summary', 'status', 'latest_action', 'latest_action_date',
+            'sponsor_name', 'sponsor_party', 'sponsor_state', 'sponsor_bioguide_id',
+            'introduced_date', 'congress_url', 'action_count', 'cosponsor_count', 'subject_names',
+            'latest_action_type', 'subjects', 'actions', 'cosponsors',
+        ]
+
+
+class BillSearchResultSerializer(LegislativeBillSerializer):
+    rank = serializers.FloatField(read_only=True)
+    headline = serializers.CharField(read_only=True)
+
+    class Meta(LegislativeBillSerializer.Meta):
+        fields = LegislativeBillSerializer.Meta.fields + ['rank', 'headline']
+
+
+class CongressBillStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CongressBillStats
+        fields = [
+            'congress_number', 'bill_count', 'by_status', 'by_chamber', 'by_party',
+            'by_policy_area', 'introduced_per_week', 'computed_at',
+        ]
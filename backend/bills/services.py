@@ -3,155 +3,863 @@ Congress.gov API Service
 Service for fetching federal legislative data from official Congress.gov API
 """
 
+import asyncio
 import requests
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
 from django.conf import settings
-from django.utils.dateparse import parse_datetime
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+from .alerts import AlertMatcher
+from .http_cache import ResponseCache, get_response_cache
+from .parsers import parse_api_date, parse_bill, parse_bill_details
+from .stats import refresh_congress_stats
+from .streaming import iter_json_items
+from .telemetry import APILogBuffer, get_api_log_buffer
+from .throttling import TokenBucket, backoff_delay, get_limiter, parse_retry_after
+from .writers import BillDetailWriter, BillWriter
 
 
 logger = logging.getLogger(__name__)
 
 
+_DEFAULT = object()
+_MISS = object()
+
+
 class CongressAPI:
     """Congress.gov API client (official Library of Congress API)"""
     
     BASE_URL = "https://api.congress.gov/v3"
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    USER_AGENT = 'PolicyLogs/1.0'
+    STREAM_CHUNK_SIZE = 64 * 1024
     
-    def __init__(self, api_key: str = None):
+    # Concurrency slots per host, shared by every client in the process
+    _host_slots: Dict[str, threading.BoundedSemaphore] = {}
+    _host_slots_lock = threading.Lock()
+    
+    def __init__(self, api_key: str = None, max_per_host: int = None,
+                 limiter: TokenBucket = None, max_retries: int = None,
+                 cache: Optional[ResponseCache] = _DEFAULT, api_log: Optional[APILogBuffer] = _DEFAULT):
         self.api_key = api_key or getattr(settings, 'CONGRESS_API_KEY', '')
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'PolicyLogs/1.0'
+        self.max_per_host = max_per_host or getattr(settings, 'CONGRESS_API_MAX_PER_HOST', 8)
+        # Congress.gov allows 5,000 requests per hour per key; the limiter is
+        # shared process-wide, or across processes when a lock file is set
+        self.limiter = limiter or get_limiter(
+            getattr(settings, 'CONGRESS_API_RATE_PER_HOUR', 5000),
+            getattr(settings, 'CONGRESS_API_BURST', 40),
+            getattr(settings, 'CONGRESS_API_RATE_LIMIT_FILE', None),
+        )
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'CONGRESS_API_MAX_RETRIES', 5)
+        # Detail responses are cached for CONGRESS_API_CACHE_TTL seconds;
+        # pass cache=None to disable caching for this client
+        if cache is _DEFAULT:
+            cache = get_response_cache(
+                getattr(settings, 'CONGRESS_API_CACHE_BACKEND', 'memory'),
+                getattr(settings, 'CONGRESS_API_CACHE_PATH', 'congress_api_cache.sqlite3'),
+                getattr(settings, 'CONGRESS_API_CACHE_MAX_ENTRIES', 10000),
+            )
+        self.cache = cache
+        self.cache_ttl = getattr(settings, 'CONGRESS_API_CACHE_TTL', 3600)
+        # Every HTTP call is recorded to APILog through a buffered writer
+        self.api_log = get_api_log_buffer() if api_log is _DEFAULT else api_log
+        self._stats_lock = threading.Lock()
+        self.request_stats = {
+            'api_requests': 0,
+            'api_retries': 0,
+            'api_throttled': 0,
+            'rate_limit_wait_seconds': 0.0,
+            'backoff_wait_seconds': 0.0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_revalidated': 0,
+        }
+        self.session = self._create_session()
+    
+    def _create_session(self):
+        """Blocking HTTP session with one pooled connection per allowed in-flight request"""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': self.USER_AGENT
         })
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Semaphore bounding in-flight requests to the URL's host"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return slot
+    
+    def _record(self, **counters):
+        """Add to the request counters from any worker thread"""
+        with self._stats_lock:
+            for name, value in counters.items():
+                self.request_stats[name] += value
     
-    def _make_request(self, endpoint: str, params: Dict = None) -> Dict:
-        """Make API request with error handling"""
+    def _make_request(self, endpoint: str, params: Dict = None,
+                      cache_ttl: Optional[float] = None, revalidate: bool = False) -> Dict:
+        """
+        Make API request with error handling
+        
+        With a response cache configured, fresh entries are served without a
+        request. Stale entries (or any entry when ``revalidate`` is set) are
+        revalidated with ``If-None-Match``/``If-Modified-Since`` when the
+        server supplied validators, and a 304 reuses the cached body.
+        ``cache_ttl=0`` makes a response revalidate-only.
+        """
+        plan = self._plan_request(endpoint, params, cache_ttl, revalidate)
+        if plan['cached'] is not _MISS:
+            return plan['cached']
+        response = self._send(plan['url'], plan['params'], plan['headers'])
+        return self._complete_request(plan, response.status_code, response.headers, response.json)
+    
+    def _plan_request(self, endpoint: str, params: Optional[Dict], cache_ttl: Optional[float],
+                      revalidate: bool) -> Dict:
+        """Resolve URL, params and cache state for a request before sending it"""
         params = params or {}
         params.update({
             'api_key': self.api_key,
             'format': 'json'
         })
         
-        url = f"{self.BASE_URL}/{endpoint}"
+        plan = {
+            'url': f"{self.BASE_URL}/{endpoint}",
+            'params': params,
+            'ttl': self.cache_ttl if cache_ttl is None else cache_ttl,
+            'key': None,
+            'entry': None,
+            'headers': {},
+            'cached': _MISS,
+        }
+        if self.cache:
+            plan['key'] = self.cache.make_key(endpoint, params)
+            entry = plan['entry'] = self.cache.get(plan['key'])
+            if entry and not revalidate and self.cache.is_fresh(entry):
+                self.cache.record('hits')
+                self._record(cache_hits=1)
+                plan['cached'] = entry['body']
+            elif entry:
+                if entry['etag']:
+                    plan['headers']['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    plan['headers']['If-Modified-Since'] = entry['last_modified']
+        return plan
+    
+    def _complete_request(self, plan: Dict, status_code: int, headers, load_body) -> Dict:
+        """Turn a final response into a body, reusing or refreshing the cache"""
+        entry = plan['entry']
+        if status_code == 304 and entry:
+            self.cache.record('revalidated')
+            self._record(cache_revalidated=1)
+            self.cache.refresh(plan['key'], plan['ttl'])
+            return entry['body']
         
-        try:
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Congress API request failed: {e}")
-            raise
-    
-    def get_recent_bills(self, congress: int = 118, limit: int = 20, offset: int = 0) -> Dict:
-        """Get recent bills from Congress.gov API"""
+        data = load_body()
+        if self.cache:
+            self.cache.record('misses')
+            self._record(cache_misses=1)
+            etag = headers.get('ETag', '')
+            last_modified = headers.get('Last-Modified', '')
+            if plan['ttl'] > 0 or etag or last_modified:
+                self.cache.set(plan['key'], data, plan['ttl'], etag=etag, last_modified=last_modified)
+        return data
+    
+    def _log_call(self, url: str, params: Dict, started: float, response=None, error: Exception = None,
+                  streamed: bool = False):
+        """Queue an APILog record for one HTTP call"""
+        if not self.api_log:
+            return
+        status_code = response.status_code if response is not None else 0
+        response_size = None
+        error_message = str(error) if error else ''
+        if response is not None:
+            length = response.headers.get('Content-Length', '')
+            if length.isdigit():
+                response_size = int(length)
+            elif not streamed:
+                # Streamed bodies are never read here just to measure them
+                response_size = len(response.content)
+            if status_code >= 400 and not error_message:
+                error_message = f"HTTP {status_code}"
+        self.api_log.record(
+            service='congress_gov',
+            endpoint=url[len(self.BASE_URL) + 1:][:500],
+            method='GET',
+            status_code=status_code,
+            response_time=time.monotonic() - started,
+            request_params={k: v for k, v in params.items() if k != 'api_key'},
+            user_agent=self.USER_AGENT,
+            response_size=response_size,
+            error_message=error_message,
+        )
+    
+    def _retry_delay(self, status_code: int, headers, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a response, or None when it is final"""
+        if status_code not in self.RETRY_STATUSES or attempt >= self.max_retries:
+            return None
+        delay = parse_retry_after(headers.get('Retry-After'))
+        if status_code == 429:
+            self._record(api_throttled=1)
+            if delay is not None:
+                # Every caller sharing the limiter waits out the server's pause
+                self.limiter.pause(delay)
+                return 0.0
+        return backoff_delay(attempt) if delay is None else delay
+    
+    def _send(self, url: str, params: Dict, headers: Dict, stream: bool = False):
+        """
+        Send a GET request, throttled and retried
+        
+        Every attempt takes a token from the rate limiter first. 429 and 5xx
+        responses, connection errors and timeouts are retried up to
+        ``max_retries`` times: a 429 ``Retry-After`` pauses the shared limiter
+        for all callers, anything else sleeps a jittered exponential backoff.
+        With ``stream=True`` the body is left unread for the caller to consume.
+        """
+        attempt = 0
+        while True:
+            waited = self.limiter.acquire()
+            self._record(api_requests=1, rate_limit_wait_seconds=waited)
+            started = time.monotonic()
+            try:
+                with self._host_slot(url):
+                    response = self.session.get(url, params=params, headers=headers, timeout=30, stream=stream)
+                self._log_call(url, params, started, response=response, streamed=stream)
+                delay = self._retry_delay(response.status_code, response.headers, attempt)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+                response.close()
+                logger.warning(f"Congress API returned {response.status_code} for {urlparse(url).path}, retrying")
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._log_call(url, params, started, error=e)
+                if attempt >= self.max_retries:
+                    logger.error(f"Congress API request failed: {e}")
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning(f"Congress API request failed ({e}), retrying")
+            except requests.exceptions.RequestException as e:
+                if e.response is None:
+                    self._log_call(url, params, started, error=e)
+                logger.error(f"Congress API request failed: {e}")
+                raise
+            
+            attempt += 1
+            self._record(api_retries=1, backoff_wait_seconds=delay)
+            time.sleep(delay)
+    
+    def get_recent_bills(self, congress: int = 118, limit: int = 20, offset: int = 0,
+                         from_datetime: Optional[datetime] = None, to_datetime: Optional[datetime] = None) -> Dict:
+        """Get recent bills from Congress.gov API, optionally only those updated within a time window"""
         endpoint = f"bill/{congress}"
+        params = self._recent_bills_params(limit, offset, from_datetime, to_datetime)
+        # List pages change constantly; only ever reuse them after revalidation
+        return self._make_request(endpoint, params, cache_ttl=0)
+    
+    def iter_recent_bills(self, congress: int = 118, limit: int = 20, offset: int = 0,
+                          from_datetime: Optional[datetime] = None) -> Iterator[Dict]:
+        """
+        Stream one page of recent bills, yielding each bill as it is parsed
+        
+        The response body is read in ``STREAM_CHUNK_SIZE`` chunks and fed to
+        an incremental JSON parser, so the page is never held in memory as a
+        whole. Streamed pages bypass the response cache.
+        """
+        params = self._recent_bills_params(limit, offset, from_datetime)
+        params.update({
+            'api_key': self.api_key,
+            'format': 'json'
+        })
+        response = self._send(f"{self.BASE_URL}/bill/{congress}", params, {}, stream=True)
+        with response:
+            yield from iter_json_items(response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE), 'bills')
+    
+    @staticmethod
+    def _recent_bills_params(limit: int, offset: int, from_datetime: Optional[datetime],
+                             to_datetime: Optional[datetime] = None) -> Dict:
         params = {
             'limit': limit,
             'offset': offset,
             'sort': 'updateDate+desc'
         }
-        return self._make_request(endpoint, params)
+        if from_datetime:
+            params['fromDateTime'] = from_datetime.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        if to_datetime:
+            params['toDateTime'] = to_datetime.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return params
     
-    def get_bill_details(self, congress: int, bill_type: str, bill_number: str) -> Dict:
+    def get_bill_details(self, congress: int, bill_type: str, bill_number: str,
+                         revalidate: bool = False) -> Dict:
         """Get detailed information about a specific bill"""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}"
-        return self._make_request(endpoint)
+        return self._make_request(endpoint, revalidate=revalidate)
     
-    def get_bill_actions(self, congress: int, bill_type: str, bill_number: str) -> Dict:
-        """Get actions for a specific bill"""
+    def get_bill_actions(self, congress: int, bill_type: str, bill_number: str, limit: int = 250,
+                         offset: int = 0, revalidate: bool = False) -> Dict:
+        """Get one page of actions for a specific bill"""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/actions"
-        return self._make_request(endpoint)
+        return self._make_request(endpoint, self._page_params(limit, offset), revalidate=revalidate)
     
-    def get_bill_cosponsors(self, congress: int, bill_type: str, bill_number: str) -> Dict:
-        """Get cosponsors for a specific bill"""
+    def get_bill_cosponsors(self, congress: int, bill_type: str, bill_number: str, limit: int = 250,
+                            offset: int = 0, revalidate: bool = False) -> Dict:
+        """Get one page of cosponsors for a specific bill"""
         endpoint = f"bill/{congress}/{bill_type}/{bill_number}/cosponsors"
-        return self._make_request(endpoint)
+        return self._make_request(endpoint, self._page_params(limit, offset), revalidate=revalidate)
+    
+    def get_bill_subjects(self, congress: int, bill_type: str, bill_number: str, limit: int = 250,
+                          offset: int = 0, revalidate: bool = False) -> Dict:
+        """Get one page of legislative subjects, and the policy area, for a specific bill"""
+        endpoint = f"bill/{congress}/{bill_type}/{bill_number}/subjects"
+        return self._make_request(endpoint, self._page_params(limit, offset), revalidate=revalidate)
+    
+    @staticmethod
+    def _page_params(limit: int, offset: int) -> Dict:
+        # The first page keeps its historical cache key
+        return {'limit': limit, 'offset': offset} if offset else {'limit': limit}
 
 
 class BillSyncService:
     """Service for syncing bill data from APIs to database"""
     
-    def __init__(self):
-        self.api = CongressAPI()
+    PAGE_SIZE = 250  # Congress.gov maximum page size
+    def __init__(self, api: CongressAPI = None, concurrency: int = None, use_async: bool = False):
+        self._runner = None
+        if use_async:
+            from .async_api import AsyncCongressAPI, EventLoopThread
+            
+            # Requests become coroutines on one event loop thread, so the
+            # number in flight is bounded by the connection pool, not threads
+            self.api = api or AsyncCongressAPI()
+            self._runner = EventLoopThread()
+            default_concurrency = getattr(settings, 'BILL_SYNC_ASYNC_CONCURRENCY', 64)
+        else:
+            self.api = api or CongressAPI()
+            default_concurrency = getattr(settings, 'BILL_SYNC_CONCURRENCY', 4)
+        self.concurrency = max(1, concurrency or default_concurrency)
+    
+    def close(self):
+        """Release the async client and its event loop, if any"""
+        if self._runner:
+            self._runner.run(self.api.aclose())
+            self._runner.close()
+            self._runner = None
+    
+    def call_api(self, method: str, *args, **kwargs) -> Dict:
+        """Call a CongressAPI method and wait for its result, sync or async"""
+        result = getattr(self.api, method)(*args, **kwargs)
+        return self._runner.run(result) if self._runner else result
     
-    def sync_recent_bills(self, congress: int = 118, days_back: int = 7) -> Dict:
+    @contextmanager
+    def _worker_pool(self):
+        """Yield a ``submit(fn, *args, **kwargs)`` callable returning concurrent futures"""
+        if self._runner:
+            yield self._runner.submit
+        else:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                yield executor.submit
+    
+    def sync_recent_bills(self, congress: int = 118, days_back: Optional[int] = 7,
+                          incremental: bool = False, with_details: bool = True,
+                          stream: Optional[bool] = None, match_alerts: Optional[bool] = None) -> Dict:
         """
         Sync recent bills from the last N days
         
+        Pages of ``get_recent_bills`` are fetched ``concurrency`` at a time on a
+        thread pool and written in offset order on the calling thread. Because
+        the API sorts by ``updateDate`` descending, the walk stops at the first
+        bill updated before the cutoff. Pass ``days_back=None`` to backfill the
+        whole congress.
+        
+        With ``incremental=True`` only bills changed since the congress'
+        SyncCursor are requested (``fromDateTime``), and the cursor is
+        advanced once the run completes without errors. Without a cursor the
+        first incremental run falls back to the ``days_back`` window.
+        
+        With ``stream=True`` (default: BILL_SYNC_STREAM) list pages are parsed
+        incrementally from the response stream and flow through a generator
+        pipeline instead of being decoded whole; see ``_sync_streamed``.
+        
+        Unless ``with_details=False``, a second stage then fetches actions,
+        cosponsors and subjects for the bills whose latest action changed.
+        A final stage evaluates active LegislativeAlerts against the bills
+        created or updated by this run (``match_alerts``, default:
+        BILL_SYNC_MATCH_ALERTS).
+        
         Returns:
             Dict with sync statistics
         """
-        from .models import LegislativeBill, BillSubject, BillAction, BillCosponsor
+        stats = self._new_stats()
+        
+        if stream is None:
+            stream = getattr(settings, 'BILL_SYNC_STREAM', False)
+        if stream and self._runner:
+            raise ValueError('Streaming sync is only supported with the blocking Congress.gov client')
+        
+        cutoff = timezone.now() - timedelta(days=days_back) if days_back else None
+        from_datetime = None
+        if incremental:
+            from_datetime = self._load_high_water_mark(congress)
+            if from_datetime:
+                # The API filter is inclusive; bills updated exactly at the
+                # mark are re-read and then skipped by their content hash
+                cutoff = None
+                stats['from_datetime'] = from_datetime.isoformat()
+        
+        writer = BillWriter()
+        started = time.monotonic()
+        
+        if stream:
+            high_water, records_walked = self._sync_streamed(congress, cutoff, from_datetime, writer, stats)
+        else:
+            high_water, records_walked = self._sync_pages(congress, cutoff, from_datetime, writer, stats)
+        
+        stats['high_water'] = high_water.isoformat() if high_water else None
+        self._finish_sync(writer, stats, started, with_details, match_alerts)
+        if incremental and not stats['errors']:
+            self._advance_high_water_mark(congress, high_water, records_walked)
+        return stats
+    
+    def sync_bill_range(self, congress: int, from_datetime: Optional[datetime] = None,
+                        to_datetime: Optional[datetime] = None, with_details: bool = True,
+                        match_alerts: Optional[bool] = None,
+                        on_page: Optional[Callable[[], None]] = None) -> Dict:
+        """
+        Sync the bills of a congress updated between ``from_datetime`` and ``to_datetime``
+        
+        The time range keeps addressing the same bills while other workers
+        sync the neighbouring ranges. Pages are fetched one after another
+        and ``on_page`` runs after each is written, e.g. to renew a lease; an
+        exception it raises aborts the range. If the list's
+        ``pagination.count`` changes between pages, records may have shifted
+        past a page boundary, so the walk stops with an error and the range
+        should be retried. The newest ``updateDate`` read is reported as
+        ``stats['high_water']``. Details and alert matching follow as in
+        ``sync_recent_bills``.
+        """
+        stats = self._new_stats()
+        writer = BillWriter()
+        started = time.monotonic()
         
-        stats = {
+        high_water = None
+        offset = 0
+        list_count = None
+        while True:
+            try:
+                page = self.call_api(
+                    'get_recent_bills',
+                    congress=congress,
+                    limit=self.PAGE_SIZE,
+                    offset=offset,
+                    from_datetime=from_datetime,
+                    to_datetime=to_datetime,
+                )
+            except Exception as e:
+                stats['errors'].append(f"Error fetching bills from API: {e}")
+                logger.error(f"Error fetching bills: {e}")
+                break
+            
+            stats['pages_fetched'] += 1
+            count = (page.get('pagination') or {}).get('count')
+            if list_count is not None and count != list_count:
+                stats['errors'].append(f"Bill list changed from {list_count} to {count} records while paging")
+                logger.warning(f"Bill list of congress {congress} changed while paging; range needs a retry")
+                break
+            list_count = count
+            bills = page.get('bills', [])
+            for bill_data in bills:
+                updated = self._bill_update_date(bill_data)
+                if updated and (high_water is None or updated > high_water):
+                    high_water = updated
+            self._sync_page(bills, None, writer, stats)
+            if on_page:
+                on_page()
+            if len(bills) < self.PAGE_SIZE:
+                break
+            offset += self.PAGE_SIZE
+        
+        stats['high_water'] = high_water.isoformat() if high_water else None
+        self._finish_sync(writer, stats, started, with_details, match_alerts)
+        return stats
+    
+    @staticmethod
+    def _new_stats() -> Dict:
+        return {
             'bills_created': 0,
             'bills_updated': 0,
+            'bills_unchanged': 0,
             'subjects_created': 0,
             'actions_created': 0,
             'cosponsors_created': 0,
+            'cosponsors_updated': 0,
+            'statuses_updated': 0,
+            'alert_matches_created': 0,
+            'pages_fetched': 0,
+            'from_datetime': None,
+            'high_water': None,
+            'api_requests': 0,
+            'api_retries': 0,
+            'api_throttled': 0,
+            'rate_limit_wait_seconds': 0.0,
+            'backoff_wait_seconds': 0.0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'cache_revalidated': 0,
+            'elapsed_seconds': 0.0,
+            'bills_per_second': 0.0,
             'errors': []
         }
+    
+    def _finish_sync(self, writer: BillWriter, stats: Dict, started: float,
+                     with_details: bool, match_alerts: Optional[bool]):
+        """Run the detail, alert and statistics stages for what the writer changed, then record request and timing stats"""
+        if match_alerts is None:
+            match_alerts = getattr(settings, 'BILL_SYNC_MATCH_ALERTS', True)
+        stats.update(writer.stats)
+        if with_details and writer.action_changed:
+            self.sync_bill_details(writer.action_changed, stats)
+        if match_alerts and writer.changed:
+            self.match_alerts(writer.changed, stats)
+        if writer.changed:
+            self.refresh_stats(writer.changed)
+        stats.update(self.api.request_stats)
+        
+        elapsed = time.monotonic() - started
+        synced = stats['bills_created'] + stats['bills_updated'] + stats['bills_unchanged']
+        stats['elapsed_seconds'] = round(elapsed, 2)
+        stats['bills_per_second'] = round(synced / elapsed, 2) if elapsed else 0.0
+    
+    def _sync_pages(self, congress: int, cutoff: Optional[datetime], from_datetime: Optional[datetime],
+                    writer: BillWriter, stats: Dict) -> Tuple[Optional[datetime], int]:
+        """
+        Walk the bill list in parallel windows of whole pages; returns the high-water mark and records walked
+        
+        The first page is fetched alone for its ``pagination.count``, and
+        later windows only request the offsets below it, so no request is
+        spent on pages past the end of the list.
+        """
+        high_water = None
+        records_walked = 0
+        with self._worker_pool() as submit:
+            offset = 0
+            total = None
+            done = False
+            while not done:
+                # Fetch the next window of pages in parallel; results are
+                # consumed in order so the cutoff check stays deterministic
+                futures = []
+                for _ in range(self.concurrency if offset else 1):
+                    if total is not None and offset >= total:
+                        break
+                    futures.append(submit(
+                        self.api.get_recent_bills,
+                        congress=congress,
+                        limit=self.PAGE_SIZE,
+                        offset=offset,
+                        from_datetime=from_datetime,
+                    ))
+                    offset += self.PAGE_SIZE
+                if not futures:
+                    break
+                
+                for future in futures:
+                    if done:
+                        future.cancel()
+                        continue
+                    try:
+                        page = future.result()
+                    except Exception as e:
+                        stats['errors'].append(f"Error fetching bills from API: {e}")
+                        logger.error(f"Error fetching bills: {e}")
+                        done = True
+                        continue
+                    
+                    stats['pages_fetched'] += 1
+                    if total is None:
+                        total = (page.get('pagination') or {}).get('count')
+                    bills = page.get('bills', [])
+                    records_walked += len(bills)
+                    for bill_data in bills:
+                        updated = self._bill_update_date(bill_data)
+                        if updated and (high_water is None or updated > high_water):
+                            high_water = updated
+                    done = self._sync_page(bills, cutoff, writer, stats) or len(bills) < self.PAGE_SIZE
         
+        return high_water, records_walked
+    
+    def _sync_streamed(self, congress: int, cutoff: Optional[datetime], from_datetime: Optional[datetime],
+                       writer: BillWriter, stats: Dict) -> Tuple[Optional[datetime], int]:
+        """
+        Walk the bill list as a generator pipeline: fetch -> parse -> transform -> batch-write
+        
+        Bills are pulled one at a time off the streamed response body and
+        handed to the writer, which flushes every ``chunk_size`` bills, so
+        peak memory is one writer chunk whatever the page size. Pages are
+        read one after another; the detail fan-out stays parallel.
+        """
+        walk = {'high_water': None, 'records_walked': 0}
         try:
-            # Get recent bills from Congress.gov
-            recent_bills = self.api.get_recent_bills(congress=congress, limit=250)
-            
-            for bill_data in recent_bills.get('bills', []):
+            for values in self._transform_bills(self._stream_bills(congress, from_datetime, stats), cutoff, walk, stats):
                 try:
-                    bill, created = self._sync_bill(bill_data)
-                    if created:
-                        stats['bills_created'] += 1
-                    else:
-                        stats['bills_updated'] += 1
-                        
+                    writer.add(values)
                 except Exception as e:
-                    stats['errors'].append(f"Error syncing bill {bill_data.get('type', 'unknown')} {bill_data.get('number', 'unknown')}: {e}")
-                    logger.error(f"Error syncing bill: {e}")
-                    
+                    stats['errors'].append(f"Error writing bills to database: {e}")
+                    logger.error(f"Error writing bills: {e}")
         except Exception as e:
             stats['errors'].append(f"Error fetching bills from API: {e}")
             logger.error(f"Error fetching bills: {e}")
-            
-        return stats
+        
+        try:
+            writer.flush()
+        except Exception as e:
+            stats['errors'].append(f"Error writing bills to database: {e}")
+            logger.error(f"Error writing bills: {e}")
+        return walk['high_water'], walk['records_walked']
     
-    def _sync_bill(self, bill_data: Dict):
-        """Sync a single bill from API data"""
-        from .models import LegislativeBill
-        
-        # Extract bill identifiers
-        congress = bill_data.get('congress', 118)
-        bill_type = bill_data.get('type', '').lower()
-        bill_number = bill_data.get('number', '')
-        
-        # Get or create bill
-        bill, created = LegislativeBill.objects.get_or_create(
-            congress_number=congress,
-            bill_type=bill_type,
-            bill_number=bill_number,
-            defaults={
-                'title': bill_data.get('title', ''),
-                'congress_url': bill_data.get('url', ''),
-                'latest_action': bill_data.get('latestAction', {}).get('text', ''),
-            }
-        )
+    def _stream_bills(self, congress: int, from_datetime: Optional[datetime], stats: Dict) -> Iterator[Dict]:
+        """Fetch and parse stage: raw bill records, page after page, as they arrive"""
+        offset = 0
+        while True:
+            count = 0
+            for bill_data in self.api.iter_recent_bills(
+                congress=congress,
+                limit=self.PAGE_SIZE,
+                offset=offset,
+                from_datetime=from_datetime,
+            ):
+                count += 1
+                yield bill_data
+            stats['pages_fetched'] += 1
+            if count < self.PAGE_SIZE:
+                return
+            offset += self.PAGE_SIZE
+    
+    def _transform_bills(self, bills: Iterable[Dict], cutoff: Optional[datetime],
+                         walk: Dict, stats: Dict) -> Iterator[Dict]:
+        """Transform stage: track the high-water mark, stop at the cutoff and parse each bill"""
+        for bill_data in bills:
+            walk['records_walked'] += 1
+            updated = self._bill_update_date(bill_data)
+            if updated and (walk['high_water'] is None or updated > walk['high_water']):
+                walk['high_water'] = updated
+            if cutoff and self._is_before_cutoff(bill_data, cutoff):
+                return
+            try:
+                yield parse_bill(bill_data)
+            except Exception as e:
+                stats['errors'].append(f"Error syncing bill {bill_data.get('type', 'unknown')} {bill_data.get('number', 'unknown')}: {e}")
+                logger.error(f"Error syncing bill: {e}")
+    
+    def _sync_page(self, bills, cutoff: Optional[datetime], writer: BillWriter, stats: Dict) -> bool:
+        """Sync one page of bills; returns True once the cutoff is reached"""
+        reached_cutoff = False
+        for bill_data in bills:
+            if cutoff and self._is_before_cutoff(bill_data, cutoff):
+                reached_cutoff = True
+                break
+            try:
+                writer.add(parse_bill(bill_data))
+            except Exception as e:
+                stats['errors'].append(f"Error syncing bill {bill_data.get('type', 'unknown')} {bill_data.get('number', 'unknown')}: {e}")
+                logger.error(f"Error syncing bill: {e}")
         
-        # Update bill fields
-        bill.title = bill_data.get('title', bill.title)
-        bill.congress_url = bill_data.get('url', bill.congress_url)
+        try:
+            writer.flush()
+        except Exception as e:
+            stats['errors'].append(f"Error writing bills to database: {e}")
+            logger.error(f"Error writing bills: {e}")
+        return reached_cutoff
+    
+    def sync_bill_details(self, keys: Iterable, stats: Dict) -> Dict:
+        """
+        Fan out to the detail endpoints for the given bills and store child rows
         
-        # Parse latest action date
-        latest_action = bill_data.get('latestAction', {})
-        if latest_action:
-            bill.latest_action = latest_action.get('text', '')
-            action_date = latest_action.get('actionDate')
-            if action_date:
+        Bills are fetched in parallel on the worker pool (in-flight requests
+        are further capped per host by CongressAPI) and written in batches on
+        the calling thread. Bills whose details could not be stored have
+        their content hash cleared so the next sync retries them.
+        """
+        bill_ids = BillWriter.resolve_ids(keys)
+        writer = BillDetailWriter()
+        failed = []
+        
+        fetch = self._fetch_bill_details_async if self._runner else self._fetch_bill_details
+        with self._worker_pool() as submit:
+            futures = {
+                submit(fetch, key): (key, bill_id)
+                for key, bill_id in bill_ids.items()
+            }
+            for future in as_completed(futures):
+                key, bill_id = futures[future]
                 try:
-                    # Convert date string to datetime
-                    bill.latest_action_date = datetime.strptime(action_date, '%Y-%m-%d')
-                except ValueError:
-                    logger.warning(f"Could not parse action date: {action_date}")
+                    parsed = parse_bill_details(future.result())
+                except Exception as e:
+                    failed.append(bill_id)
+                    stats['errors'].append(f"Error fetching details for bill {key[1]} {key[2]}: {e}")
+                    logger.error(f"Error fetching bill details: {e}")
+                    continue
+                try:
+                    writer.add(bill_id, parsed)
+                except Exception as e:
+                    failed = list(bill_ids.values())
+                    stats['errors'].append(f"Error writing bill details to database: {e}")
+                    logger.error(f"Error writing bill details: {e}")
+        
+        try:
+            writer.flush()
+        except Exception as e:
+            failed = list(bill_ids.values())
+            stats['errors'].append(f"Error writing bill details to database: {e}")
+            logger.error(f"Error writing bill details: {e}")
+        
+        if failed:
+            from .models import LegislativeBill
+            LegislativeBill.objects.filter(id__in=failed).update(content_hash='')
+        
+        for name, count in writer.stats.items():
+            stats[name] += count
+        return stats
+    
+    def match_alerts(self, keys: Iterable, stats: Dict) -> Dict:
+        """Evaluate active LegislativeAlerts against the given bills and store the matches"""
+        try:
+            stats['alert_matches_created'] += AlertMatcher().match_bills(BillWriter.resolve_ids(keys).values())
+        except Exception as e:
+            stats['errors'].append(f"Error matching alerts: {e}")
+            logger.error(f"Error matching alerts: {e}")
+        return stats
+    
+    @staticmethod
+    def refresh_stats(keys: Iterable):
+        """Re-materialise the dashboard statistics of the congresses the given bills belong to"""
+        try:
+            refresh_congress_stats({key[0] for key in keys})
+        except Exception as e:
+            # Derived data only; the next sync or refresh_bill_stats retries
+            logger.error(f"Error refreshing bill statistics: {e}")
+    
+    @staticmethod
+    def _page_items(resource: str, page: Dict) -> list:
+        """Records on one page of a bill's actions, cosponsors or subjects"""
+        if resource == 'subjects':
+            return (page.get('subjects') or {}).get('legislativeSubjects') or []
+        return page.get(resource) or []
+    
+    @classmethod
+    def _next_offset(cls, resource: str, page: Dict, offset: int) -> Optional[int]:
+        """Offset of the page after ``page``, or None once the list is exhausted"""
+        items = cls._page_items(resource, page)
+        if not items or not (page.get('pagination') or {}).get('next'):
+            return None
+        return offset + len(items)
+    
+    @staticmethod
+    def _merge_pages(resource: str, first: Dict, items: list):
+        if resource == 'subjects':
+            # The policy area is only on the first page
+            return {**(first.get('subjects') or {}), 'legislativeSubjects': items}
+        return items
+    
+    def _fetch_all(self, resource: str, args: Tuple):
+        """Every page of a bill's actions, cosponsors or subjects, merged"""
+        fetch = getattr(self.api, f'get_bill_{resource}')
+        first = page = fetch(*args, revalidate=True)
+        items = list(self._page_items(resource, page))
+        offset = self._next_offset(resource, page, 0)
+        while offset is not None:
+            page = fetch(*args, offset=offset, revalidate=True)
+            items.extend(self._page_items(resource, page))
+            offset = self._next_offset(resource, page, offset)
+        return self._merge_pages(resource, first, items)
+    
+    async def _fetch_all_async(self, resource: str, args: Tuple):
+        """Async variant of _fetch_all"""
+        fetch = getattr(self.api, f'get_bill_{resource}')
+        first = page = await fetch(*args, revalidate=True)
+        items = list(self._page_items(resource, page))
+        offset = self._next_offset(resource, page, 0)
+        while offset is not None:
+            page = await fetch(*args, offset=offset, revalidate=True)
+            items.extend(self._page_items(resource, page))
+            offset = self._next_offset(resource, page, offset)
+        return self._merge_pages(resource, first, items)
+    
+    def _fetch_bill_details(self, key) -> Dict:
+        """
+        Fetch the detail, action, cosponsor and subject payloads for one bill
+        
+        Actions, cosponsors and subjects follow ``pagination.next`` until
+        their list is exhausted, so long histories are not cut at one page.
+        """
+        congress, bill_type, bill_number = key
+        # The bill is known to have changed, so cached copies must be
+        # revalidated; unchanged sub-resources still come back as cheap 304s
+        args = (congress, bill_type, bill_number)
+        return {
+            'details': self.api.get_bill_details(*args, revalidate=True).get('bill', {}),
+            'actions': self._fetch_all('actions', args),
+            'cosponsors': self._fetch_all('cosponsors', args),
+            'subjects': self._fetch_all('subjects', args),
+        }
+    
+    async def _fetch_bill_details_async(self, key) -> Dict:
+        """Async variant of _fetch_bill_details issuing the four lists concurrently"""
+        args = (*key,)
+        details, actions, cosponsors, subjects = await asyncio.gather(
+            self.api.get_bill_details(*args, revalidate=True),
+            self._fetch_all_async('actions', args),
+            self._fetch_all_async('cosponsors', args),
+            self._fetch_all_async('subjects', args),
+        )
+        return {
+            'details': details.get('bill', {}),
+            'actions': actions,
+            'cosponsors': cosponsors,
+            'subjects': subjects,
+        }
+    
+    @staticmethod
+    def _bill_update_date(bill_data: Dict) -> Optional[datetime]:
+        """Last time Congress.gov reports the bill record as changed"""
+        # The list API filters and sorts on updateDate, so the cutoff and the
+        # high-water mark must read the same field
+        return parse_api_date(bill_data.get('updateDate'))
+    
+    def _is_before_cutoff(self, bill_data: Dict, cutoff: datetime) -> bool:
+        """Check whether a bill was last updated before the sync cutoff"""
+        updated = self._bill_update_date(bill_data)
+        return updated is not None and updated < cutoff
+    
+    def _load_high_water_mark(self, congress: int) -> Optional[datetime]:
+        """Return the updateDate the last successful sync reached, if any"""
+        from .models import SyncCursor
+        
+        return SyncCursor.objects.filter(congress_number=congress).values_list(
+            'last_update_date', flat=True
+        ).first()
+    
+    def _advance_high_water_mark(self, congress: int, high_water: Optional[datetime], records_walked: int):
+        """Move the congress' sync cursor forward after a successful run"""
+        from .models import SyncCursor
         
-        bill.save()
-        return bill, created
+        with transaction.atomic():
+            cursor, _ = SyncCursor.objects.select_for_update().get_or_create(congress_number=congress)
+            # Never move backwards, e.g. when a concurrent run got further
+            if high_water and (cursor.last_update_date is None or high_water > cursor.last_update_date):
+                cursor.last_update_date = high_water
+            cursor.last_offset = records_walked
+            cursor.last_success_at = timezone.now()
+            cursor.save()
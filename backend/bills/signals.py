@@ -0,0 +1,14 @@
+"""
+Bill Signals
+Keeps the bills list validator current when bills are deleted
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import BillDeletionGeneration, LegislativeBill
+
+
+@receiver(post_delete, sender=LegislativeBill)
+def bump_deletion_generation(sender, **kwargs):
+    BillDeletionGeneration.bump()
@@ -0,0 +1,91 @@
+"""
+Dashboard Statistics
+Per-congress bill counts materialised into CongressBillStats after each sync
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Iterable
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from .models import CongressBillStats, LegislativeBill
+
+
+logger = logging.getLogger(__name__)
+
+# Key for bills without a chamber, sponsor party or policy area
+UNKNOWN = 'unknown'
+
+
+def compute_congress_stats(congress: int) -> Dict:
+    """
+    Aggregate one congress' bills for the dashboards
+
+    Three grouped queries over the congress' rows: one by
+    (status, chamber, sponsor party) folded into the three counts, one by
+    the bills' policy area and one per introduction week.
+    """
+    bills = LegislativeBill.objects.filter(congress_number=congress).order_by()
+    by_status = Counter({status: 0 for status, _ in LegislativeBill.STATUS_CHOICES})
+    by_chamber, by_party = Counter(), Counter()
+    for row in bills.values('status', 'chamber', 'sponsor_party').annotate(n=Count('id')):
+        by_status[row['status']] += row['n']
+        by_chamber[row['chamber'] or UNKNOWN] += row['n']
+        by_party[row['sponsor_party'] or UNKNOWN] += row['n']
+
+    by_policy_area = {
+        row['policy_area']: row['n']
+        for row in bills.exclude(policy_area='').values('policy_area').annotate(n=Count('id'))
+    }
+
+    weeks = bills.filter(introduced_date__isnull=False).annotate(week=TruncWeek('introduced_date'))
+    introduced_per_week = [
+        {'week': row['week'].date().isoformat(), 'count': row['n']}
+        for row in weeks.values('week').annotate(n=Count('id')).order_by('week')
+    ]
+
+    return {
+        'bill_count': sum(by_status.values()),
+        'by_status': dict(by_status),
+        'by_chamber': dict(by_chamber),
+        'by_party': dict(by_party),
+        'by_policy_area': by_policy_area,
+        'introduced_per_week': introduced_per_week,
+    }
+
+
+def refresh_congress_stats(congresses: Iterable[int]) -> int:
+    """
+    Re-materialise the statistics of the given congresses
+
+    Only the congresses a sync touched need refreshing, so a run costs a
+    few grouped queries per changed congress however many congresses are
+    stored. Rows are upserted in one statement; congresses left without
+    bills lose theirs. Returns the number of congresses written.
+    """
+    congresses = sorted(set(congresses))
+    if not congresses:
+        return 0
+    now = timezone.now()
+    rows, empty = [], []
+    for congress in congresses:
+        values = compute_congress_stats(congress)
+        if values['bill_count']:
+            rows.append(CongressBillStats(congress_number=congress, computed_at=now, **values))
+        else:
+            empty.append(congress)
+
+    fields = [field.name for field in CongressBillStats._meta.concrete_fields if field.name not in ('id', 'congress_number')]
+    with transaction.atomic():
+        if rows:
+            CongressBillStats.objects.bulk_create(
+                rows, update_conflicts=True, unique_fields=['congress_number'], update_fields=fields,
+            )
+        if empty:
+            CongressBillStats.objects.filter(congress_number__in=empty).delete()
+    logger.debug(f"Bill statistics refreshed for congresses {congresses}")
+    return len(rows)
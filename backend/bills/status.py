@@ -0,0 +1,225 @@
+"""
+Bill Status Derivation
+Derives bill status and milestone dates from stored action histories in
+columnar passes over many bills at once
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+
+from .models import BillAction, LegislativeBill
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+logger = logging.getLogger(__name__)
+
+DERIVED_FIELDS = ['status', 'house_passage_date', 'senate_passage_date', 'enacted_date']
+
+# Action types that can move a bill's status; everything else is skipped in SQL
+MILESTONE_ACTION_TYPES = ['passed', 'failed', 'signed', 'vetoed', 'override']
+
+# Milestone codes of an action row
+HOUSE_PASSAGE, SENATE_PASSAGE, ENACTMENT, VETO, OVERRIDE, FAILURE = range(6)
+# Passages and enactment date from their first occurrence, the rest from their latest
+FIRST_MILESTONES = (HOUSE_PASSAGE, SENATE_PASSAGE, ENACTMENT)
+LAST_MILESTONES = (VETO, OVERRIDE, FAILURE)
+
+# Marks a milestone a bill has not reached in the timestamp columns
+MISSING = -1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def action_chamber(chamber: str, description: str) -> str:
+    """Chamber of an action, read from its text when the source system did not say"""
+    if chamber:
+        return chamber
+    lowered = description.lower()
+    house, senate = lowered.find('house'), lowered.find('senate')
+    if house < 0 and senate < 0:
+        return ''
+    return 'house' if senate < 0 or 0 <= house < senate else 'senate'
+
+
+def milestone_code(action_type: str, chamber: str, description: str) -> Optional[int]:
+    """Milestone an action marks, if any"""
+    if action_type == 'signed':
+        return ENACTMENT
+    if action_type == 'vetoed':
+        return VETO
+    if action_type == 'override':
+        return OVERRIDE
+    if action_type == 'failed':
+        # Rejected amendments and motions are classified as failed too;
+        # only a failed passage vote ends the bill
+        return FAILURE if 'passage' in description.lower() else None
+    chamber = action_chamber(chamber, description)
+    if chamber == 'house':
+        return HOUSE_PASSAGE
+    if chamber == 'senate':
+        return SENATE_PASSAGE
+    return None
+
+
+def _timestamp(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _datetime(value: int) -> Optional[datetime]:
+    return None if value == MISSING else _EPOCH + timedelta(microseconds=int(value))
+
+
+def load_milestones(bill_ids: List[int]) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Milestone actions of the given bills as parallel columns
+
+    Returns ``(positions, codes, timestamps)``: the index of each action's
+    bill in ``bill_ids``, its milestone code and its date in microseconds
+    since the epoch. Only actions of a milestone type are read.
+    """
+    position = {bill_id: index for index, bill_id in enumerate(bill_ids)}
+    positions, codes, stamps = [], [], []
+    rows = BillAction.objects.filter(
+        bill_id__in=bill_ids, action_type__in=MILESTONE_ACTION_TYPES,
+    ).order_by().values_list('bill_id', 'action_type', 'chamber', 'description', 'action_date')
+    for bill_id, action_type, chamber, description, action_date in rows.iterator(chunk_size=2000):
+        code = milestone_code(action_type, chamber, description)
+        if code is not None:
+            positions.append(position[bill_id])
+            codes.append(code)
+            stamps.append(_timestamp(action_date))
+    return positions, codes, stamps
+
+
+def _derive_numpy(size: int, positions: List[int], codes: List[int], stamps: List[int]) -> Tuple[List, Dict]:
+    positions = np.asarray(positions, dtype=np.int64)
+    codes = np.asarray(codes, dtype=np.int8)
+    stamps = np.asarray(stamps, dtype=np.int64)
+
+    columns = {}
+    for code in FIRST_MILESTONES:
+        column = np.full(size, np.iinfo(np.int64).max, dtype=np.int64)
+        mask = codes == code
+        np.minimum.at(column, positions[mask], stamps[mask])
+        column[column == np.iinfo(np.int64).max] = MISSING
+        columns[code] = column
+    for code in LAST_MILESTONES:
+        column = np.full(size, MISSING, dtype=np.int64)
+        mask = codes == code
+        np.maximum.at(column, positions[mask], stamps[mask])
+        columns[code] = column
+
+    house, senate = columns[HOUSE_PASSAGE], columns[SENATE_PASSAGE]
+    veto, failure = columns[VETO], columns[FAILURE]
+    status = np.select(
+        [
+            columns[ENACTMENT] != MISSING,
+            (veto != MISSING) & (columns[OVERRIDE] < veto),
+            (failure != MISSING) & (failure > np.maximum(house, senate)),
+            (house != MISSING) & (senate > house),
+            house != MISSING,
+            senate != MISSING,
+        ],
+        ['enacted', 'vetoed', 'dead', 'passed_senate', 'passed_house', 'passed_senate'],
+        'introduced',
+    )
+    return status.tolist(), {code: column.tolist() for code, column in columns.items()}
+
+
+def _derive_python(size: int, positions: List[int], codes: List[int], stamps: List[int]) -> Tuple[List, Dict]:
+    columns = {code: [MISSING] * size for code in FIRST_MILESTONES + LAST_MILESTONES}
+    for position, code, stamp in zip(positions, codes, stamps):
+        column = columns[code]
+        current = column[position]
+        if current == MISSING or (stamp > current if code in LAST_MILESTONES else stamp < current):
+            column[position] = stamp
+
+    status = []
+    for house, senate, enacted, veto, override, failure in zip(
+        *(columns[code] for code in (HOUSE_PASSAGE, SENATE_PASSAGE, ENACTMENT, VETO, OVERRIDE, FAILURE))
+    ):
+        if enacted != MISSING:
+            status.append('enacted')
+        elif veto != MISSING and override < veto:
+            status.append('vetoed')
+        elif failure != MISSING and failure > max(house, senate):
+            status.append('dead')
+        elif house != MISSING and senate > house:
+            status.append('passed_senate')
+        elif house != MISSING:
+            status.append('passed_house')
+        elif senate != MISSING:
+            status.append('passed_senate')
+        else:
+            status.append('introduced')
+    return status, columns
+
+
+def derive_statuses(bill_ids: List[int], use_numpy: Optional[bool] = None) -> Dict[int, Dict]:
+    """
+    Derived status and milestone dates of each bill, keyed by bill id
+
+    Milestone dates are reduced per bill with one pass per milestone over
+    the action columns (``np.minimum.at``/``np.maximum.at`` with NumPy
+    installed, plain loops otherwise) and the status follows from the
+    reduced columns:
+
+    - enacted: the bill became law (signed, or a veto override became law)
+    - vetoed: its latest veto was not overridden
+    - dead: a passage vote failed after its latest passage
+    - passed_house / passed_senate: the chamber that passed it last
+    - introduced: none of the above
+    """
+    positions, codes, stamps = load_milestones(bill_ids)
+    if use_numpy is None:
+        use_numpy = np is not None
+    derive = _derive_numpy if use_numpy else _derive_python
+    status, columns = derive(len(bill_ids), positions, codes, stamps)
+    house, senate, enacted = (columns[code] for code in FIRST_MILESTONES)
+    return {
+        bill_id: {
+            'status': status[index],
+            'house_passage_date': _datetime(house[index]),
+            'senate_passage_date': _datetime(senate[index]),
+            'enacted_date': _datetime(enacted[index]),
+        }
+        for index, bill_id in enumerate(bill_ids)
+    }
+
+
+def update_bill_statuses(bill_ids: Iterable[int], now: datetime = None, batch_size: int = 1000) -> int:
+    """
+    Re-derive the status of the given bills and store what changed
+
+    Bills whose derived fields already match are left untouched; the rest
+    are written with one ``bulk_update`` per batch, with a new
+    ``last_synced``. Returns the number of bills updated.
+    """
+    bill_ids = sorted(set(bill_ids))
+    now = now or timezone.now()
+    updated = 0
+    for start in range(0, len(bill_ids), batch_size):
+        batch = bill_ids[start:start + batch_size]
+        derived = derive_statuses(batch)
+        current = LegislativeBill.objects.filter(id__in=batch).values_list('id', *DERIVED_FIELDS)
+
+        changed = []
+        for bill_id, *values in current:
+            fields = derived[bill_id]
+            if values != [fields[name] for name in DERIVED_FIELDS]:
+                changed.append(LegislativeBill(id=bill_id, updated_at=now, last_synced=now, **fields))
+        if not changed:
+            continue
+
+        LegislativeBill.objects.bulk_update(changed, DERIVED_FIELDS + ['updated_at', 'last_synced'])
+        updated += len(changed)
+    logger.debug(f"Bill statuses re-derived for {len(bill_ids)} bills, {updated} changed")
+    return updated
@@ -0,0 +1,133 @@
+"""
+Streaming JSON Parsing
+Yields the items of a top-level JSON array from a byte stream without
+buffering the whole document
+"""
+
+import codecs
+import json
+from typing import Iterable, Iterator
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """File-like ``read`` over an iterator of byte chunks, as ijson expects"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _TextScanner:
+    """
+    Incremental tokenizer over decoded text chunks
+
+    Only the unconsumed tail of the input is kept, so memory is bounded by
+    the largest single value decoded rather than the document size.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decode = codecs.getincrementaldecoder('utf-8')()
+        self._text = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk; returns False at end of input"""
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._text = self._text[self._pos:] + self._decode.decode(b'', final=True)
+        else:
+            self._text = self._text[self._pos:] + self._decode.decode(chunk)
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            while self._pos < len(self._text) and self._text[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Malformed JSON stream: expected {char!r}")
+        self._pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the
+            # next chunk
+            if end == len(self._text) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def _iter_items_stdlib(chunks: Iterable[bytes], key: str) -> Iterator:
+    scanner = _TextScanner(chunks)
+    scanner.expect('{')
+    while scanner.peek() not in ('}', ''):
+        name = scanner.value()
+        scanner.expect(':')
+        if name != key:
+            scanner.value()
+        elif scanner.peek() != '[':
+            scanner.value()
+        else:
+            scanner.expect('[')
+            while scanner.peek() != ']':
+                yield scanner.value()
+                if scanner.peek() == ',':
+                    scanner.expect(',')
+            scanner.expect(']')
+        if scanner.peek() == ',':
+            scanner.expect(',')
+
+
+def iter_json_items(chunks: Iterable[bytes], key: str) -> Iterator:
+    """
+    Yield the items of the array stored under a top-level ``key``
+
+    Uses ijson when it is installed and an incremental ``raw_decode``
+    scanner otherwise. Either way only one item is materialised at a time.
+    """
+    if ijson is not None:
+        return ijson.items(_ChunkReader(chunks), f'{key}.item', use_float=True)
+    return _iter_items_stdlib(chunks, key)
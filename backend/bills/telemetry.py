@@ -0,0 +1,127 @@
+"""
+API Telemetry
+Buffered, non-blocking APILog writer for outbound API calls
+"""
+
+import atexit
+import logging
+import threading
+from collections import deque
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+
+class APILogBuffer:
+    """
+    In-memory ring buffer of API call records flushed to APILog in bulk
+
+    ``record`` only appends to a bounded deque, so logging costs next to
+    nothing on the request path. A daemon thread ``bulk_create``s the
+    buffer every ``flush_size`` records or ``flush_interval`` seconds,
+    whichever comes first, and once more at interpreter shutdown. When the
+    database falls behind and the buffer fills up, the oldest records are
+    dropped and counted rather than blocking callers.
+    """
+
+    def __init__(self, capacity: int = 10000, flush_size: int = 500,
+                 flush_interval: float = 5.0, start: bool = True):
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._records = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+        self.stats = {'recorded': 0, 'flushed': 0, 'dropped': 0, 'flushes': 0, 'flush_errors': 0}
+        if start:
+            self.start()
+
+    def start(self):
+        """Start the background flusher"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='apilog-flusher', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def record(self, **fields):
+        """Queue one APILog row; never blocks on the database"""
+        fields.setdefault('timestamp', timezone.now())
+        with self._lock:
+            if len(self._records) >= self.capacity:
+                self._records.popleft()
+                self.stats['dropped'] += 1
+            self._records.append(fields)
+            self.stats['recorded'] += 1
+            pending = len(self._records)
+        if pending >= self.flush_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written"""
+        from .models import APILog
+
+        with self._flush_lock:
+            with self._lock:
+                records = list(self._records)
+                self._records.clear()
+            if not records:
+                return 0
+            try:
+                APILog.objects.bulk_create(
+                    [APILog(**fields) for fields in records],
+                    batch_size=self.flush_size,
+                )
+            except Exception as e:
+                self.stats['flush_errors'] += 1
+                self.stats['dropped'] += len(records)
+                logger.error(f"Failed to flush {len(records)} API log records: {e}")
+                return 0
+            self.stats['flushes'] += 1
+            self.stats['flushed'] += len(records)
+            return len(records)
+
+    def close(self):
+        """Stop the flusher and write any remaining records"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval * 2)
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            # The flusher owns a long-lived connection of its own
+            close_old_connections()
+            self.flush()
+
+
+_buffer: Optional[APILogBuffer] = None
+_buffer_lock = threading.Lock()
+
+
+def get_api_log_buffer() -> Optional[APILogBuffer]:
+    """Return the process-wide APILog buffer, or None when API logging is disabled"""
+    global _buffer
+    if not getattr(settings, 'API_LOG_ENABLED', True):
+        return None
+    with _buffer_lock:
+        if _buffer is None:
+            _buffer = APILogBuffer(
+                capacity=getattr(settings, 'API_LOG_BUFFER_SIZE', 10000),
+                flush_size=getattr(settings, 'API_LOG_FLUSH_SIZE', 500),
+                flush_interval=getattr(settings, 'API_LOG_FLUSH_INTERVAL', 5.0),
+            )
+        return _buffer
+
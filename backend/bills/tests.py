@@ -0,0 +1,1361 @@
+"""
+Tests for the bills app
+"""
+
+import csv
+import gzip
+import importlib
+import io
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .models import AlertMatch, APILog, APILogRollup, BillAction, BillCosponsor, BillSubject, CongressBillStats, LegislativeAlert, LegislativeBill, SyncCursor, SyncJob
+from .services import BillSyncService, CongressAPI
+from .streaming import _iter_items_stdlib, iter_json_items
+from . import api_cache
+from .aggregates import refresh_bill_aggregates
+from .alerts import AhoCorasick, get_alert_index
+from .bulk_import import BulkBillImporter, import_files, parse_bill_file
+from .management.commands.explain_bill_queries import unique_key_index
+from .exports import iter_rows
+from .jobs import LeaseLost, SyncJobQueue, SyncWorker
+from .multi_sync import MultiCongressSync, parse_congresses
+from .parsers import parse_bill
+from .async_api import AsyncCongressAPI, httpx
+from .notifications import AlertNotifier
+from .rollups import APILogRollupService, normalize_endpoint
+from .http_cache import MemoryResponseCache, ResponseCache, SQLiteResponseCache
+from .telemetry import APILogBuffer
+from .throttling import TokenBucket, parse_retry_after
+from .search import search_bills
+from . import stats as bills_stats
+from . import status as bills_status
+from .serializers import LegislativeBillSerializer
+from .writers import BillDetailWriter, BillWriter
+
+
+def make_bill(number, updated, bill_type='HR', congress=118, title=None):
+    """Build a bill record shaped like a Congress.gov list item"""
+    return {
+        'congress': congress,
+        'type': bill_type,
+        'number': str(number),
+        'title': title or f'Test bill {number}',
+        'url': f'https://api.congress.gov/v3/bill/{congress}/{bill_type.lower()}/{number}',
+        'updateDate': updated.strftime('%Y-%m-%d'),
+        'latestAction': {'actionDate': updated.strftime('%Y-%m-%d'), 'text': 'Referred to committee.'},
+    }
+
+
+class FakeCongressAPI:
+    """In-memory stand-in for CongressAPI serving a fixed, pre-sorted bill list"""
+
+    def __init__(self, bills):
+        self.bills = bills
+        self.calls = []
+        self.from_datetimes = []
+        self.detail_calls = []
+        self.request_stats = {}
+
+    def get_recent_bills(self, congress=118, limit=20, offset=0, from_datetime=None, to_datetime=None):
+        self.calls.append(offset)
+        self.from_datetimes.append(from_datetime)
+        bills = self.bills
+        if from_datetime:
+            bills = [bill for bill in bills if self.updated(bill) >= from_datetime]
+        if to_datetime:
+            bills = [bill for bill in bills if self.updated(bill) <= to_datetime]
+        return {'bills': bills[offset:offset + limit], 'pagination': {'count': len(bills)}}
+
+    @staticmethod
+    def updated(bill):
+        return datetime.fromisoformat(bill['updateDate']).replace(tzinfo=dt_timezone.utc)
+
+    def iter_recent_bills(self, **kwargs):
+        yield from self.get_recent_bills(**kwargs)['bills']
+
+    def get_bill_details(self, congress, bill_type, bill_number, revalidate=False):
+        self.detail_calls.append(bill_number)
+        return {'bill': {
+            'introducedDate': '2023-01-09',
+            'sponsors': [{'bioguideId': 'S000001', 'fullName': 'Rep. Sponsor', 'party': 'D', 'state': 'CA'}],
+        }}
+
+    def get_bill_actions(self, congress, bill_type, bill_number, revalidate=False):
+        return {'actions': [
+            {'actionDate': '2023-01-09', 'text': 'Introduced in House', 'type': 'IntroReferral',
+             'sourceSystem': {'name': 'Library of Congress'}},
+            {'actionDate': '2023-01-09', 'text': 'Referred to the House Committee on Ways and Means.',
+             'type': 'IntroReferral', 'sourceSystem': {'name': 'House floor actions'}},
+        ]}
+
+    def get_bill_cosponsors(self, congress, bill_type, bill_number, revalidate=False):
+        return {'cosponsors': [
+            {'bioguideId': 'C000001', 'fullName': 'Rep. Cosponsor', 'party': 'R', 'state': 'TX',
+             'sponsorshipDate': '2023-01-10'},
+        ]}
+
+    def get_bill_subjects(self, congress, bill_type, bill_number, revalidate=False):
+        return {'subjects': {
+            'legislativeSubjects': [{'name': 'Taxation'}, {'name': 'Income tax'}],
+            'policyArea': {'name': 'Taxation'},
+        }}
+
+
+class BillSyncServiceTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        recent = [make_bill(i, now - timedelta(days=1)) for i in range(1, 8)]
+        stale = [make_bill(i, now - timedelta(days=30)) for i in range(8, 12)]
+        self.api = FakeCongressAPI(recent + stale)
+
+    def make_service(self):
+        service = BillSyncService(api=self.api, concurrency=2)
+        service.PAGE_SIZE = 3
+        return service
+
+    def test_stops_at_days_back_cutoff(self):
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(stats['bills_created'], 7)
+        self.assertEqual(LegislativeBill.objects.count(), 7)
+        self.assertEqual(stats['errors'], [])
+        self.assertIn('bills_per_second', stats)
+
+    def test_full_backfill_walks_every_page(self):
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=None)
+
+        self.assertEqual(stats['bills_created'], 11)
+        self.assertEqual(stats['pages_fetched'], 4)
+        self.assertEqual(sorted(self.api.calls), [0, 3, 6, 9])
+
+    def test_streamed_sync_matches_paged_sync(self):
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7, stream=True)
+
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(stats['bills_created'], 7)
+        self.assertEqual(self.api.calls, [0, 3, 6])
+        self.assertEqual(len(self.api.detail_calls), 7)
+
+    def test_resync_skips_unchanged_bills(self):
+        self.make_service().sync_recent_bills(congress=118, days_back=7)
+        first_synced = dict(LegislativeBill.objects.values_list('bill_number', 'last_synced'))
+
+        self.api.bills[0]['title'] = 'Renamed bill'
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(stats['bills_created'], 0)
+        self.assertEqual(stats['bills_updated'], 1)
+        self.assertEqual(stats['bills_unchanged'], 6)
+        self.assertEqual(LegislativeBill.objects.get(bill_number='2').last_synced, first_synced['2'])
+        self.assertGreater(LegislativeBill.objects.get(bill_number='1').last_synced, first_synced['1'])
+
+    def test_incremental_sync_advances_cursor(self):
+        # Text updates do not move a bill in the list the API filters on
+        self.api.bills[0]['updateDateIncludingText'] = timezone.now().strftime('%Y-%m-%dT%H:%M:%SZ')
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7, incremental=True)
+        self.assertIsNone(stats['from_datetime'])
+
+        cursor = SyncCursor.objects.get(congress_number=118)
+        self.assertEqual(cursor.last_update_date.date(), (timezone.now() - timedelta(days=1)).date())
+
+        self.api.from_datetimes = []
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7, incremental=True)
+
+        self.assertEqual(self.api.from_datetimes[0], cursor.last_update_date)
+        self.assertEqual(stats['bills_unchanged'], 7)
+        self.assertEqual(stats['bills_created'] + stats['bills_updated'], 0)
+
+    def test_failed_run_keeps_cursor(self):
+        def fail(**kwargs):
+            raise RuntimeError('quota exceeded')
+
+        self.api.get_recent_bills = fail
+        stats = self.make_service().sync_recent_bills(congress=118, incremental=True)
+
+        self.assertTrue(stats['errors'])
+        self.assertFalse(SyncCursor.objects.exists())
+
+    def test_details_fetched_only_for_changed_bills(self):
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(len(self.api.detail_calls), 7)
+        self.assertEqual(stats['actions_created'], 14)
+        self.assertEqual(stats['cosponsors_created'], 7)
+        self.assertEqual(stats['subjects_created'], 14)
+        bill = LegislativeBill.objects.get(bill_number='1')
+        self.assertEqual(bill.sponsor_bioguide_id, 'S000001')
+        self.assertEqual(bill.policy_area, 'Taxation')
+        self.assertEqual(set(bill.actions.values_list('action_type', flat=True)), {'introduced', 'referred'})
+
+        self.api.detail_calls = []
+        self.api.bills[0]['title'] = 'Renamed bill'
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(self.api.detail_calls, [])
+        self.assertEqual(BillAction.objects.count(), 14)
+        self.assertEqual(BillCosponsor.objects.count(), 7)
+        self.assertEqual(BillSubject.objects.count(), 14)
+
+        self.api.bills[0]['latestAction'] = {'actionDate': timezone.now().strftime('%Y-%m-%d'), 'text': 'Reported.'}
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(self.api.detail_calls, ['1'])
+        self.assertEqual(stats['actions_created'], 0)
+        self.assertEqual(BillAction.objects.count(), 14)
+
+    def test_detail_lists_follow_pagination_and_upsert_withdrawals(self):
+        cosponsors = [
+            {'bioguideId': f'C00000{i}', 'fullName': f'Rep. Cosponsor {i}', 'sponsorshipDate': '2023-01-10'}
+            for i in range(5)
+        ]
+        offsets = []
+
+        def get_bill_cosponsors(congress, bill_type, bill_number, offset=0, revalidate=False):
+            offsets.append(offset)
+            pagination = {'count': len(cosponsors)}
+            if offset + 2 < len(cosponsors):
+                pagination['next'] = f'https://api.congress.gov/v3/bill/118/hr/1/cosponsors?offset={offset + 2}'
+            return {'cosponsors': cosponsors[offset:offset + 2], 'pagination': pagination}
+
+        self.api.get_bill_cosponsors = get_bill_cosponsors
+        self.api.bills = self.api.bills[:1]
+        self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        bill = LegislativeBill.objects.get(bill_number='1')
+        self.assertEqual(offsets, [0, 2, 4])
+        self.assertEqual(bill.cosponsors.count(), 5)
+
+        cosponsors[4]['sponsorshipWithdrawnDate'] = '2023-02-01'
+        self.api.bills[0]['latestAction'] = {'actionDate': timezone.now().strftime('%Y-%m-%d'), 'text': 'Reported.'}
+        stats = self.make_service().sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual((stats['cosponsors_created'], stats['cosponsors_updated']), (0, 1))
+        self.assertEqual(bill.cosponsors.get(bioguide_id='C000004').withdrawn_date.date().isoformat(), '2023-02-01')
+
+
+class PerCongressFakeAPI(FakeCongressAPI):
+    """Serves three recent bills for whichever congress is requested"""
+
+    def __init__(self):
+        super().__init__([])
+
+    def get_recent_bills(self, congress=118, limit=20, offset=0, from_datetime=None):
+        bills = [make_bill(i, timezone.now(), congress=congress) for i in range(1, 4)]
+        return {'bills': bills[offset:offset + limit]}
+
+
+class MultiCongressSyncTests(TestCase):
+
+    def test_parse_congresses(self):
+        self.assertEqual(parse_congresses('118'), [118])
+        self.assertEqual(parse_congresses('110-112, 118,111'), [110, 111, 112, 118])
+        for invalid in ('', '112-110', 'abc', '0'):
+            with self.assertRaises(ValueError):
+                parse_congresses(invalid)
+
+    @mock.patch('bills.services.CongressAPI', PerCongressFakeAPI)
+    def test_merges_per_congress_stats(self):
+        out = io.StringIO()
+        call_command('sync_bills', congress='116-118', workers=4, skip_details=True, skip_alerts=True, stdout=out)
+
+        self.assertEqual(
+            sorted(LegislativeBill.objects.values_list('congress_number', flat=True).distinct()), [116, 117, 118]
+        )
+        self.assertIn('Congress 117: 3 bills', out.getvalue())
+        self.assertIn('Bills created: 9', out.getvalue())
+
+        stats = MultiCongressSync(workers=1, with_details=False, match_alerts=False).run([117, 119])
+        self.assertEqual(stats['bills_unchanged'], 3)
+        self.assertEqual(stats['congresses'][119]['bills_created'], 3)
+        with self.assertRaises(CommandError):
+            call_command('sync_bills', congress='118-x', stdout=out)
+
+
+class SyncJobTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.api = FakeCongressAPI([make_bill(i, now - timedelta(days=i)) for i in range(1, 8)])
+        self.queue = SyncJobQueue(range_size=3, max_attempts=2)
+
+    def make_worker(self, worker_id='worker-1'):
+        return SyncWorker(worker_id=worker_id, queue=self.queue, api=self.api, match_alerts=False)
+
+    def test_schedule_splits_window_into_time_slices_once(self):
+        jobs = self.queue.schedule(118, api=self.api)
+
+        self.assertGreater(len(jobs), 2)
+        counts = [self.api.get_recent_bills(from_datetime=job.from_datetime, to_datetime=job.to_datetime)
+                  ['pagination']['count'] for job in jobs]
+        self.assertTrue(all(0 < count <= 3 for count in counts))
+        self.assertEqual(sum(counts), 7)
+        for earlier, later in zip(jobs, jobs[1:]):
+            self.assertLessEqual(earlier.to_datetime, later.from_datetime)
+        self.assertEqual({job.window_end for job in jobs}, {jobs[-1].to_datetime})
+        self.assertEqual(self.queue.schedule(118, api=self.api), [])
+        self.assertEqual(SyncJob.objects.count(), len(jobs))
+
+    def test_bill_updated_mid_window_is_not_skipped(self):
+        jobs = self.queue.schedule(118, api=self.api)
+        # The newest bill moves out of its slice before the first job runs
+        self.api.bills[0] = make_bill(1, jobs[-1].window_end + timedelta(days=1))
+
+        self.make_worker().run()
+
+        self.assertEqual(LegislativeBill.objects.count(), 6)
+        self.assertEqual(set(SyncJob.objects.values_list('status', flat=True)), {'succeeded'})
+        # The cursor stops at the newest updateDate read, not the local window end
+        self.assertEqual(SyncCursor.objects.get(congress_number=118).last_update_date,
+                         FakeCongressAPI.updated(self.api.bills[1]))
+
+    def test_range_fails_when_list_changes_while_paging(self):
+        pages = iter([
+            {'bills': [make_bill(1, timezone.now()), make_bill(2, timezone.now())], 'pagination': {'count': 4}},
+            {'bills': [make_bill(4, timezone.now())], 'pagination': {'count': 3}},
+        ])
+        self.api.get_recent_bills = lambda **kwargs: next(pages)
+
+        with mock.patch.object(BillSyncService, 'PAGE_SIZE', 2):
+            stats = BillSyncService(api=self.api).sync_bill_range(118, with_details=False, match_alerts=False)
+
+        self.assertIn('changed from 4 to 3', stats['errors'][0])
+        self.assertEqual(stats['pages_fetched'], 2)
+
+    def test_workers_drain_queue_and_advance_cursor(self):
+        jobs = self.queue.schedule(118, api=self.api)
+
+        self.assertEqual(self.make_worker('worker-1').run(max_jobs=2), 2)
+        self.assertFalse(SyncCursor.objects.exists())
+        self.assertEqual(self.make_worker('worker-2').run(), len(jobs) - 2)
+
+        self.assertEqual(LegislativeBill.objects.count(), 7)
+        self.assertEqual(set(SyncJob.objects.values_list('status', flat=True)), {'succeeded'})
+        self.assertEqual(SyncCursor.objects.get(congress_number=118).last_update_date,
+                         FakeCongressAPI.updated(self.api.bills[0]))
+
+    def test_expired_lease_is_reclaimed_and_fenced(self):
+        self.queue.schedule(118, api=self.api)
+        job = self.queue.claim('worker-1')
+        self.assertNotEqual(self.queue.claim('worker-2').pk, job.pk)
+
+        SyncJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        reclaimed = self.queue.claim('worker-3')
+
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertEqual(reclaimed.attempts, 2)
+        with self.assertRaises(LeaseLost):
+            self.queue.heartbeat(job, 'worker-1')
+        self.assertFalse(self.queue.complete(job, 'worker-1'))
+        self.assertTrue(self.queue.complete(reclaimed, 'worker-3'))
+
+    def test_failed_job_backs_off_then_fails(self):
+        def fail(**kwargs):
+            raise RuntimeError('quota exceeded')
+
+        self.queue.schedule(118, api=self.api)
+        self.api.get_recent_bills = fail
+        worker = self.make_worker()
+
+        self.assertEqual(worker.run(max_jobs=1), 1)
+        job = SyncJob.objects.get(attempts=1)
+        self.assertEqual((job.status, job.attempts), ('pending', 1))
+        self.assertGreater(job.available_at, timezone.now())
+        self.assertIn('quota exceeded', job.last_error)
+
+        SyncJob.objects.filter(pk=job.pk).update(available_at=timezone.now() - timedelta(seconds=1))
+        worker.run_job(self.queue.claim('worker-1'))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('failed', 2))
+        self.assertFalse(SyncCursor.objects.exists())
+
+
+class BillWriterTests(TestCase):
+
+    def test_chunk_costs_constant_queries(self):
+        now = timezone.now()
+        writer = BillWriter(chunk_size=500)
+        for i in range(1, 31):
+            writer.add(parse_bill(make_bill(i, now)))
+
+        # lookup + upsert + id lookup + FTS5 refresh (create if missing,
+        # delete, insert), wrapped in a savepoint by the test transaction
+        with self.assertNumQueries(8):
+            stats = writer.flush()
+
+        self.assertEqual(stats['bills_created'], 30)
+        self.assertEqual(LegislativeBill.objects.count(), 30)
+
+
+class BillStatusTests(TestCase):
+
+    def setUp(self):
+        writer = BillWriter()
+        for i in range(1, 6):
+            writer.add(parse_bill(make_bill(i, timezone.now())))
+        writer.flush()
+        self.bills = dict(LegislativeBill.objects.values_list('bill_number', 'id'))
+        self.day = timezone.now().replace(microsecond=0) - timedelta(days=30)
+
+    def add_actions(self, number, *actions):
+        BillAction.objects.bulk_create(
+            BillAction(bill_id=self.bills[number], action_type=action_type, description=text,
+                       action_date=self.day + timedelta(days=offset), chamber=chamber)
+            for offset, action_type, text, chamber in actions
+        )
+
+    def add_histories(self):
+        self.add_actions('1', (0, 'introduced', 'Introduced in House', ''))
+        self.add_actions(
+            '2',
+            (1, 'failed', 'Amendment SA 12 not agreed to.', 'house'),
+            (2, 'passed', 'Passed/agreed to in House: On passage Passed by recorded vote.', ''),
+        )
+        self.add_actions(
+            '3',
+            (2, 'passed', 'On passage Passed by the Yeas and Nays.', 'house'),
+            (5, 'passed', 'Passed Senate without amendment by Voice Vote.', 'senate'),
+            (9, 'signed', 'Signed by President.', ''),
+            (10, 'signed', 'Became Public Law No: 118-5.', ''),
+        )
+        self.add_actions(
+            '4',
+            (2, 'passed', 'Passed Senate with an amendment.', 'senate'),
+            (3, 'passed', 'Resolving differences -- House agreed to Senate amendment.', 'house'),
+            (6, 'vetoed', 'Vetoed by President.', ''),
+        )
+        self.add_actions(
+            '5',
+            (2, 'passed', 'Passed/agreed to in House.', 'house'),
+            (4, 'failed', 'Failed of passage in Senate by Yea-Nay Vote. 40 - 57.', 'senate'),
+        )
+
+    def test_derives_status_and_milestones(self):
+        self.add_histories()
+        ids = list(self.bills.values())
+        derived = bills_status.derive_statuses(ids, use_numpy=False)
+
+        statuses = {number: derived[bill_id]['status'] for number, bill_id in self.bills.items()}
+        self.assertEqual(statuses, {'1': 'introduced', '2': 'passed_house', '3': 'enacted',
+                                    '4': 'vetoed', '5': 'dead'})
+        enacted = derived[self.bills['3']]
+        self.assertEqual(enacted['house_passage_date'], self.day + timedelta(days=2))
+        self.assertEqual(enacted['senate_passage_date'], self.day + timedelta(days=5))
+        self.assertEqual(enacted['enacted_date'], self.day + timedelta(days=9))
+        self.assertIsNone(derived[self.bills['1']]['house_passage_date'])
+
+        if bills_status.np is not None:
+            self.assertEqual(bills_status.derive_statuses(ids, use_numpy=True), derived)
+
+    def test_updates_only_changed_bills(self):
+        self.add_histories()
+        ids = list(self.bills.values())
+
+        self.assertEqual(bills_status.update_bill_statuses(ids), 4)
+        self.assertEqual(LegislativeBill.objects.get(bill_number='3').status, 'enacted')
+        with self.assertNumQueries(2):
+            self.assertEqual(bills_status.update_bill_statuses(ids), 0)
+
+    def test_detail_writer_derives_status(self):
+        writer = BillDetailWriter()
+        writer.add(self.bills['2'], {'bill': None, 'cosponsors': [], 'subjects': [], 'actions': [
+            {'action_type': 'passed', 'action_date': self.day, 'chamber': 'senate',
+             'description': 'Passed Senate by Unanimous Consent.'},
+        ]})
+
+        self.assertEqual(writer.flush()['statuses_updated'], 1)
+        bill = LegislativeBill.objects.get(bill_number='2')
+        self.assertEqual((bill.status, bill.senate_passage_date), ('passed_senate', self.day))
+
+
+class BillAggregateTests(TestCase):
+
+    def setUp(self):
+        self.bill = LegislativeBill.objects.create(congress_number=118, bill_type='hr', bill_number='1', title='Bill')
+        self.other = LegislativeBill.objects.create(congress_number=118, bill_type='hr', bill_number='2', title='Other')
+        now = timezone.now()
+        BillAction.objects.create(bill=self.bill, action_type='introduced', action_date=now - timedelta(days=2),
+                                  description='Introduced in House')
+        BillAction.objects.create(bill=self.bill, action_type='reported', action_date=now, description='Reported.')
+        BillSubject.objects.create(bill=self.bill, name='Taxation')
+        BillSubject.objects.create(bill=self.bill, name='Energy')
+
+    def test_command_recomputes_summary_columns(self):
+        call_command('recompute_bill_aggregates', batch_size=1, stdout=io.StringIO())
+
+        bill = LegislativeBill.objects.get(pk=self.bill.pk)
+        self.assertEqual((bill.action_count, bill.cosponsor_count), (2, 0))
+        self.assertEqual(bill.subject_names, ['Energy', 'Taxation'])
+        self.assertEqual(bill.latest_action_type, 'reported')
+        other = LegislativeBill.objects.get(pk=self.other.pk)
+        self.assertEqual((other.action_count, other.subject_names, other.latest_action_type), (0, [], ''))
+
+        # Summaries are served from the bill table alone
+        with self.assertNumQueries(2):
+            payload = self.client.get('/api/bills/', {'fields': 'bill_number,action_count,subject_names'}).json()
+        self.assertIn({'bill_number': '1', 'action_count': 2, 'subject_names': ['Energy', 'Taxation']},
+                      payload['results'])
+
+    def test_detail_writer_maintains_summary_columns(self):
+        writer = BillDetailWriter()
+        writer.add(self.other.pk, {'bill': None, 'actions': [], 'subjects': [{'name': 'Health', 'policy_area': ''}],
+                                   'cosponsors': [{'name': 'Rep. Cosponsor', 'party': 'D', 'state': 'CA',
+                                                   'bioguide_id': 'C000001', 'sponsored_date': None,
+                                                   'withdrawn_date': None}]})
+        writer.flush()
+
+        other = LegislativeBill.objects.get(pk=self.other.pk)
+        self.assertEqual((other.cosponsor_count, other.subject_names), (1, ['Health']))
+        self.assertGreater(other.last_synced, self.other.last_synced)
+
+    def test_withdrawn_cosponsors_are_not_counted(self):
+        BillCosponsor.objects.create(bill=self.bill, name='Rep. Current', bioguide_id='C000001')
+        BillCosponsor.objects.create(bill=self.bill, name='Rep. Withdrawn', bioguide_id='C000002',
+                                     withdrawn_date=timezone.now())
+
+        refresh_bill_aggregates(LegislativeBill.objects.filter(pk=self.bill.pk))
+
+        self.assertEqual(LegislativeBill.objects.get(pk=self.bill.pk).cosponsor_count, 1)
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.headers = headers or {}
+        self.content = b'{}'
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'{self.status_code} error', response=self)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@mock.patch('bills.throttling.time.sleep')
+@mock.patch('bills.services.time.sleep')
+class CongressAPIThrottlingTests(SimpleTestCase):
+
+    def make_api(self, responses, max_retries=3):
+        api = CongressAPI(api_key='test', limiter=TokenBucket(rate=100, capacity=100),
+                          max_retries=max_retries, cache=None, api_log=None)
+        api.session.get = mock.Mock(side_effect=responses)
+        return api
+
+    def test_retries_throttled_and_server_errors(self, services_sleep, throttling_sleep):
+        api = self.make_api([
+            FakeResponse(429, headers={'Retry-After': '2'}),
+            FakeResponse(503),
+            FakeResponse(200, {'bills': []}),
+        ])
+
+        self.assertEqual(api.get_recent_bills(), {'bills': []})
+        self.assertEqual(api.request_stats['api_requests'], 3)
+        self.assertEqual(api.request_stats['api_retries'], 2)
+        self.assertEqual(api.request_stats['api_throttled'], 1)
+        # the Retry-After pause is served by the limiter, not a blind sleep
+        self.assertGreater(api.request_stats['rate_limit_wait_seconds'], 1.5)
+
+    def test_gives_up_after_max_retries(self, services_sleep, throttling_sleep):
+        api = self.make_api([FakeResponse(500)] * 3, max_retries=2)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            api.get_bill_details(118, 'hr', '1')
+        self.assertEqual(api.request_stats['api_requests'], 3)
+
+    def test_client_errors_are_not_retried(self, services_sleep, throttling_sleep):
+        api = self.make_api([FakeResponse(404)])
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            api.get_bill_details(118, 'hr', '1')
+        self.assertEqual(api.request_stats['api_retries'], 0)
+
+    def test_token_bucket_waits_off_deficit(self, services_sleep, throttling_sleep):
+        bucket = TokenBucket(rate=10, capacity=1)
+
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertAlmostEqual(bucket.acquire(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.wait_seconds, 0.1, places=2)
+
+    def test_parse_retry_after(self, services_sleep, throttling_sleep):
+        self.assertEqual(parse_retry_after('120'), 120.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+class StreamingParserTests(SimpleTestCase):
+
+    def chunked(self, payload, size):
+        return (payload[i:i + size] for i in range(0, len(payload), size))
+
+    def test_items_survive_any_chunk_boundary(self):
+        bills = [make_bill(i, timezone.now()) for i in range(5)]
+        bills[2]['title'] = 'Caf\u00e9 [draft], {"quoted"}'
+        payload = json.dumps({'request': {'limit': 250}, 'bills': bills, 'pagination': {'count': 5}}).encode('utf-8')
+
+        for size in (1, 7, 4096):
+            self.assertEqual(list(_iter_items_stdlib(self.chunked(payload, size), 'bills')), bills)
+            self.assertEqual(list(iter_json_items(self.chunked(payload, size), 'bills')), bills)
+
+    def test_numbers_split_across_chunks(self):
+        chunks = [b'{"bills": [12', b'34, 5', b'6]}']
+        self.assertEqual(list(_iter_items_stdlib(chunks, 'bills')), [1234, 56])
+
+    def test_streamed_page_is_logged_without_reading_body(self):
+        payload = json.dumps({'bills': [make_bill(1, timezone.now())]}).encode('utf-8')
+        response = FakeResponse(200)
+        response.iter_content = mock.Mock(return_value=self.chunked(payload, 16))
+        buffer = APILogBuffer(start=False)
+        api = CongressAPI(api_key='test', limiter=TokenBucket(rate=100, capacity=100), cache=None, api_log=buffer)
+        api.session.get = mock.Mock(return_value=response)
+
+        bills = list(api.iter_recent_bills(congress=118, limit=250))
+
+        self.assertEqual([bill['number'] for bill in bills], ['1'])
+        self.assertTrue(api.session.get.call_args.kwargs['stream'])
+        self.assertIsNone(buffer._records[0]['response_size'])
+
+
+class ResponseCacheTests(SimpleTestCase):
+
+    def make_api(self, responses, cache):
+        api = CongressAPI(api_key='secret', limiter=TokenBucket(rate=100, capacity=100), cache=cache, api_log=None)
+        api.session.get = mock.Mock(side_effect=responses)
+        return api
+
+    def test_key_strips_api_key(self):
+        key = ResponseCache.make_key('bill/118', {'api_key': 'secret', 'limit': 20, 'format': 'json'})
+
+        self.assertEqual(key, 'bill/118?format=json&limit=20')
+
+    def test_fresh_entries_skip_the_network(self):
+        api = self.make_api([FakeResponse(200, {'bill': {'number': '1'}})], MemoryResponseCache())
+
+        first = api.get_bill_details(118, 'hr', '1')
+        second = api.get_bill_details(118, 'hr', '1')
+
+        self.assertEqual(first, second)
+        self.assertEqual(api.session.get.call_count, 1)
+        self.assertEqual(api.request_stats['cache_hits'], 1)
+
+    def test_revalidation_sends_validators_and_reuses_body(self):
+        api = self.make_api([
+            FakeResponse(200, {'actions': [1, 2]}, headers={'ETag': '"v1"'}),
+            FakeResponse(304),
+        ], MemoryResponseCache())
+
+        api.get_bill_actions(118, 'hr', '1')
+        actions = api.get_bill_actions(118, 'hr', '1', revalidate=True)
+
+        self.assertEqual(actions, {'actions': [1, 2]})
+        self.assertEqual(api.session.get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(api.request_stats['cache_revalidated'], 1)
+
+    def test_list_pages_are_not_served_from_ttl(self):
+        api = self.make_api([FakeResponse(200, {'bills': []})] * 2, MemoryResponseCache())
+
+        api.get_recent_bills()
+        api.get_recent_bills()
+
+        self.assertEqual(api.session.get.call_count, 2)
+
+    def test_memory_cache_evicts_least_recently_used(self):
+        cache = MemoryResponseCache(max_entries=2)
+        cache.set('a', 1, ttl=60)
+        cache.set('b', 2, ttl=60)
+        cache.get('a')
+        cache.set('c', 3, ttl=60)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a')['body'], 1)
+        self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_sqlite_cache_persists_and_evicts(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f'{tmp}/cache.sqlite3'
+            cache = SQLiteResponseCache(path, max_entries=2)
+            cache.set('a', {'n': 1}, ttl=60, etag='"a"')
+            cache.set('b', {'n': 2}, ttl=60)
+            cache.set('c', {'n': 3}, ttl=60)
+
+            reopened = SQLiteResponseCache(path, max_entries=2)
+            self.assertIsNone(reopened.get('a'))
+            self.assertEqual(reopened.get('c')['body'], {'n': 3})
+            self.assertTrue(reopened.is_fresh(reopened.get('b')))
+
+
+@skipUnless(httpx, 'httpx is not installed')
+class AsyncSyncTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        self.fake = FakeCongressAPI([make_bill(i, now - timedelta(days=1)) for i in range(1, 6)])
+
+    def handler(self, request):
+        parts = request.url.path.split('/')[3:]  # strip /v3/bill
+        params = request.url.params
+        if len(parts) == 1:
+            offset, limit = int(params['offset']), int(params['limit'])
+            payload = self.fake.get_recent_bills(offset=offset, limit=limit)
+        elif len(parts) == 3:
+            payload = self.fake.get_bill_details(*parts)
+        else:
+            payload = getattr(self.fake, f'get_bill_{parts[3]}')(*parts[:3])
+        return httpx.Response(200, json=payload)
+
+    def test_sync_with_async_client(self):
+        api = AsyncCongressAPI(api_key='test', limiter=TokenBucket(rate=1000, capacity=1000),
+                               cache=None, api_log=None)
+        api.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        service = BillSyncService(api=api, concurrency=3, use_async=True)
+        service.PAGE_SIZE = 2
+        try:
+            stats = service.sync_recent_bills(congress=118, days_back=7)
+        finally:
+            service.close()
+
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(stats['bills_created'], 5)
+        self.assertEqual(stats['actions_created'], 10)
+        self.assertEqual(stats['api_requests'], 3 + 5 * 4)
+        self.assertEqual(BillSubject.objects.count(), 10)
+
+
+class APILogBufferTests(TestCase):
+
+    def test_api_calls_are_buffered_then_bulk_written(self):
+        buffer = APILogBuffer(flush_size=100, start=False)
+        api = CongressAPI(api_key='secret', limiter=TokenBucket(rate=100, capacity=100),
+                          cache=None, api_log=buffer)
+        api.session.get = mock.Mock(side_effect=[FakeResponse(200, headers={'Content-Length': '2'}), FakeResponse(404)])
+
+        api.get_bill_details(118, 'hr', '1')
+        with self.assertRaises(requests.exceptions.HTTPError):
+            api.get_bill_actions(118, 'hr', '1')
+        self.assertFalse(APILog.objects.exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 2)
+
+        ok, missing = APILog.objects.order_by('timestamp')
+        self.assertEqual(ok.endpoint, 'bill/118/hr/1')
+        self.assertEqual(ok.response_size, 2)
+        self.assertNotIn('api_key', ok.request_params)
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(missing.error_message, 'HTTP 404')
+
+    def test_overflow_drops_oldest_records(self):
+        buffer = APILogBuffer(capacity=2, start=False)
+        for status_code in (200, 201, 202):
+            buffer.record(service='congress_gov', endpoint='bill/118', status_code=status_code, response_time=0.1)
+
+        buffer.flush()
+
+        self.assertEqual(buffer.stats['dropped'], 1)
+        self.assertEqual(sorted(APILog.objects.values_list('status_code', flat=True)), [201, 202])
+
+
+class APILogRollupTests(TestCase):
+
+    def log(self, timestamp, endpoint='bill/118/hr/1', status_code=200, response_time=0.1, size=100):
+        APILog.objects.create(
+            timestamp=timestamp, service='congress_gov', endpoint=endpoint,
+            status_code=status_code, response_time=response_time, response_size=size,
+            error_message=f'HTTP {status_code}' if status_code >= 400 else '',
+        )
+
+    def test_endpoint_templates(self):
+        self.assertEqual(normalize_endpoint('bill/118/hr/1234/actions'), 'bill/{congress}/{type}/{number}/actions')
+        self.assertEqual(normalize_endpoint('bill/118'), 'bill/{congress}')
+
+    def test_rollup_is_incremental_and_purge_keeps_recent_rows(self):
+        hour = (timezone.now() - timedelta(days=10)).replace(minute=0, second=0, microsecond=0)
+        for i in range(1, 11):
+            self.log(hour + timedelta(seconds=i), endpoint=f'bill/118/hr/{i}', response_time=i / 10)
+        self.log(hour + timedelta(seconds=30), status_code=404, size=0)
+        self.log(hour + timedelta(days=4))
+
+        service = APILogRollupService(retention_days=7)
+        stats = service.rollup()
+        self.assertEqual(stats['rows_aggregated'], 12 * 2)
+
+        ok = APILogRollup.objects.get(granularity='hour', bucket_start=hour, status_code=200)
+        self.assertEqual(ok.endpoint, 'bill/{congress}/{type}/{number}')
+        self.assertEqual(ok.count, 10)
+        self.assertEqual(ok.p50_response_time, 0.5)
+        self.assertEqual(ok.p95_response_time, 1.0)
+        self.assertEqual(ok.total_bytes, 1000)
+        failed = APILogRollup.objects.get(granularity='minute', status_code=404)
+        self.assertEqual(failed.error_count, 1)
+
+        # A second run has nothing new to aggregate
+        self.assertEqual(service.rollup()['rows_aggregated'], 0)
+
+        self.assertEqual(APILogRollupService(retention_days=7, batch_size=4).purge(), 11)
+        self.assertEqual(APILog.objects.count(), 1)
+        # Zero is an explicit retention, not the default
+        self.assertEqual(APILogRollupService(retention_days=0).retention_days, 0)
+
+
+class BillAPITests(TestCase):
+
+    def setUp(self):
+        api_cache.get_cache().clear()
+        now = timezone.now()
+        self.bills = []
+        for i in range(1, 8):
+            bill = LegislativeBill.objects.create(
+                congress_number=118, bill_type='hr', bill_number=str(i), title=f'Bill {i}',
+                # Three bills share each action date so pages split ties
+                latest_action_date=now - timedelta(days=i // 3) if i < 7 else None,
+            )
+            BillSubject.objects.create(bill=bill, name='Taxation')
+            BillAction.objects.create(bill=bill, action_type='introduced', action_date=now, description='Introduced')
+            BillCosponsor.objects.create(bill=bill, name='Rep. Cosponsor', bioguide_id=f'C{i:06d}')
+            self.bills.append(bill)
+
+    def test_list_embeds_children_without_n_plus_one(self):
+        # freshness aggregate + page + one prefetch per child table
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/bills/', {'page_size': 7})
+
+        self.assertEqual(response.status_code, 200)
+        first = response.json()['results'][0]
+        self.assertEqual(first['subjects'], [{'name': 'Taxation', 'policy_area': ''}])
+        self.assertEqual(len(first['actions']), 1)
+        self.assertEqual(first['cosponsors'][0]['name'], 'Rep. Cosponsor')
+
+    def test_cursor_walks_every_bill_once_in_order(self):
+        seen = []
+        url = '/api/bills/?page_size=2'
+        while url:
+            with self.assertNumQueries(5):
+                payload = self.client.get(url).json()
+            seen.extend(bill['bill_number'] for bill in payload['results'])
+            url = payload['next']
+
+        self.assertEqual(seen, ['2', '1', '5', '4', '3', '6', '7'])
+        self.assertEqual(self.client.get('/api/bills/', {'cursor': 'garbage'}).status_code, 404)
+
+    def test_detail_and_filters(self):
+        bill = self.bills[0]
+        self.assertEqual(self.client.get(f'/api/bills/{bill.pk}/').json()['bill_slug'], '118-hr-1')
+        self.assertEqual(len(self.client.get('/api/bills/', {'congress': 117}).json()['results']), 0)
+
+    def test_cached_until_the_writer_touches_the_bill(self):
+        bill, other = self.bills[0], self.bills[1]
+        self.client.get(f'/api/bills/{bill.pk}/')
+        self.client.get(f'/api/bills/{other.pk}/')
+        self.client.get('/api/bills/')
+        # Only the bill's version lookup and the list's freshness aggregate
+        with self.assertNumQueries(2):
+            self.assertEqual(len(self.client.get(f'/api/bills/{bill.pk}/').json()['cosponsors']), 1)
+            self.client.get('/api/bills/')
+
+        writer = BillDetailWriter()
+        writer.add(bill.pk, {'cosponsors': [{'name': 'Rep. New', 'bioguide_id': 'N000001'}]})
+        with self.captureOnCommitCallbacks(execute=True):
+            writer.flush()
+
+        self.assertEqual(len(self.client.get(f'/api/bills/{bill.pk}/').json()['cosponsors']), 2)
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/bills/{other.pk}/')
+        with self.assertNumQueries(5):
+            self.client.get('/api/bills/')
+        self.assertEqual(self.client.get('/api/bills/999999/').status_code, 404)
+
+    def test_sparse_fieldsets_narrow_columns_and_prefetches(self):
+        with self.assertNumQueries(2) as ctx:
+            payload = self.client.get('/api/bills/', {'fields': 'id,title,status', 'page_size': 3}).json()
+        self.assertEqual(set(payload['results'][0]), {'id', 'title', 'status'})
+        self.assertNotIn('summary', ctx.captured_queries[-1]['sql'])
+        self.assertIsNotNone(payload['next'])
+
+        with self.assertNumQueries(3):
+            payload = self.client.get('/api/bills/', {'fields': 'bill_slug', 'expand': 'subjects'}).json()
+        self.assertEqual(payload['results'][0], {'bill_slug': '118-hr-2', 'subjects': [{'name': 'Taxation', 'policy_area': ''}]})
+
+        detail = self.client.get(f'/api/bills/{self.bills[0].pk}/', {'expand': 'actions'}).json()
+        self.assertIn('summary', detail)
+        self.assertNotIn('cosponsors', detail)
+        self.assertEqual(self.client.get('/api/bills/', {'fields': 'id,secret'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/bills/', {'expand': 'title'}).status_code, 400)
+
+    def test_conditional_get_answers_304_without_serializing(self):
+        bill = self.bills[0]
+        detail = self.client.get(f'/api/bills/{bill.pk}/')
+        listing = self.client.get('/api/bills/', {'congress': 118})
+        self.assertTrue(detail.has_header('Last-Modified'))
+
+        with mock.patch.object(LegislativeBillSerializer, 'to_representation') as serialize:
+            with self.assertNumQueries(1):
+                response = self.client.get(f'/api/bills/{bill.pk}/', HTTP_IF_NONE_MATCH=detail['ETag'])
+            self.assertEqual(response.status_code, 304)
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/bills/', {'congress': 118}, HTTP_IF_NONE_MATCH=listing['ETag'])
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get(f'/api/bills/{bill.pk}/', HTTP_IF_MODIFIED_SINCE=detail['Last-Modified'])
+            self.assertEqual(response.status_code, 304)
+        serialize.assert_not_called()
+
+        # A deletion changes the list count even though no timestamp moved
+        self.bills[-1].delete()
+        response = self.client.get('/api/bills/', {'congress': 118}, HTTP_IF_NONE_MATCH=listing['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], listing['ETag'])
+
+    def test_bill_changed_outside_the_writer_is_not_served_stale(self):
+        bill = self.bills[0]
+        detail = self.client.get(f'/api/bills/{bill.pk}/')
+
+        # e.g. an edit in the admin or a sync in another process, whose
+        # cache this process never sees
+        bill.title = 'Renamed'
+        bill.save()
+
+        response = self.client.get(f'/api/bills/{bill.pk}/', HTTP_IF_NONE_MATCH=detail['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], detail['ETag'])
+        self.assertEqual(response.json()['title'], 'Renamed')
+        self.assertEqual(self.client.get(f'/api/bills/{bill.pk}/').json()['title'], 'Renamed')
+
+    def test_expired_entry_is_recomputed_once(self):
+        cache = api_cache.get_cache()
+        compute = mock.Mock(return_value='fresh')
+        cache.set('stale', (0, 'stale'))
+        cache.add('stale:lock', 1)
+        # Another request holds the refresh lock: keep serving the stale copy
+        self.assertEqual(api_cache.get_or_compute('stale', compute), 'stale')
+        compute.assert_not_called()
+
+        cache.add('cold:lock', 1)
+        # Cold miss while another request computes: wait for its result
+        with mock.patch('bills.api_cache.time.sleep', side_effect=lambda _: cache.set('cold', (0, 'winner'))):
+            self.assertEqual(api_cache.get_or_compute('cold', compute), 'winner')
+        compute.assert_not_called()
+
+        cache.delete('stale:lock')
+        self.assertEqual(api_cache.get_or_compute('stale', compute), 'fresh')
+        self.assertEqual(api_cache.get_or_compute('stale', compute), 'fresh')
+        compute.assert_called_once()
+
+
+class BillExportTests(TestCase):
+
+    def setUp(self):
+        for i in range(1, 6):
+            bill = LegislativeBill.objects.create(congress_number=118, bill_type='hr', bill_number=str(i),
+                                                  title=f'Bill, "{i}"', sponsor_name='Rep. Sponsor')
+            BillSubject.objects.create(bill=bill, name='Taxation')
+            BillSubject.objects.create(bill=bill, name='Energy')
+            for day in range(i):
+                BillAction.objects.create(bill=bill, action_type='other',
+                                          action_date=timezone.now() - timedelta(days=day), description=f'Step {day}')
+            BillCosponsor.objects.create(bill=bill, name='Rep. Cosponsor', bioguide_id=f'C{i:06d}')
+        LegislativeBill.objects.create(congress_number=117, bill_type='s', bill_number='1', title='Old bill')
+        refresh_bill_aggregates(LegislativeBill.objects.all())
+
+    def test_rows_come_from_chunked_cursor(self):
+        # Counts and subjects are read from the bill rows themselves
+        with self.assertNumQueries(1):
+            rows = list(iter_rows(LegislativeBill.objects.filter(congress_number=118), chunk_size=2))
+        self.assertEqual([row['action_count'] for row in rows], [1, 2, 3, 4, 5])
+        self.assertEqual(rows[0]['subjects'], ['Energy', 'Taxation'])
+        self.assertEqual(rows[0]['cosponsor_count'], 1)
+
+    def test_endpoint_streams_ndjson_and_gzipped_csv(self):
+        response = self.client.get('/api/bills/export/', {'congress': 118})
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[4])['bill_number'], '5')
+
+        response = self.client.get('/api/bills/export/', {'output': 'csv'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(b''.join(response.streaming_content)).decode())))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]['title'], 'Bill, "1"')
+        self.assertEqual(rows[0]['subjects'], 'Energy; Taxation')
+        self.assertEqual(self.client.get('/api/bills/export/', {'output': 'xml'}).status_code, 400)
+
+    def test_command_writes_gzip_file(self):
+        with tempfile.NamedTemporaryFile(suffix='.ndjson.gz') as handle:
+            out = io.StringIO()
+            call_command('export_bills', congress=117, output=handle.name, gzip=True, stdout=out)
+            lines = gzip.decompress(handle.read()).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Old bill'])
+        self.assertIn('Exported 1 bills', out.getvalue())
+
+
+class BillStatsTests(TestCase):
+
+    def setUp(self):
+        monday = timezone.now().replace(hour=12, minute=0, second=0, microsecond=0) - timedelta(weeks=3)
+        monday -= timedelta(days=monday.weekday())
+        self.week = monday.date()
+        for i, (status, chamber, party, days) in enumerate([
+            ('introduced', 'house', 'D', 0), ('introduced', 'house', 'R', 1),
+            ('passed_house', 'house', 'D', 8), ('enacted', 'senate', '', 8),
+        ], start=1):
+            policy_area = 'Taxation' if i < 3 else 'Energy'
+            bill = LegislativeBill.objects.create(
+                congress_number=118, bill_type='hr', bill_number=str(i), title=f'Bill {i}', status=status,
+                chamber=chamber, sponsor_party=party, introduced_date=monday + timedelta(days=days),
+                policy_area=policy_area,
+            )
+            if i != 4:
+                # Bill 4 has a policy area but no legislative subjects yet
+                BillSubject.objects.create(bill=bill, name='Taxation', policy_area=policy_area)
+                BillSubject.objects.create(bill=bill, name='Income tax', policy_area=policy_area)
+        LegislativeBill.objects.create(congress_number=117, bill_type='s', bill_number='1', title='Old bill')
+
+    def test_refresh_materialises_per_congress_counts(self):
+        self.assertEqual(bills_stats.refresh_congress_stats([117, 118, 119]), 2)
+
+        stats = CongressBillStats.objects.get(congress_number=118)
+        self.assertEqual(stats.bill_count, 4)
+        self.assertEqual(stats.by_status['introduced'], 2)
+        self.assertEqual(stats.by_status['vetoed'], 0)
+        self.assertEqual(stats.by_chamber, {'house': 3, 'senate': 1})
+        self.assertEqual(stats.by_party, {'D': 2, 'R': 1, 'unknown': 1})
+        self.assertEqual(stats.by_policy_area, {'Taxation': 2, 'Energy': 2})
+        self.assertEqual(stats.introduced_per_week, [
+            {'week': self.week.isoformat(), 'count': 2},
+            {'week': (self.week + timedelta(weeks=1)).isoformat(), 'count': 2},
+        ])
+
+        LegislativeBill.objects.filter(congress_number=117).delete()
+        bills_stats.refresh_congress_stats([117])
+        self.assertFalse(CongressBillStats.objects.filter(congress_number=117).exists())
+
+    def test_endpoint_serves_one_row(self):
+        self.assertEqual(self.client.get('/api/bills/stats/').status_code, 404)
+        call_command('refresh_bill_stats', stdout=io.StringIO())
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/bills/stats/')
+        self.assertEqual(response.json()['congress_number'], 118)
+        self.assertEqual(response.json()['by_status']['enacted'], 1)
+        self.assertEqual(self.client.get('/api/bills/stats/', {'congress': 117}).json()['bill_count'], 1)
+        self.assertEqual(self.client.get('/api/bills/stats/', {'congress': 'x'}).status_code, 400)
+
+        response = self.client.get('/api/bills/stats/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_sync_refreshes_touched_congresses(self):
+        api = FakeCongressAPI([make_bill(i, timezone.now(), congress=117) for i in range(2, 4)])
+        BillSyncService(api=api).sync_recent_bills(congress=117, with_details=False, match_alerts=False)
+
+        self.assertEqual(CongressBillStats.objects.get(congress_number=117).bill_count, 3)
+        self.assertFalse(CongressBillStats.objects.filter(congress_number=118).exists())
+
+
+BILLSTATUS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<billStatus>
+  <version>3.0.0</version>
+  <bill>
+    <number>42</number>
+    <type>HR</type>
+    <introducedDate>2023-01-09</introducedDate>
+    <congress>118</congress>
+    <originChamber>House</originChamber>
+    <title>Clean Energy Act</title>
+    <latestAction><actionDate>2023-02-01</actionDate><text>Referred to the Subcommittee.</text></latestAction>
+    <committees><item><name>Energy</name><activities><item><name>Referral</name></item></activities></item></committees>
+    <relatedBills><item><latestAction><actionDate>2020-01-01</actionDate><text>Unrelated.</text></latestAction></item></relatedBills>
+    <sponsors><item><bioguideId>S000001</bioguideId><fullName>Rep. Sponsor [D-CA-1]</fullName><party>D</party><state>CA</state></item></sponsors>
+    <cosponsors>
+      <item><bioguideId>C000001</bioguideId><fullName>Rep. One</fullName><party>R</party><state>TX</state><sponsorshipDate>2023-01-10</sponsorshipDate></item>
+      <item><bioguideId>C000002</bioguideId><fullName>Rep. Two</fullName><party>D</party><state>NY</state><sponsorshipDate>2023-01-11</sponsorshipDate></item>
+    </cosponsors>
+    <actions>
+      <item><actionDate>2023-02-01</actionDate><text>Referred to the Subcommittee.</text><type>Committee</type><sourceSystem><name>House committee actions</name></sourceSystem></item>
+      <item><actionDate>2023-01-09</actionDate><text>Introduced in House</text><type>IntroReferral</type><sourceSystem><name>Library of Congress</name></sourceSystem></item>
+    </actions>
+    <policyArea><name>Energy</name></policyArea>
+    <subjects><legislativeSubjects><item><name>Solar energy</name></item><item><name>Tax credits</name></item></legislativeSubjects><policyArea><name>Energy</name></policyArea></subjects>
+  </bill>
+</billStatus>
+"""
+
+BILLSTATUS_XML_LEGACY = """<?xml version="1.0" encoding="utf-8"?>
+<billStatus>
+  <bill>
+    <billNumber>7</billNumber>
+    <billType>S</billType>
+    <congress>110</congress>
+    <originChamber>Senate</originChamber>
+    <title>Old Senate Bill</title>
+    <latestAction><actionDate>2008-03-01</actionDate><text>Became Public Law.</text></latestAction>
+    <actions><item><actionDate>2008-03-01</actionDate><text>Became Public Law No: 110-7.</text><type>BecameLaw</type></item></actions>
+    <subjects><billSubjects><legislativeSubjects><item><name>Agriculture</name></item></legislativeSubjects><policyArea><name>Agriculture and Food</name></policyArea></billSubjects></subjects>
+  </bill>
+</billStatus>
+"""
+
+
+class BulkImportTests(TestCase):
+
+    def write_dump(self, directory):
+        import os
+        import zipfile
+
+        os.makedirs(f'{directory}/118/hr')
+        with open(f'{directory}/118/hr/BILLSTATUS-118hr42.xml', 'w') as handle:
+            handle.write(BILLSTATUS_XML)
+        with open(f'{directory}/118/hr/BILLSTATUS-118hr43.json', 'w') as handle:
+            json.dump({'bill': {'congress': 118, 'type': 'HR', 'number': '43', 'title': 'JSON bill',
+                                'actions': {'item': [{'actionDate': '2023-03-01', 'text': 'Introduced in House'}]}}},
+                      handle)
+        with open(f'{directory}/118/hr/BILLSTATUS-118hr44.xml', 'w') as handle:
+            handle.write('<billStatus><bill>')
+        with zipfile.ZipFile(f'{directory}/110.zip', 'w') as archive:
+            archive.writestr('BILLSTATUS-110s7.xml', BILLSTATUS_XML_LEGACY)
+
+    def test_imports_dump_and_is_idempotent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_dump(directory)
+            out = io.StringIO()
+            call_command('import_bulk_bills', f'{directory}/118', workers=1, stdout=out)
+            call_command('import_bulk_bills', f'{directory}/110.zip', workers=1, stdout=out)
+            self.assertIn('bills/sec', out.getvalue())
+            self.assertIn('Error parsing', out.getvalue())
+
+            bill = LegislativeBill.objects.get(congress_number=118, bill_number='42')
+            self.assertEqual((bill.bill_type, bill.chamber, bill.sponsor_bioguide_id), ('hr', 'house', 'S000001'))
+            self.assertEqual(bill.latest_action, 'Referred to the Subcommittee.')
+            self.assertEqual(bill.actions.count(), 2)
+            self.assertEqual(set(bill.cosponsors.values_list('bioguide_id', flat=True)), {'C000001', 'C000002'})
+            self.assertEqual(set(bill.subjects.values_list('name', 'policy_area')),
+                             {('Solar energy', 'Energy'), ('Tax credits', 'Energy')})
+            self.assertEqual(LegislativeBill.objects.get(bill_number='43').actions.count(), 1)
+            legacy = LegislativeBill.objects.get(congress_number=110)
+            self.assertEqual((legacy.bill_type, legacy.bill_number), ('s', '7'))
+            self.assertEqual(legacy.subjects.get().policy_area, 'Agriculture and Food')
+
+            stats = BulkBillImporter(workers=1).run(directory)
+        self.assertEqual(stats['bills_unchanged'], 3)
+        self.assertEqual(stats['actions_created'], 0)
+        self.assertEqual(BillAction.objects.count(), 4)
+
+    def test_imported_bill_hashes_like_synced_bill(self):
+        values, _ = parse_bill_file('BILLSTATUS-118hr42.xml', io.BytesIO(BILLSTATUS_XML.encode()))
+        self.assertEqual(values['congress_url'], 'https://api.congress.gov/v3/bill/118/hr/42?format=json')
+
+    def test_malformed_and_partial_files_are_reported_and_skipped(self):
+        documents = {
+            'BILLSTATUS-118hr1.xml': BILLSTATUS_XML,
+            # Cut off inside the action list
+            'BILLSTATUS-118hr2.xml': BILLSTATUS_XML[:BILLSTATUS_XML.index('<actions>') + 20],
+            'BILLSTATUS-118hr3.xml': '<billStatus><bill><number>3</type></bill></billStatus>',
+            'BILLSTATUS-118hr4.xml': '',
+            'BILLSTATUS-118hr5.xml': '<billStatus><bill><congress>118</congress><title>No number</title></bill></billStatus>',
+            'BILLSTATUS-118hr6.json': '{"bill": {"congress": 118, "type": "HR", "number": "6"',
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for name, content in documents.items():
+                with open(f'{directory}/{name}', 'w') as handle:
+                    handle.write(content)
+            stats = import_files([(f'{directory}/{name}', None) for name in documents])
+
+        self.assertEqual((stats['files'], stats['bills_created']), (2, 1))
+        self.assertEqual(len(stats['errors']), 5)
+        for name in ('hr2', 'hr3', 'hr4', 'hr6'):
+            self.assertTrue(any('Error parsing' in e and name in e for e in stats['errors']), name)
+        self.assertTrue(any('Skipped' in e and 'hr5' in e for e in stats['errors']))
+        # Nothing of the truncated document was written
+        self.assertEqual(list(LegislativeBill.objects.values_list('bill_number', flat=True)), ['42'])
+        self.assertEqual(BillAction.objects.count(), 2)
+
+
+class QueryPlanTests(TestCase):
+
+    def test_canonical_queries_use_indexes(self):
+        # The test database is built from the models, so add the indexes
+        # that only exist as migration SQL
+        migration = importlib.import_module('bills.migrations.0008_bill_query_indexes')
+        with connection.cursor() as cursor:
+            # SQLite's schema editor refuses to run inside the test transaction
+            editor = SimpleNamespace(connection=connection, execute=cursor.execute)
+            importlib.import_module('bills.migrations.0007_legislativebill_action_date_id_idx').create_index(None, editor)
+            migration.create_keyset_indexes(None, editor)
+        LegislativeBill.objects.create(congress_number=118, bill_type='hr', bill_number='1', title='Bill',
+                                       latest_action_date=timezone.now(), sponsor_bioguide_id='S000001')
+
+        out = io.StringIO()
+        call_command('explain_bill_queries', stdout=out)
+        self.assertIn('All canonical bill queries use their indexes', out.getvalue())
+        self.assertIn('bills by sponsor: bill_sponsor_action_idx', out.getvalue())
+        self.assertIn(f'sync key lookup: {unique_key_index()}', out.getvalue())
+
+
+class BillSearchTests(TestCase):
+
+    def setUp(self):
+        writer = BillWriter()
+        now = timezone.now()
+        writer.add(parse_bill(make_bill(1, now, title='Wildfire prevention and forest management act')))
+        writer.add(parse_bill(make_bill(2, now, title='Tax relief for small businesses')))
+        writer.add(parse_bill(make_bill(3, now, title='Rural broadband expansion')))
+        writer.flush()
+
+    def test_writer_maintains_index_and_search_ranks_matches(self):
+        response = self.client.get('/api/bills/search/', {'q': 'forest wildfires'})
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()
+        self.assertEqual([bill['bill_number'] for bill in results], ['1'])
+        self.assertIn('<mark>', results[0]['headline'])
+
+    def test_detail_sync_indexes_action_text(self):
+        bill = LegislativeBill.objects.get(bill_number='3')
+        writer = BillDetailWriter()
+        writer.add(bill.pk, {'actions': [{'action_type': 'referred', 'action_date': timezone.now(), 'chamber': 'house',
+                                          'description': 'Referred to the Committee on Energy and Commerce.'}]})
+        writer.flush()
+
+        self.assertEqual([b.bill_number for b in search_bills('commerce')], ['3'])
+        self.assertEqual(self.client.get('/api/bills/search/').status_code, 400)
+
+    def test_other_backends_fall_back_to_substring_search(self):
+        with mock.patch.object(connection, 'vendor', 'mysql'):
+            results = search_bills('broadband RURAL')
+
+        self.assertEqual([bill.bill_number for bill in results], ['3'])
+        self.assertEqual(results[0].headline, '<mark>Rural</mark> <mark>broadband</mark> expansion')
+
+
+class AlertMatchingTests(TestCase):
+
+    def test_automaton_finds_overlapping_whole_words(self):
+        automaton = AhoCorasick(['he', 'she', 'hers', 'tax', 'tax credit'])
+
+        self.assertEqual(sorted(automaton.find('she said hers and his tax credit')), ['hers', 'she', 'tax', 'tax credit'])
+        self.assertEqual(list(automaton.find('taxi ushers')), [])
+
+    def test_sync_matches_only_changed_bills_against_all_alert_types(self):
+        user = User.objects.create(username='analyst')
+        keyword = LegislativeAlert.objects.create(user=user, alert_type='keyword', name='Energy',
+                                                  keywords='Clean Energy, nuclear')
+        subject = LegislativeAlert.objects.create(user=user, alert_type='subject', name='Tax', subject_name='taxation')
+        LegislativeAlert.objects.create(user=user, alert_type='keyword', name='Off', keywords='bill', is_active=False)
+
+        now = timezone.now()
+        api = FakeCongressAPI([make_bill(1, now, title='Clean energy jobs act'), make_bill(2, now)])
+        service = BillSyncService(api=api, concurrency=2)
+        stats = service.sync_recent_bills(congress=118, days_back=7)
+
+        self.assertEqual(stats['errors'], [])
+        self.assertEqual(stats['alert_matches_created'], 3)
+        self.assertEqual(AlertMatch.objects.get(alert=keyword).matched_value, 'clean energy')
+        self.assertEqual(AlertMatch.objects.filter(alert=subject).count(), 2)
+
+        # Unchanged bills are not re-evaluated and the index is reused
+        with self.assertNumQueries(1):
+            get_alert_index()
+        stats = service.sync_recent_bills(congress=118, days_back=7)
+        self.assertEqual(stats['alert_matches_created'], 0)
+        self.assertEqual(AlertMatch.objects.count(), 3)
+
+        # Every later change of a matched bill fires again
+        for text in ('Reported by committee.', 'Passed House.'):
+            api.bills[0]['latestAction'] = {'actionDate': now.strftime('%Y-%m-%d'), 'text': text}
+            stats = service.sync_recent_bills(congress=118, days_back=7)
+            self.assertEqual(stats['alert_matches_created'], 2)
+        self.assertEqual(AlertMatch.objects.filter(alert=keyword).count(), 3)
+        self.assertEqual(AlertMatch.objects.filter(alert=subject).count(), 4)
+
+
+class AlertNotificationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='analyst', email='analyst@example.com')
+        self.energy = LegislativeAlert.objects.create(user=self.user, alert_type='keyword', name='Energy', keywords='energy')
+        self.tax = LegislativeAlert.objects.create(user=self.user, alert_type='subject', name='Tax', subject_name='Taxation')
+        self.bills = [
+            LegislativeBill.objects.create(congress_number=118, bill_type='hr', bill_number=str(i), title=f'Energy bill {i}')
+            for i in range(1, 4)
+        ]
+
+    def match(self, alert, bill, age_minutes=30, content_hash=''):
+        match = AlertMatch.objects.create(alert=alert, bill=bill, match_type=alert.alert_type, content_hash=content_hash)
+        AlertMatch.objects.filter(pk=match.pk).update(created_at=timezone.now() - timedelta(minutes=age_minutes))
+
+    def test_matches_coalesce_into_one_digest_per_user(self):
+        self.match(self.energy, self.bills[0])
+        self.match(self.tax, self.bills[0])
+        self.match(self.energy, self.bills[1], age_minutes=1)
+
+        stats = AlertNotifier(window_seconds=600).deliver()
+
+        self.assertEqual(stats['digests_sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['analyst@example.com'])
+        self.assertIn('2 bills matched', mail.outbox[0].body)
+        self.assertIn('Matched: Energy, Tax', mail.outbox[0].body)
+        self.assertFalse(AlertMatch.objects.filter(notified_at__isnull=True).exists())
+
+        # Nothing left to send
+        self.assertEqual(AlertNotifier(window_seconds=600).deliver()['digests_sent'], 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_window_holds_recent_matches_and_sent_bills_are_not_resent(self):
+        self.match(self.energy, self.bills[0], age_minutes=1)
+        self.assertEqual(AlertNotifier(window_seconds=600).deliver()['digests_sent'], 0)
+
+        AlertNotifier(window_seconds=600).deliver(flush=True)
+        self.match(self.tax, self.bills[0])
+        stats = AlertNotifier(window_seconds=600).deliver()
+
+        self.assertEqual(stats['duplicates_skipped'], 1)
+        self.assertEqual((stats['digests_sent'], stats['matches_notified']), (0, 0))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_changed_bill_is_sent_again(self):
+        self.match(self.energy, self.bills[0], content_hash='a' * 64)
+        AlertNotifier(window_seconds=600).deliver()
+
+        self.match(self.tax, self.bills[0], content_hash='b' * 64)
+        stats = AlertNotifier(window_seconds=600).deliver()
+
+        self.assertEqual((stats['digests_sent'], stats['matches_notified'], stats['duplicates_skipped']), (1, 1, 0))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_unsent_digest_returns_to_the_queue(self):
+        self.match(self.energy, self.bills[0])
+
+        def send_messages(messages):
+            raise OSError('mail server unavailable')
+
+        connection = SimpleNamespace(open=lambda: False, send_messages=send_messages)
+        stats = AlertNotifier(window_seconds=600, connection=connection).deliver()
+
+        self.assertEqual((stats['digests_sent'], stats['digests_failed']), (0, 1))
+        self.assertFalse(AlertMatch.objects.filter(notified_at__isnull=False).exists())
+        self.assertEqual(AlertNotifier(window_seconds=600).deliver()['digests_sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+
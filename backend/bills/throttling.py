@@ -0,0 +1,159 @@
+"""
+API Throttling
+Token-bucket rate limiting and retry backoff for outbound API clients
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by every client in the process
+
+    ``acquire`` reserves tokens up front and sleeps off any deficit, so
+    concurrent callers queue fairly instead of polling. ``pause`` blocks all
+    callers until a server-imposed ``Retry-After`` has elapsed.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._state = {'tokens': capacity, 'updated': self._clock(), 'paused_until': 0.0}
+        self.wait_seconds = 0.0
+        self.acquisitions = 0
+
+    @staticmethod
+    def _clock() -> float:
+        return time.monotonic()
+
+    def _reserve(self, state: Dict, tokens: float, now: float) -> float:
+        """Take tokens from the state and return how long the caller must wait"""
+        elapsed = max(0.0, now - state['updated'])
+        state['tokens'] = min(self.capacity, state['tokens'] + elapsed * self.rate)
+        state['updated'] = now
+        state['tokens'] -= tokens
+
+        delay = max(0.0, state['paused_until'] - now)
+        if state['tokens'] < 0:
+            delay = max(delay, -state['tokens'] / self.rate)
+        return delay
+
+    def _update(self, tokens: float = 0.0, pause: float = 0.0) -> float:
+        with self._lock:
+            now = self._clock()
+            if pause:
+                self._state['paused_until'] = max(self._state['paused_until'], now + pause)
+            return self._reserve(self._state, tokens, now) if tokens else 0.0
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` without blocking; returns the seconds the caller must wait"""
+        delay = self._update(tokens=tokens)
+        with self._lock:
+            self.wait_seconds += delay
+            self.acquisitions += 1
+        return delay
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until ``tokens`` are available; returns the seconds waited"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds``, e.g. after a 429"""
+        if seconds > 0:
+            self._update(pause=seconds)
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a ``flock``-guarded file
+
+    Lets several worker processes on one host share a single request quota.
+    Uses wall-clock time because the state outlives any one process.
+    """
+
+    def __init__(self, path: str, rate: float, capacity: float):
+        if fcntl is None:
+            raise RuntimeError('FileTokenBucket requires fcntl (POSIX only)')
+        self.path = path
+        super().__init__(rate, capacity)
+
+    @staticmethod
+    def _clock() -> float:
+        return time.time()
+
+    def _update(self, tokens: float = 0.0, pause: float = 0.0) -> float:
+        with open(self.path, 'a+', encoding='utf-8') as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                fh.seek(0)
+                raw = fh.read()
+                now = self._clock()
+                state = json.loads(raw) if raw else {'tokens': self.capacity, 'updated': now, 'paused_until': 0.0}
+                if pause:
+                    state['paused_until'] = max(state['paused_until'], now + pause)
+                delay = self._reserve(state, tokens, now) if tokens else 0.0
+                fh.seek(0)
+                fh.truncate()
+                fh.write(json.dumps(state))
+                fh.flush()
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+        return delay
+
+
+_limiters: Dict[Tuple, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(rate_per_hour: float, burst: float, path: Optional[str] = None) -> TokenBucket:
+    """Return the process-wide limiter for a quota, creating it on first use"""
+    key = (rate_per_hour, burst, path)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            rate = rate_per_hour / 3600.0
+            limiter = FileTokenBucket(path, rate, burst) if path else TokenBucket(rate, burst)
+            _limiters[key] = limiter
+        return limiter
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.warning(f"Could not parse Retry-After header: {value}")
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=dt_timezone.utc)
+    return max(0.0, (retry_at - datetime.now(dt_timezone.utc)).total_seconds())
@@ -0,0 +1,12 @@
+from django.urls import path
+from .views import (
+    BillExportView, BillStatsView, LegislativeBillDetailView, LegislativeBillListView, LegislativeBillSearchView,
+)
+
+urlpatterns = [
+    path('bills/', LegislativeBillListView.as_view(), name='bill-list'),
+    path('bills/export/', BillExportView.as_view(), name='bill-export'),
+    path('bills/search/', LegislativeBillSearchView.as_view(), name='bill-search'),
+    path('bills/stats/', BillStatsView.as_view(), name='bill-stats'),
+    path('bills/<int:pk>/', LegislativeBillDetailView.as_view(), name='bill-detail'),
+]
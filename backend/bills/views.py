@@ -0,0 +1,290 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone as dt_timezone
+
+from django.db.models import Prefetch, Subquery
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import generics
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from . import api_cache
+from .exports import EXPORT_FORMATS, iter_export, iter_rows
+from .models import BillAction, BillCosponsor, BillDeletionGeneration, BillSubject, CongressBillStats, LegislativeBill
+from .pagination import BillCursorPagination
+from .search import search_bills
+from .serializers import BillSearchResultSerializer, CongressBillStatsSerializer, LegislativeBillSerializer
+
+# pylint: disable=no-member  # Disable for Django ORM 'objects' attribute
+
+
+# Columns read by LegislativeBillSerializer; large unused columns stay in the DB
+BILL_COLUMNS = [
+    'id', 'congress_number', 'bill_type', 'bill_number', 'chamber',
+    'title', 'short_title', 'summary', 'status', 'latest_action', 'latest_action_date',
+    'sponsor_name', 'sponsor_party', 'sponsor_state', 'sponsor_bioguide_id',
+    'introduced_date', 'congress_url',
+    'action_count', 'cosponsor_count', 'subject_names', 'latest_action_type',
+]
+
+# Query parameter -> model field filters accepted by the list endpoint
+BILL_FILTERS = {
+    'congress': 'congress_number',
+    'bill_type': 'bill_type',
+    'chamber': 'chamber',
+    'status': 'status',
+    'sponsor': 'sponsor_bioguide_id',
+}
+
+# Serializer fields backed by other columns
+FIELD_COLUMNS = {
+    'bill_slug': ['congress_number', 'bill_type', 'bill_number'],
+}
+
+
+def bill_queryset(fields=None):
+    """
+    Bills with their subjects, actions and cosponsors prefetched in one query each
+
+    ``fields`` narrows the queryset to a sparse fieldset: only the columns
+    those serializer fields read are loaded, and only the requested related
+    lists are prefetched.
+    """
+    if fields is None:
+        columns = BILL_COLUMNS
+        nested = LegislativeBillSerializer.NESTED_FIELDS
+    else:
+        # The keyset pagination reads the ordering columns from each page
+        columns = {'id', 'latest_action_date'}
+        for name in fields:
+            if name not in LegislativeBillSerializer.NESTED_FIELDS:
+                columns.update(FIELD_COLUMNS.get(name, [name]))
+        nested = [name for name in LegislativeBillSerializer.NESTED_FIELDS if name in fields]
+
+    prefetches = {
+        'subjects': lambda: Prefetch(
+            'subjects',
+            queryset=BillSubject.objects.only('bill_id', 'name', 'policy_area').order_by('name'),
+        ),
+        'actions': lambda: Prefetch(
+            'actions',
+            queryset=BillAction.objects.only('bill_id', 'action_type', 'action_date', 'description', 'chamber'),
+        ),
+        'cosponsors': lambda: Prefetch(
+            'cosponsors',
+            queryset=BillCosponsor.objects.only(
+                'bill_id', 'name', 'party', 'state', 'bioguide_id', 'sponsored_date', 'withdrawn_date'
+            ).order_by('sponsored_date', 'id'),
+        ),
+    }
+    return LegislativeBill.objects.only(*columns).prefetch_related(*(prefetches[name]() for name in nested))
+
+
+def filter_bills(queryset, query_params):
+    """Apply the BILL_FILTERS query parameters to a bill queryset"""
+    for param, field in BILL_FILTERS.items():
+        value = query_params.get(param)
+        if value:
+            queryset = queryset.filter(**{field: value})
+    return queryset
+
+
+def _split_param(value):
+    return [name.strip() for name in value.split(',') if name.strip()] if value is not None else None
+
+
+class FieldSelectionMixin:
+    """
+    ``?fields=`` picks top-level fields and ``?expand=`` picks related lists
+
+    With neither parameter the full representation is returned. ``fields``
+    alone leaves out related lists unless they are named; ``expand`` alone
+    keeps every plain field. The selection narrows both the serializer and
+    the queryset.
+    """
+
+    def sparse_fields(self):
+        """Selected serializer field names, or None for the full representation"""
+        if hasattr(self, '_sparse_fields'):
+            return self._sparse_fields
+
+        params = self.request.query_params
+        fields, expand = _split_param(params.get('fields')), _split_param(params.get('expand'))
+        available = self.get_serializer_class().Meta.fields
+        nested = LegislativeBillSerializer.NESTED_FIELDS
+        if fields is not None and set(fields) - set(available):
+            raise ValidationError({'fields': f"Unknown fields: {', '.join(sorted(set(fields) - set(available)))}"})
+        if expand is not None and set(expand) - set(nested):
+            raise ValidationError({'expand': f"Can only expand: {', '.join(nested)}"})
+
+        if fields is None and expand is None:
+            selected = None
+        else:
+            selected = fields if fields is not None else [name for name in available if name not in nested]
+            selected = selected + [name for name in expand or [] if name not in selected]
+        self._sparse_fields = selected
+        return selected
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class ConditionalGetMixin(ABC):
+    """
+    Answers ``If-None-Match``/``If-Modified-Since`` with 304 before serializing
+
+    Views must implement ``freshness()``.
+    """
+
+    @abstractmethod
+    def freshness(self):
+        """
+        The ``(tag, last_modified)`` validators of the response, computed
+        without loading any rows; ``last_modified`` may be None
+        """
+
+    def get(self, request, *args, **kwargs):
+        self.freshness_tag, last_modified = self.freshness()
+        etag = quote_etag(self.freshness_tag)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class LegislativeBillListView(ConditionalGetMixin, FieldSelectionMixin, generics.ListAPIView):
+    """Bills, newest action first, with keyset pagination"""
+    serializer_class = LegislativeBillSerializer
+    pagination_class = BillCursorPagination
+
+    def get_queryset(self):
+        return filter_bills(bill_queryset(self.sparse_fields()), self.request.query_params)
+
+    def freshness(self):
+        # The newest last_synced of all bills and the deletion generation,
+        # in one probe of bill_last_synced_idx: any write or deletion
+        # changes the tag of every filtered list, without counting rows
+        deletions = BillDeletionGeneration.objects.filter(pk=1).values('generation')
+        state = LegislativeBill.objects.order_by('-last_synced').annotate(
+            deletions=Subquery(deletions),
+        ).values_list('last_synced', 'deletions').first()
+        latest, generation = state or (None, None)
+        return f"{generation or 0}-{latest.timestamp() if latest else 0}", latest
+
+    def list(self, request, *args, **kwargs):
+        data = api_cache.get_or_compute(
+            api_cache.list_key(request, self.freshness_tag),
+            lambda: super(LegislativeBillListView, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+
+class LegislativeBillDetailView(ConditionalGetMixin, FieldSelectionMixin, generics.RetrieveAPIView):
+    serializer_class = LegislativeBillSerializer
+
+    def get_queryset(self):
+        return bill_queryset(self.sparse_fields())
+
+    def version(self) -> int:
+        """The bill's ``last_synced`` version, read once per request"""
+        if not hasattr(self, '_version'):
+            self._version = api_cache.bill_version(self.kwargs['pk'])
+            if self._version is None:
+                raise NotFound()
+        return self._version
+
+    def freshness(self):
+        # The cache version is last_synced in microseconds
+        version = self.version()
+        return str(version), datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc)
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = self.kwargs['pk']
+        version = self.version()
+        data = api_cache.get_or_compute(
+            api_cache.detail_key(request, pk, version),
+            lambda: super(LegislativeBillDetailView, self).retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+
+class LegislativeBillSearchView(generics.ListAPIView):
+    """Full-text bill search, best match first, with highlighted snippets"""
+    serializer_class = BillSearchResultSerializer
+    pagination_class = None
+    max_limit = 100
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': 'A search query is required'})
+        try:
+            limit = min(max(int(self.request.query_params.get('limit', 20)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer'})
+        return search_bills(query, limit=limit, queryset=bill_queryset())
+
+
+class BillStatsView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Dashboard statistics of one congress, read from its materialised row
+
+    ``?congress=`` picks the congress, by default the latest one with
+    statistics. Each request is a single indexed lookup; the row is
+    rewritten after every sync that touches the congress.
+    """
+    serializer_class = CongressBillStatsSerializer
+
+    def get_object(self):
+        if not hasattr(self, '_stats'):
+            congress = self.request.query_params.get('congress')
+            stats = CongressBillStats.objects.order_by('-congress_number')
+            if congress:
+                try:
+                    stats = stats.filter(congress_number=int(congress))
+                except ValueError:
+                    raise ValidationError({'congress': 'Must be an integer'})
+            self._stats = stats.first()
+            if self._stats is None:
+                raise NotFound()
+        return self._stats
+
+    def freshness(self):
+        stats = self.get_object()
+        return f"{stats.congress_number}-{stats.computed_at.timestamp()}", stats.computed_at
+
+
+class BillExportView(APIView):
+    """
+    Every matching bill as one streamed NDJSON or CSV download
+
+    ``?output=ndjson|csv`` picks the format (``format`` is taken by DRF's
+    renderer negotiation) and the list endpoint's filters apply. Rows come
+    from a server-side cursor and are gzipped on the fly when the client
+    accepts it.
+    """
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.query_params.get('output', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError({'output': f"Must be one of: {', '.join(EXPORT_FORMATS)}"})
+
+        queryset = filter_bills(LegislativeBill.objects.all(), request.query_params)
+        compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        response = StreamingHttpResponse(
+            iter_export(iter_rows(queryset), export_format, compress=compress),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        congress = request.query_params.get('congress')
+        filename = f"bills-{congress}.{export_format}" if congress else f"bills.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['Vary'] = 'Accept-Encoding'
+        if compress:
+            response['Content-Encoding'] = 'gzip'
+        return response
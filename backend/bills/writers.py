@@ -0,0 +1,288 @@
+"""
+Bulk Database Writers
+Batched upsert writers used by the bill sync pipeline
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from .aggregates import refresh_bill_aggregates
+from .models import BillAction, BillCosponsor, BillSubject, LegislativeBill
+from .search import refresh_search_index
+from .status import update_bill_statuses
+
+
+logger = logging.getLogger(__name__)
+
+BillKey = Tuple[int, str, str]
+
+
+class BillWriter:
+    """
+    Collects parsed bills and upserts them in chunks
+
+    Each chunk costs one lookup of the stored content hashes plus one
+    ``INSERT ... ON CONFLICT DO UPDATE``, one id lookup and one search index
+    refresh inside a single transaction. Written bills get a new
+    ``last_synced``, which moves their API cache keys. Rows whose content
+    hash is unchanged are skipped entirely, so re-syncing an unchanged page
+    never touches ``updated_at``/``last_synced``.
+    """
+
+    UNIQUE_FIELDS = ['congress_number', 'bill_type', 'bill_number']
+    CONTENT_FIELDS = [
+        'title',
+        'chamber',
+        'congress_url',
+        'latest_action',
+        'latest_action_date',
+    ]
+    UPDATE_FIELDS = CONTENT_FIELDS + ['content_hash', 'updated_at', 'last_synced']
+
+    def __init__(self, chunk_size: int = 500):
+        self.chunk_size = chunk_size
+        self.pending: Dict[BillKey, Dict] = {}
+        # Bills created or updated by this writer
+        self.changed: Set[BillKey] = set()
+        # Bills that are new or whose latest action moved; only these need
+        # their actions, cosponsors and subjects re-fetched
+        self.action_changed: Set[BillKey] = set()
+        self.stats = {
+            'bills_created': 0,
+            'bills_updated': 0,
+            'bills_unchanged': 0,
+        }
+
+    @staticmethod
+    def bill_key(values: Dict) -> BillKey:
+        """Natural key matching LegislativeBill.Meta.unique_together"""
+        return (values['congress_number'], values['bill_type'], values['bill_number'])
+
+    @classmethod
+    def content_hash(cls, values: Dict) -> str:
+        """Stable hash of the synced content fields of a bill"""
+        content = {field: values.get(field) for field in cls.CONTENT_FIELDS}
+        payload = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def add(self, values: Dict):
+        """Queue a parsed bill, flushing once a full chunk is pending"""
+        # Later records for the same bill win; a single upsert statement
+        # may not touch the same row twice
+        self.pending[self.bill_key(values)] = values
+        if len(self.pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> Dict:
+        """Write all pending bills and return the cumulative stats"""
+        pending = list(self.pending.values())
+        self.pending = {}
+        for start in range(0, len(pending), self.chunk_size):
+            self._write_chunk(pending[start:start + self.chunk_size])
+        return self.stats
+
+    @staticmethod
+    def filter_keys(keys: Iterable[BillKey]):
+        """Superset queryset for a batch of bill keys, narrowed in Python by the caller"""
+        keys = list(keys)
+        # Unordered, so the lookup is served by the unique key index alone
+        return LegislativeBill.objects.filter(
+            congress_number__in={key[0] for key in keys},
+            bill_type__in={key[1] for key in keys},
+            bill_number__in={key[2] for key in keys},
+        ).order_by()
+
+    @classmethod
+    def resolve_ids(cls, keys: Iterable[BillKey]) -> Dict[BillKey, int]:
+        """Map bill keys to primary keys in a single query"""
+        keys = set(keys)
+        if not keys:
+            return {}
+        rows = cls.filter_keys(keys).values_list('id', 'congress_number', 'bill_type', 'bill_number')
+        return {
+            (congress, bill_type, number): pk
+            for pk, congress, bill_type, number in rows
+            if (congress, bill_type, number) in keys
+        }
+
+    def _existing_rows(self, chunk: List[Dict]) -> Dict[BillKey, Tuple[str, object]]:
+        """Fetch stored content hashes and latest action dates for a chunk in one query"""
+        rows = self.filter_keys(self.bill_key(values) for values in chunk).values_list(
+            'congress_number', 'bill_type', 'bill_number', 'content_hash', 'latest_action_date'
+        )
+        return {
+            (congress, bill_type, number): (digest, action_date)
+            for congress, bill_type, number, digest, action_date in rows
+        }
+
+    def _write_chunk(self, chunk: List[Dict]):
+        """Upsert one chunk of bills inside a single transaction"""
+        now = timezone.now()
+        counts = {'bills_created': 0, 'bills_updated': 0, 'bills_unchanged': 0}
+
+        with transaction.atomic():
+            existing = self._existing_rows(chunk)
+
+            to_write = []
+            written_keys = []
+            action_changed = set()
+            for values in chunk:
+                key = self.bill_key(values)
+                digest = self.content_hash(values)
+                stored_hash, stored_action_date = existing.get(key, (None, None))
+                if stored_hash == digest:
+                    counts['bills_unchanged'] += 1
+                    continue
+
+                counts['bills_updated' if key in existing else 'bills_created'] += 1
+                # A blank stored hash marks a bill whose detail sync failed
+                if not stored_hash or stored_action_date != values.get('latest_action_date'):
+                    action_changed.add(key)
+                written_keys.append(key)
+                to_write.append(LegislativeBill(
+                    content_hash=digest,
+                    updated_at=now,
+                    last_synced=now,
+                    **values,
+                ))
+
+            if to_write:
+                LegislativeBill.objects.bulk_create(
+                    to_write,
+                    update_conflicts=True,
+                    unique_fields=self.UNIQUE_FIELDS,
+                    update_fields=self.UPDATE_FIELDS,
+                )
+                written_ids = list(self.resolve_ids(written_keys).values())
+                refresh_search_index(LegislativeBill.objects.filter(id__in=written_ids))
+
+        for name, count in counts.items():
+            self.stats[name] += count
+        self.changed.update(written_keys)
+        self.action_changed |= action_changed
+        logger.debug(f"Bill chunk written: {len(to_write)} upserted, {len(chunk) - len(to_write)} unchanged")
+
+
+class BillDetailWriter:
+    """
+    Writes fetched bill details and child rows in bulk
+
+    Detail fields are applied with one ``bulk_update`` per batch. Actions,
+    cosponsors and subjects are deduplicated against the rows already stored
+    for the batch's bills (on the ``unique_together`` keys, or
+    ``(action_date, description)`` for actions) and only new rows are
+    inserted, except that stored cosponsors whose withdrawal date changed
+    are upserted. Bills that gained child rows have their summary columns
+    recomputed in one set-based UPDATE, and those that gained actions have
+    their status and milestone dates re-derived. Every bill in the batch
+    gets a new ``last_synced``, which moves its API cache keys.
+    """
+
+    DETAIL_FIELDS = [
+        'introduced_date',
+        'sponsor_name',
+        'sponsor_party',
+        'sponsor_state',
+        'sponsor_bioguide_id',
+        'policy_area',
+    ]
+
+    def __init__(self, batch_size: int = 100):
+        self.batch_size = batch_size
+        self.pending: Dict[int, Dict] = {}
+        self.stats = {
+            'actions_created': 0,
+            'cosponsors_created': 0,
+            'cosponsors_updated': 0,
+            'subjects_created': 0,
+            'statuses_updated': 0,
+        }
+
+    def add(self, bill_id: int, parsed: Dict):
+        """Queue parsed details for a bill, flushing once a full batch is pending"""
+        self.pending[bill_id] = parsed
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> Dict:
+        """Write all pending bill details and return the cumulative stats"""
+        if not self.pending:
+            return self.stats
+        pending, self.pending = self.pending, {}
+        bill_ids = list(pending)
+        now = timezone.now()
+
+        with transaction.atomic():
+            bills = []
+            for bill_id, parsed in pending.items():
+                if parsed.get('bill'):
+                    bills.append(LegislativeBill(id=bill_id, updated_at=now, last_synced=now, **parsed['bill']))
+            if bills:
+                LegislativeBill.objects.bulk_update(bills, self.DETAIL_FIELDS + ['updated_at', 'last_synced'])
+
+            existing_actions = set(BillAction.objects.filter(bill_id__in=bill_ids).values_list(
+                'bill_id', 'action_date', 'description'
+            ))
+            withdrawn_dates = {
+                (bill_id, bioguide_id): withdrawn_date
+                for bill_id, bioguide_id, withdrawn_date in BillCosponsor.objects.filter(
+                    bill_id__in=bill_ids
+                ).values_list('bill_id', 'bioguide_id', 'withdrawn_date')
+            }
+            existing_subjects = set(BillSubject.objects.filter(bill_id__in=bill_ids).values_list(
+                'bill_id', 'name'
+            ))
+
+            actions, cosponsors, withdrawn, subjects = [], [], [], []
+            for bill_id, parsed in pending.items():
+                for values in parsed.get('actions', []):
+                    key = (bill_id, values['action_date'], values['description'])
+                    if key not in existing_actions:
+                        existing_actions.add(key)
+                        actions.append(BillAction(bill_id=bill_id, **values))
+                for values in parsed.get('cosponsors', []):
+                    key = (bill_id, values['bioguide_id'])
+                    if key not in withdrawn_dates:
+                        withdrawn_dates[key] = values.get('withdrawn_date')
+                        cosponsors.append(BillCosponsor(bill_id=bill_id, **values))
+                    elif withdrawn_dates[key] != values.get('withdrawn_date'):
+                        withdrawn_dates[key] = values.get('withdrawn_date')
+                        withdrawn.append(BillCosponsor(bill_id=bill_id, **values))
+                for values in parsed.get('subjects', []):
+                    key = (bill_id, values['name'])
+                    if key not in existing_subjects:
+                        existing_subjects.add(key)
+                        subjects.append(BillSubject(bill_id=bill_id, **values))
+
+            BillAction.objects.bulk_create(actions)
+            # Upserted on (bill, bioguide_id): a stored cosponsor only takes
+            # the new withdrawn_date, which also covers a concurrent sync
+            # inserting the same keys between our lookup and insert
+            BillCosponsor.objects.bulk_create(
+                cosponsors + withdrawn, update_conflicts=True,
+                unique_fields=['bill', 'bioguide_id'], update_fields=['withdrawn_date'],
+            )
+            BillSubject.objects.bulk_create(subjects, ignore_conflicts=True)
+            statuses_updated = 0
+            if actions:
+                action_bill_ids = {a.bill_id for a in actions}
+                # Action descriptions are part of the search document
+                refresh_search_index(LegislativeBill.objects.filter(id__in=action_bill_ids))
+                statuses_updated = update_bill_statuses(action_bill_ids, now=now)
+            with_children = {row.bill_id for row in actions + cosponsors + withdrawn + subjects}
+            if with_children:
+                # New child rows change the summary columns and so the
+                # serialized bill too
+                refresh_bill_aggregates(LegislativeBill.objects.filter(id__in=with_children), last_synced=now)
+
+        self.stats['actions_created'] += len(actions)
+        self.stats['cosponsors_created'] += len(cosponsors)
+        self.stats['cosponsors_updated'] += len(withdrawn)
+        self.stats['subjects_created'] += len(subjects)
+        self.stats['statuses_updated'] += statuses_updated
+        return self.stats
@@ -47,6 +47,7 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     'logs',
     'accounts',
+    'bills',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -170,6 +171,27 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache (Redis when REDIS_CACHE_URL is set, otherwise per-process memory)
+REDIS_CACHE_URL = config('REDIS_CACHE_URL', default='')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'policy-logs',
+        }
+    }
+
+# Bills API response cache
+BILLS_API_CACHE_ALIAS = 'default'
+BILLS_API_CACHE_TTL = config('BILLS_API_CACHE_TTL', default=300, cast=int)
+
 # Logging
 LOGGING = {
     'version': 1,